@@ -0,0 +1,249 @@
+"""
+Arquivo histórico de contratos encerrados e recibos antigos.
+
+Os registros arquivados saem das tabelas do banco principal e vão para um
+arquivo SQLite separado (``<banco>_arquivo.db``), então as telas do dia a
+dia trabalham só com os registros ativos. O arquivo só é aberto quando
+usado:
+
+- ``arquivar``/``restaurar`` fazem ATTACH do arquivo na conexão de escrita e
+  movem as linhas em uma única transação (INSERT ... SELECT + DELETE);
+- ``sessao()`` abre o arquivo como banco principal e faz ATTACH do banco
+  ativo: contratos e recibos vêm do arquivo e casas/inquilinos do banco
+  ativo, então os repositórios funcionam sem alteração (somente leitura).
+
+Os triggers de busca textual atualizam o índice ao mover os recibos. Os
+totais do que está no arquivo ficam na tabela resumo_arquivado do banco
+ativo, regravada a cada movimentação: o resumo mensal (e "Recalcular Resumo
+Mensal") soma esses totais, então os meses arquivados continuam nos
+relatórios.
+"""
+import os
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from sqlalchemy import create_engine, event, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.data.database.base import Base
+from app.data.database.fts import TABELAS_FTS
+from app.data.database.monthly_summary import (
+    chaves_de_linhas, recalcular, reconstruir_arquivado, TABELA as TABELA_RESUMO
+)
+from app.data.database.query_cache import invalidar
+from app.data.database.sqlite_profile import carregar_perfil, aplicar_perfil
+from app.data.models.receipt import Recibo
+
+TABELAS = ('contratos', 'recibos')
+
+# Recibos com mais de N anos são arquivados (DB_ARQUIVO_ANOS no .env)
+ANOS_PADRAO = 5
+
+# Critério de contrato encerrado (o mesmo de Contrato.status_descricao)
+_CONTRATO_ENCERRADO = "ativo IS NULL OR ativo = 0"
+
+
+def caminho_arquivo(database_path):
+    """Caminho do arquivo histórico ao lado do banco principal"""
+    caminho = Path(database_path)
+    return str(caminho.with_name(f"{caminho.stem}_arquivo{caminho.suffix or '.db'}"))
+
+
+def data_limite(anos):
+    """Data a partir da qual os recibos continuam no banco ativo"""
+    hoje = date.today()
+    try:
+        return hoje.replace(year=hoje.year - anos)
+    except ValueError:
+        # 29 de fevereiro em ano não bissexto
+        return hoje.replace(year=hoje.year - anos, day=28)
+
+
+def _filtro_ids(ids):
+    """Critério SQL para uma lista de ids (None = todos)"""
+    if ids is None:
+        return "1 = 1"
+    return f"id IN ({', '.join(str(int(i)) for i in ids) or 'NULL'})"
+
+
+class ArquivoHistorico:
+    """Move contratos encerrados e recibos antigos entre o banco ativo e o arquivo"""
+
+    def __init__(self, engine, caminho):
+        self.engine = engine
+        self.caminho = caminho
+        self._engine_leitura = None
+
+    def existe(self):
+        return os.path.exists(self.caminho)
+
+    def _preparar(self):
+        """Cria o arquivo e as tabelas, acrescentando colunas novas dos modelos"""
+        engine = create_engine(f"sqlite:///{self.caminho}", poolclass=NullPool)
+        try:
+            with engine.begin() as connection:
+                tabelas = [Base.metadata.tables[t] for t in TABELAS]
+                Base.metadata.create_all(connection, tables=tabelas)
+                for tabela in tabelas:
+                    existentes = {row[1] for row in connection.execute(text(f"PRAGMA table_info({tabela.name})"))}
+                    for coluna in tabela.columns:
+                        if coluna.name not in existentes:
+                            tipo = coluna.type.compile(dialect=connection.dialect)
+                            connection.execute(text(f"ALTER TABLE {tabela.name} ADD COLUMN {coluna.name} {tipo}"))
+        finally:
+            engine.dispose()
+
+    @contextmanager
+    def _conexao_anexada(self):
+        """Conexão de escrita do banco ativo com o arquivo anexado como 'arquivo'"""
+        self._preparar()
+        with self.engine.connect() as connection:
+            # ATTACH não pode ser feito dentro de uma transação
+            connection.exec_driver_sql("ATTACH DATABASE ? AS arquivo", (self.caminho,))
+            connection.commit()
+            try:
+                yield connection
+            finally:
+                connection.rollback()
+                connection.exec_driver_sql("DETACH DATABASE arquivo")
+                connection.commit()
+
+    def _mover(self, connection, origem, destino, tabela, criterio, params=None):
+        """
+        Move as linhas que atendem ao critério de origem para destino.
+
+        Linhas cujo id já existe no destino (id reutilizado pelo SQLite) são
+        inseridas com um id novo. Retorna a quantidade movida.
+        """
+        colunas = [c.name for c in Base.metadata.tables[tabela].columns]
+        sem_id = ', '.join(c for c in colunas if c != 'id')
+        todas = ', '.join(colunas)
+
+        connection.execute(text(
+            f"CREATE TEMP TABLE _mover AS SELECT id, id IN (SELECT id FROM {destino}.{tabela}) AS conflito "
+            f"FROM {origem}.{tabela} WHERE {criterio}"
+        ), params or {})
+        try:
+            connection.execute(text(
+                f"INSERT INTO {destino}.{tabela} ({todas}) SELECT {todas} FROM {origem}.{tabela} "
+                f"WHERE id IN (SELECT id FROM temp._mover WHERE NOT conflito)"
+            ))
+            connection.execute(text(
+                f"INSERT INTO {destino}.{tabela} ({sem_id}) SELECT {sem_id} FROM {origem}.{tabela} "
+                f"WHERE id IN (SELECT id FROM temp._mover WHERE conflito) ORDER BY id"
+            ))
+            return connection.execute(text(
+                f"DELETE FROM {origem}.{tabela} WHERE id IN (SELECT id FROM temp._mover)"
+            )).rowcount
+        finally:
+            connection.execute(text("DROP TABLE temp._mover"))
+
+    def arquivar(self, anos=None):
+        """
+        Arquiva os contratos encerrados e os recibos pagos há mais de ``anos``
+        anos (padrão: DB_ARQUIVO_ANOS ou 5). Retorna as quantidades movidas.
+        """
+        if anos is None:
+            anos = int(os.getenv('DB_ARQUIVO_ANOS', ANOS_PADRAO))
+        limite = data_limite(anos)
+
+        with self._conexao_anexada() as connection:
+            with connection.begin():
+                movidos = {
+                    'contratos': self._mover(connection, 'main', 'arquivo', 'contratos', _CONTRATO_ENCERRADO),
+                    'recibos': self._mover(connection, 'main', 'arquivo', 'recibos',
+                                           "data_pagamento < :limite", {'limite': limite.isoformat()}),
+                }
+                reconstruir_arquivado(connection)
+        invalidar(TABELAS)
+        return movidos
+
+    def restaurar(self, contratos=None, recibos=None):
+        """
+        Devolve registros do arquivo ao banco ativo.
+
+        ``contratos`` e ``recibos`` são listas de ids (None = todos, [] = nenhum).
+        Retorna as quantidades restauradas.
+        """
+        if not self.existe():
+            return {'contratos': 0, 'recibos': 0}
+
+        with self._conexao_anexada() as connection:
+            with connection.begin():
+                # Meses dos recibos restaurados, para recalcular o resumo mensal
+                linhas = connection.execute(
+                    select(Recibo.data_pagamento, Recibo.casa_id).where(text(_filtro_ids(recibos))),
+                    execution_options={'schema_translate_map': {None: 'arquivo'}}
+                )
+                chaves = chaves_de_linhas(Recibo, [dict(row._mapping) for row in linhas])
+                movidos = {
+                    'contratos': self._mover(connection, 'arquivo', 'main', 'contratos', _filtro_ids(contratos)),
+                    'recibos': self._mover(connection, 'arquivo', 'main', 'recibos', _filtro_ids(recibos)),
+                }
+                reconstruir_arquivado(connection)
+                recalcular(connection, chaves)
+        invalidar(TABELAS + (TABELA_RESUMO,))
+        return movidos
+
+    def resumir(self, connection):
+        """
+        Regrava resumo_arquivado na ``connection`` do banco ativo lendo o
+        arquivo por uma conexão própria (ATTACH não pode ser feito dentro de
+        uma transação, ex.: nas migrações). Retorna a quantidade de linhas.
+        """
+        if not self.existe():
+            # Nada foi arquivado ainda: resumo_arquivado já está vazio
+            return 0
+        self._preparar()
+        engine = create_engine(f"sqlite:///{self.caminho}", poolclass=NullPool)
+        try:
+            with engine.connect() as origem:
+                return reconstruir_arquivado(connection, origem, esquema='main')
+        finally:
+            engine.dispose()
+
+    def contar(self):
+        """Quantidade de registros no arquivo"""
+        if not self.existe():
+            return {t: 0 for t in TABELAS}
+        with self.sessao() as session:
+            return {t: session.execute(text(f"SELECT COUNT(*) FROM main.{t}")).scalar() for t in TABELAS}
+
+    def _criar_engine_leitura(self):
+        ativo = self.engine.url.database
+        engine = create_engine(
+            f"sqlite:///{self.caminho}", connect_args={'check_same_thread': False}, poolclass=NullPool
+        )
+
+        @event.listens_for(engine, "connect")
+        def _anexar_ativo(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("ATTACH DATABASE ? AS ativo", (ativo,))
+            finally:
+                cursor.close()
+
+        aplicar_perfil(engine, carregar_perfil(), somente_leitura=True)
+        return engine
+
+    @contextmanager
+    def sessao(self):
+        """
+        Sessão somente leitura sobre o arquivo para uso com os repositórios,
+        ex.: ``ContratoRepository(session).get_by_casa(casa_id)``.
+        """
+        self._preparar()
+        if self._engine_leitura is None:
+            self._engine_leitura = self._criar_engine_leitura()
+        session = Session(bind=self._engine_leitura)
+        # Os índices FTS são do banco ativo: no arquivo a busca usa LIKE
+        session.info['fts_tabelas'] = {t: False for t in TABELAS_FTS}
+        try:
+            yield session
+        finally:
+            session.close()
+
+    def fechar(self):
+        if self._engine_leitura is not None:
+            self._engine_leitura.dispose()
+            self._engine_leitura = None
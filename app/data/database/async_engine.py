@@ -0,0 +1,63 @@
+"""
+Acesso assíncrono ao banco (extensão asyncio do SQLAlchemy).
+
+Usa o driver aiosqlite, que é opcional: sem ele (ou sem greenlet) o
+aplicativo continua funcionando só com os repositórios síncronos. O engine
+assíncrono tem conexões próprias, com o mesmo perfil de PRAGMAs, e deve ser
+usado apenas pela thread do loop asyncio (ver AsyncBridge).
+
+Como o ``reader_engine``, as conexões são somente leitura (query_only): a
+única conexão de escrita é a do engine síncrono, e gravações feitas por
+aqui disputariam com ela o bloqueio do SQLite ("database is locked").
+Gravações usam SessionManager.scope().
+"""
+import os
+from sqlalchemy.engine import make_url
+from app.data.database.sqlite_profile import carregar_perfil, aplicar_perfil
+from app.data.database.sql_instrumentation import instrumentar
+
+# Driver assíncrono para cada backend suportado
+DRIVERS_ASYNC = {
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+
+def async_disponivel():
+    """Indica se as dependências do acesso assíncrono estão instaladas"""
+    try:
+        import aiosqlite  # noqa: F401
+        import greenlet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def criar_engine_async(db_config):
+    """
+    Cria o AsyncEngine para o mesmo banco de ``db_config``.
+
+    Levanta RuntimeError se o backend não tiver driver assíncrono, se as
+    dependências não estiverem instaladas ou se o banco for em memória (que
+    não seria compartilhado com o engine síncrono).
+    """
+    url = make_url(db_config.database_url)
+    backend = url.get_backend_name()
+    if backend not in DRIVERS_ASYNC:
+        raise RuntimeError(f"Acesso assíncrono não suportado para '{backend}'")
+    if not async_disponivel():
+        raise RuntimeError("instale aiosqlite e greenlet para o acesso assíncrono")
+    if url.database in (None, '', ':memory:'):
+        raise RuntimeError("banco em memória não pode ser aberto pelo engine assíncrono")
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(
+        url.set(drivername=DRIVERS_ASYNC[backend]),
+        echo=db_config.echo,
+        pool_size=int(os.getenv('DB_POOL_LEITURA', db_config.POOL_LEITURA_PADRAO)),
+        max_overflow=0,
+    )
+    # Os eventos de conexão ficam no engine síncrono que o AsyncEngine encapsula
+    aplicar_perfil(engine.sync_engine, db_config.perfil_sqlite or carregar_perfil(), somente_leitura=True)
+    instrumentar(engine.sync_engine)
+    return engine
@@ -0,0 +1,235 @@
+"""
+Backup e restauração do banco com o aplicativo aberto.
+
+A cópia usa a API de backup online do SQLite em passos de algumas páginas,
+em uma thread de trabalho. Em modo WAL a conexão de origem mantém uma
+transação de leitura durante a cópia: o aplicativo continua lendo e gravando
+normalmente e o backup corresponde ao instante em que começou. A cópia é
+conferida com ``integrity_check`` e salva compactada como
+``backup_AAAAMMDD_HHMMSS.db.gz``; só os N backups mais recentes são mantidos.
+
+O arquivo histórico (``<banco>_arquivo.db``, ver archive) é copiado na
+mesma transação de leitura, para ``backup_..._arquivo.db.gz`` ao lado do
+backup (vazio se ainda não há arquivo): os dois correspondem ao mesmo
+instante, mesmo com um "Arquivar" em andamento.
+
+A restauração descompacta o backup, confere a integridade e copia para o
+banco em uso pela mesma API, depois de guardar um backup do estado atual;
+o arquivo histórico é restaurado junto. Backups de versões anteriores não
+têm a cópia do arquivo e só são restaurados com o arquivo histórico vazio
+(senão os registros arquivados ficariam nos dois bancos).
+Deve ser feita com a conexão de escrita livre (nenhum SessionManager.scope aberto).
+"""
+import gzip
+import os
+import shutil
+import sqlite3
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from app.data.database.archive import caminho_arquivo
+
+# Páginas copiadas por passo e pausa entre passos (em segundos)
+PAGINAS_POR_PASSO = 256
+PAUSA_ENTRE_PASSOS = 0.005
+
+# Quantidade de backups mantidos na pasta (DB_BACKUP_MANTER no .env)
+MANTER_PADRAO = 10
+
+PREFIXO = 'backup_'
+EXTENSAO = '.db.gz'
+SUFIXO_ARQUIVO = '_arquivo'
+_FORMATO_DATA = '%Y%m%d_%H%M%S'
+
+
+class BackupError(Exception):
+    """Backup inválido ou falha na restauração"""
+
+
+def verificar_integridade(caminho, banco_principal=True):
+    """
+    Executa PRAGMA integrity_check em um arquivo SQLite; retorna a lista de
+    problemas. ``banco_principal`` confere também se é um banco do aplicativo.
+    """
+    conexao = sqlite3.connect(caminho)
+    try:
+        resultado = [row[0] for row in conexao.execute("PRAGMA integrity_check")]
+        tabelas = {row[0] for row in conexao.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    finally:
+        conexao.close()
+    problemas = [r for r in resultado if r != 'ok']
+    if banco_principal and 'schema_migracoes' not in tabelas:
+        problemas.append("arquivo não é um banco do AluguelFácil")
+    return problemas
+
+
+def _copiar(origem, destino, progresso=None, anexo=None):
+    """
+    Copia um banco SQLite para outro pela API de backup, em passos.
+
+    ``anexo`` é um par (origem, destino) de outro banco copiado no mesmo
+    snapshot que o principal (anexado à conexão de origem).
+    """
+    fonte = sqlite3.connect(origem, isolation_level=None)
+    alvo = sqlite3.connect(destino)
+    alvo_anexo = None
+    try:
+        if anexo:
+            fonte.execute("ATTACH DATABASE ? AS anexo", (anexo[0],))
+            alvo_anexo = sqlite3.connect(anexo[1])
+        if fonte.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal':
+            # Em WAL uma transação de leitura fixa o snapshot copiado: gravações
+            # continuam (vão para o WAL) sem fazer a cópia recomeçar a cada passo
+            fonte.execute("BEGIN")
+            fonte.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            if anexo:
+                # O anexo entra na mesma transação (um "Arquivar" espera a cópia)
+                fonte.execute("SELECT 1 FROM anexo.sqlite_master LIMIT 1").fetchall()
+
+        def _progresso(status, restantes, total):
+            if progresso:
+                progresso(total - restantes, total)
+        fonte.backup(alvo, pages=PAGINAS_POR_PASSO, progress=_progresso, sleep=PAUSA_ENTRE_PASSOS)
+        if anexo:
+            fonte.backup(alvo_anexo, name='anexo', pages=PAGINAS_POR_PASSO, sleep=PAUSA_ENTRE_PASSOS)
+    finally:
+        if alvo_anexo is not None:
+            alvo_anexo.close()
+        alvo.close()
+        fonte.close()
+
+
+def _compactar(origem, destino):
+    with open(origem, 'rb') as entrada, gzip.open(destino, 'wb', compresslevel=6) as saida:
+        shutil.copyfileobj(entrada, saida, 1024 * 1024)
+
+
+def caminho_copia_arquivo(backup):
+    """Cópia do arquivo histórico que acompanha o backup (``backup_..._arquivo.db.gz``)"""
+    backup = Path(backup)
+    return backup.with_name(f"{backup.name[:-len(EXTENSAO)]}{SUFIXO_ARQUIVO}{EXTENSAO}")
+
+
+def _tem_registros(caminho):
+    """Indica se o arquivo histórico tem contratos ou recibos"""
+    if not os.path.exists(caminho):
+        return False
+    conexao = sqlite3.connect(caminho)
+    try:
+        tabelas = {row[0] for row in conexao.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        return any(
+            conexao.execute(f"SELECT 1 FROM {tabela} LIMIT 1").fetchone()
+            for tabela in ('contratos', 'recibos') if tabela in tabelas
+        )
+    finally:
+        conexao.close()
+
+
+class GerenciadorBackup:
+    """Cria, lista, confere e restaura backups compactados do banco"""
+
+    def __init__(self, database_path, pasta=None, manter=None):
+        self.database_path = str(database_path)
+        self.arquivo_path = caminho_arquivo(self.database_path)
+        self.pasta = Path(pasta or os.getenv('DB_BACKUP_PASTA') or Path(self.database_path).resolve().parent / 'Backups')
+        self.manter = int(manter if manter is not None else os.getenv('DB_BACKUP_MANTER', MANTER_PADRAO))
+
+    def criar_backup(self, progresso=None, sufixo=''):
+        """
+        Gera um backup compactado do banco e aplica a retenção.
+
+        ``progresso(copiadas, total)`` é chamado a cada passo, na thread que
+        executa o backup. Retorna o caminho do arquivo gerado.
+        """
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        nome = f"{PREFIXO}{datetime.now().strftime(_FORMATO_DATA)}{sufixo}"
+        destino = self.pasta / f"{nome}{EXTENSAO}"
+
+        with tempfile.TemporaryDirectory(dir=self.pasta) as temporario:
+            copia = Path(temporario) / f"{nome}.db"
+            # Sem arquivo histórico a cópia fica vazia (restaurar o backup o esvazia)
+            copia_arquivo = Path(temporario) / f"{nome}{SUFIXO_ARQUIVO}.db"
+            copia_arquivo.touch()
+            anexo = (self.arquivo_path, str(copia_arquivo)) if os.path.exists(self.arquivo_path) else None
+            _copiar(self.database_path, str(copia), progresso, anexo)
+            problemas = verificar_integridade(str(copia))
+            problemas += verificar_integridade(str(copia_arquivo), banco_principal=False)
+            if problemas:
+                raise BackupError(f"Cópia do banco com problemas: {problemas[0]}")
+            _compactar(copia_arquivo, caminho_copia_arquivo(destino))
+            _compactar(copia, destino)
+
+        self.aplicar_retencao()
+        return destino
+
+    def listar(self):
+        """Backups existentes, do mais recente ao mais antigo: (caminho, data, tamanho em bytes)"""
+        if not self.pasta.exists():
+            return []
+        backups = []
+        for arquivo in self.pasta.glob(f"{PREFIXO}*{EXTENSAO}"):
+            if arquivo.name.endswith(f"{SUFIXO_ARQUIVO}{EXTENSAO}"):
+                continue
+            try:
+                data = datetime.strptime(arquivo.name[len(PREFIXO):len(PREFIXO) + 15], _FORMATO_DATA)
+            except ValueError:
+                continue
+            backups.append((arquivo, data, arquivo.stat().st_size))
+        return sorted(backups, key=lambda b: (b[1], b[0].name), reverse=True)
+
+    def aplicar_retencao(self):
+        """Apaga os backups além dos ``manter`` mais recentes; retorna os removidos"""
+        if self.manter <= 0:
+            return []
+        removidos = [b[0] for b in self.listar()[self.manter:]]
+        for arquivo in removidos:
+            arquivo.unlink()
+            caminho_copia_arquivo(arquivo).unlink(missing_ok=True)
+        return removidos
+
+    def verificar(self, arquivo):
+        """Descompacta o backup (e a cópia do arquivo histórico) em arquivos temporários e confere a integridade"""
+        with tempfile.TemporaryDirectory() as temporario:
+            self._descompactar_e_verificar(arquivo, temporario)
+            if caminho_copia_arquivo(arquivo).exists():
+                self._descompactar_e_verificar(caminho_copia_arquivo(arquivo), temporario, banco_principal=False)
+            return True
+
+    def _descompactar_e_verificar(self, arquivo, pasta_temporaria, banco_principal=True):
+        copia = Path(pasta_temporaria) / ('restaurar.db' if banco_principal else 'restaurar_arquivo.db')
+        try:
+            with gzip.open(arquivo, 'rb') as entrada, open(copia, 'wb') as saida:
+                shutil.copyfileobj(entrada, saida, 1024 * 1024)
+            problemas = verificar_integridade(str(copia), banco_principal)
+        except (OSError, EOFError, sqlite3.DatabaseError) as e:
+            raise BackupError(f"Backup ilegível: {e}")
+        if problemas:
+            raise BackupError(f"Backup com problemas: {problemas[0]}")
+        return copia
+
+    def restaurar(self, arquivo, progresso=None):
+        """
+        Substitui o conteúdo do banco pelo backup informado.
+
+        O backup é conferido antes e o estado atual é salvo como
+        ``backup_..._antes_restauracao.db.gz``; o arquivo histórico volta
+        junto. Retorna o caminho desse backup.
+        """
+        with tempfile.TemporaryDirectory() as temporario:
+            copia = self._descompactar_e_verificar(arquivo, temporario)
+            copia_arquivo = None
+            if caminho_copia_arquivo(arquivo).exists():
+                copia_arquivo = self._descompactar_e_verificar(
+                    caminho_copia_arquivo(arquivo), temporario, banco_principal=False
+                )
+            elif _tem_registros(self.arquivo_path):
+                raise BackupError(
+                    "este backup é de uma versão anterior e não inclui o arquivo histórico, que tem "
+                    "registros. Use \"Restaurar Registros Arquivados\" antes de restaurar o backup, "
+                    "para os registros não ficarem repetidos."
+                )
+            seguranca = self.criar_backup(sufixo='_antes_restauracao')
+            _copiar(str(copia), self.database_path, progresso)
+            if copia_arquivo is not None:
+                _copiar(str(copia_arquivo), self.arquivo_path)
+        return seguranca
@@ -1,6 +1,8 @@
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, StaticPool
 import os
 import sys
 from pathlib import Path
@@ -9,16 +11,47 @@ Base = declarative_base()
 
 
 class DatabaseConfig:
-    """Configuração centralizada do banco de dados"""
+    """
+    Configuração centralizada do banco de dados.
     
-    def __init__(self, database_url=None, echo=False):
+    No SQLite são criados dois engines que podem ser usados de qualquer thread:
+    
+    - ``engine``: uma única conexão de escrita (pool_size=1), então as
+      gravações de threads diferentes são serializadas pelo pool;
+    - ``reader_engine``: um pool de conexões somente leitura (query_only),
+      que em modo WAL leem em paralelo com a escrita.
+    
+    Cada thread deve usar a sua própria sessão (ver SessionManager.scope e
+    SessionManager.leitura); sessões não podem ser compartilhadas entre threads.
+    
+    Com ``DATABASE_URL`` no .env apontando para um banco em servidor
+    (PostgreSQL, MySQL...) há um único engine com pool de conexões
+    configurável; os PRAGMAs e recursos que dependem do arquivo SQLite
+    (backup, arquivo histórico, carteiras) ficam desativados.
+    """
+    
+    # Conexões de leitura para threads de trabalho (DB_POOL_LEITURA no .env)
+    POOL_LEITURA_PADRAO = 4
+    
+    # Pool dos bancos em servidor (DB_POOL_SIZE, DB_MAX_OVERFLOW,
+    # DB_POOL_RECYCLE em segundos e DB_POOL_PRE_PING no .env)
+    POOL_SIZE_PADRAO = 5
+    MAX_OVERFLOW_PADRAO = 10
+    POOL_RECYCLE_PADRAO = 1800
+    
+    def __init__(self, database_url=None, echo=False, perfil_sqlite=None):
         self.echo = echo
         self.engine = None
+        self.reader_engine = None
         self.SessionLocal = None
+        self.perfil_sqlite = perfil_sqlite
         
         # Define o caminho do banco de dados
         if database_url:
             self.database_url = database_url
+        elif os.getenv('DATABASE_URL', '').strip():
+            # Banco definido no .env (outro arquivo SQLite ou servidor)
+            self.database_url = os.getenv('DATABASE_URL').strip()
         else:
             # Usa a pasta de dados do usuário
             self.database_url = self._get_database_path()
@@ -55,25 +88,100 @@ class DatabaseConfig:
         return f'sqlite:///{db_path}'
     
     def initialize(self):
-        """Inicializa o engine e cria as tabelas"""
+        """Inicializa o engine e aplica as migrações pendentes (nada, se o schema já está atualizado)"""
+        from app.data.database.migrations import aplicar_migracoes
+        from app.data.database.sqlite_profile import carregar_perfil, aplicar_perfil
+        from app.data.database.sql_instrumentation import instrumentar
+
         try:
-            self.engine = create_engine(self.database_url, echo=self.echo)
-            Base.metadata.create_all(self.engine)
+            url = make_url(self.database_url)
+            if url.get_backend_name() == 'sqlite':
+                if self.perfil_sqlite is None:
+                    self.perfil_sqlite = carregar_perfil()
+                self.engine, self.reader_engine = self._criar_engines_sqlite(url)
+                aplicar_perfil(self.engine, self.perfil_sqlite)
+                if self.reader_engine is not self.engine:
+                    aplicar_perfil(self.reader_engine, self.perfil_sqlite, somente_leitura=True)
+            else:
+                # O servidor cuida da concorrência: leitura e escrita usam o mesmo pool
+                self.engine = self._criar_engine_servidor(url)
+                self.reader_engine = self.engine
+            instrumentar(self.engine)
+            if self.reader_engine is not self.engine:
+                instrumentar(self.reader_engine)
+            aplicar_migracoes(self.engine)
             self.SessionLocal = sessionmaker(bind=self.engine)
             print("✅ Banco de dados inicializado com sucesso!")
             return self.engine
         except Exception as e:
             print(f"❌ Erro ao inicializar banco de dados: {e}")
-            print(f"Caminho tentado: {self.database_url}")
+            print(f"Caminho tentado: {self.get_database_location()}")
             raise
     
+    def _criar_engines_sqlite(self, url):
+        """Cria o engine de escrita (conexão única) e o de leitura (pool)"""
+        from app.data.database.sql_instrumentation import connect_args_sqlite
+        
+        connect_args = {'check_same_thread': False, **connect_args_sqlite()}
+        
+        if url.database in (None, '', ':memory:'):
+            # Banco em memória só existe dentro de uma conexão: todos a compartilham
+            engine = create_engine(url, echo=self.echo, connect_args=connect_args,
+                                   poolclass=StaticPool)
+            return engine, engine
+        
+        escrita = create_engine(
+            url, echo=self.echo, connect_args=connect_args,
+            poolclass=QueuePool, pool_size=1, max_overflow=0
+        )
+        leitura = create_engine(
+            url, echo=self.echo, connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=int(os.getenv('DB_POOL_LEITURA', self.POOL_LEITURA_PADRAO)),
+            max_overflow=0
+        )
+        return escrita, leitura
+    
+    def _criar_engine_servidor(self, url):
+        """Cria o engine de um banco em servidor, com o pool configurado no .env"""
+        return create_engine(
+            url, echo=self.echo,
+            poolclass=QueuePool,
+            pool_size=int(os.getenv('DB_POOL_SIZE', self.POOL_SIZE_PADRAO)),
+            max_overflow=int(os.getenv('DB_MAX_OVERFLOW', self.MAX_OVERFLOW_PADRAO)),
+            # Conexões mais antigas que isso são reabertas (servidores derrubam conexões ociosas)
+            pool_recycle=int(os.getenv('DB_POOL_RECYCLE', self.POOL_RECYCLE_PADRAO)),
+            # Testa a conexão antes de usar, para não falhar após queda da rede
+            pool_pre_ping=os.getenv('DB_POOL_PRE_PING', '1').strip().lower() not in ('0', 'false', 'nao', 'não'),
+        )
+    
     def get_session(self):
         """Retorna uma nova sessão"""
         if not self.SessionLocal:
             raise RuntimeError("Database não inicializado. Execute initialize() primeiro.")
         return self.SessionLocal()
     
+    def close(self):
+        """Fecha as conexões dos engines (ao trocar de banco ou encerrar)"""
+        if self.reader_engine is not None and self.reader_engine is not self.engine:
+            self.reader_engine.dispose()
+        if self.engine is not None:
+            self.engine.dispose()
+    
+    @property
+    def is_server(self):
+        """Indica se o banco é um servidor (PostgreSQL, MySQL...), compartilhado com outras estações"""
+        return make_url(self.database_url).get_backend_name() != 'sqlite'
+    
+    @property
+    def is_local_file(self):
+        """Indica se o banco é um arquivo SQLite local (não servidor nem memória)"""
+        url = make_url(self.database_url)
+        return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+    
     def get_database_location(self):
-        """Retorna o caminho completo do arquivo de banco de dados"""
-        # Remove o prefixo 'sqlite:///'
-        return self.database_url.replace('sqlite:///', '')
+        """Retorna o caminho completo do arquivo de banco de dados (ou a URL, sem a senha)"""
+        if self.is_local_file:
+            # Remove o prefixo 'sqlite:///'
+            return self.database_url.replace('sqlite:///', '')
+        return make_url(self.database_url).render_as_string(hide_password=True)
@@ -0,0 +1,165 @@
+"""
+Diário de alterações (change data capture).
+
+Triggers nas tabelas de negócio registram em ``alteracoes`` cada linha
+inserida, alterada ou apagada, com uma sequência crescente (AUTOINCREMENT:
+nunca reutilizada, mesmo depois de ``descartar_ate``). Quem exporta ou
+sincroniza guarda a última sequência processada e lê só o que veio depois
+com ``alteracoes_desde``. Como são triggers, valem para qualquer caminho de
+escrita (ORM, SQL em lote, arquivamento).
+
+Se a sequência guardada não for mais válida (backup restaurado, diário
+descartado), ``precisa_carga_completa`` indica que é preciso exportar tudo.
+"""
+from collections import namedtuple
+from sqlalchemy import Table, Column, Integer, String, DateTime, Index, select, delete, func, text
+from app.data.database.base import Base
+
+TABELA = 'alteracoes'
+
+# Tabelas acompanhadas pelo diário
+TABELAS_MONITORADAS = ('inquilinos', 'casas', 'consumos', 'contratos', 'recibos')
+
+INSERCAO, ALTERACAO, EXCLUSAO = 'I', 'U', 'D'
+
+alteracoes = Table(
+    TABELA, Base.metadata,
+    Column('seq', Integer, primary_key=True, autoincrement=True),
+    Column('tabela', String(50), nullable=False),
+    Column('registro_id', Integer, nullable=False),
+    Column('operacao', String(1), nullable=False),
+    Column('momento', DateTime, nullable=False),
+    Index('ix_alteracoes_tabela_seq', 'tabela', 'seq'),
+    sqlite_autoincrement=True,
+)
+
+Alteracao = namedtuple('Alteracao', ['seq', 'tabela', 'registro_id', 'operacao', 'momento'])
+
+_AGORA = "datetime('now', 'localtime')"
+
+_EVENTOS = (
+    ('ai', 'AFTER INSERT', INSERCAO, 'new'),
+    ('au', 'AFTER UPDATE', ALTERACAO, 'new'),
+    ('ad', 'AFTER DELETE', EXCLUSAO, 'old'),
+)
+
+
+def _triggers():
+    """DDL dos triggers de todas as tabelas monitoradas"""
+    for tabela in TABELAS_MONITORADAS:
+        for sufixo, evento, operacao, linha in _EVENTOS:
+            yield f"""
+                CREATE TRIGGER IF NOT EXISTS {tabela}_cdc_{sufixo} {evento} ON {tabela} BEGIN
+                    INSERT INTO {TABELA}(tabela, registro_id, operacao, momento)
+                    VALUES ('{tabela}', {linha}.id, '{operacao}', {_AGORA});
+                END"""
+
+
+def criar_diario(connection):
+    """Cria a tabela do diário e os triggers das tabelas monitoradas"""
+    alteracoes.create(connection, checkfirst=True)
+    for ddl in _triggers():
+        connection.execute(text(ddl))
+
+
+def ultima_sequencia(connection):
+    """Maior sequência já usada (0 se o diário nunca recebeu alterações)"""
+    valor = None
+    if connection.dialect.name == 'sqlite':
+        # sqlite_sequence guarda o maior valor mesmo depois que as linhas são descartadas
+        valor = connection.execute(
+            text("SELECT seq FROM sqlite_sequence WHERE name = :nome"), {'nome': TABELA}
+        ).scalar()
+    if valor is None:
+        valor = connection.execute(select(func.max(alteracoes.c.seq))).scalar()
+    return valor or 0
+
+
+def precisa_carga_completa(connection, desde):
+    """
+    Indica se ``desde`` não permite mais uma exportação incremental: a
+    sequência é maior que a do banco (backup restaurado ou outro banco) ou
+    as alterações seguintes a ela já foram descartadas.
+    """
+    ultima = ultima_sequencia(connection)
+    if desde > ultima:
+        return True
+    primeira = connection.execute(select(func.min(alteracoes.c.seq))).scalar()
+    if primeira is None:
+        return desde < ultima
+    return desde < primeira - 1
+
+
+def alteracoes_desde(connection, desde=0, tabelas=None, ate=None, lote=500):
+    """
+    Percorre as alterações com sequência maior que ``desde`` (e até ``ate``), em ordem.
+
+    Lê em lotes de ``lote`` linhas (paginação por sequência), então pode ser
+    usado em diários grandes sem carregar tudo na memória.
+    """
+    while True:
+        query = select(alteracoes).where(alteracoes.c.seq > desde)
+        if tabelas:
+            query = query.where(alteracoes.c.tabela.in_(tabelas))
+        if ate is not None:
+            query = query.where(alteracoes.c.seq <= ate)
+        linhas = connection.execute(query.order_by(alteracoes.c.seq).limit(lote)).all()
+        for linha in linhas:
+            yield Alteracao(*linha)
+        if len(linhas) < lote:
+            return
+        desde = linhas[-1].seq
+
+
+def consolidar(lista):
+    """
+    Reduz alterações à operação final de cada registro: {(tabela, id): operacao}.
+
+    Inserção seguida de alterações continua inserção; inserção seguida de
+    exclusão desaparece; exclusão seguida de inserção (id reutilizado) vira
+    alteração.
+    """
+    resultado = {}
+    for alteracao in lista:
+        chave = (alteracao.tabela, alteracao.registro_id)
+        anterior = resultado.get(chave)
+        operacao = alteracao.operacao
+        if anterior == INSERCAO and operacao == ALTERACAO:
+            continue
+        if anterior == INSERCAO and operacao == EXCLUSAO:
+            del resultado[chave]
+            continue
+        if anterior == EXCLUSAO and operacao == INSERCAO:
+            operacao = ALTERACAO
+        resultado[chave] = operacao
+    return resultado
+
+
+def exportar_desde(connection, desde=0):
+    """
+    Dados para uma exportação incremental a partir de ``desde``.
+
+    Retorna ``(dados, ultima)``: ``dados`` tem, por tabela, as linhas atuais
+    dos registros inseridos ou alterados ('gravar') e os ids apagados
+    ('apagar'); ``ultima`` é a sequência a guardar para a próxima exportação.
+    """
+    ultima = ultima_sequencia(connection)
+    finais = consolidar(alteracoes_desde(connection, desde, ate=ultima))
+    dados = {}
+    for tabela in TABELAS_MONITORADAS:
+        gravar = [i for (t, i), op in finais.items() if t == tabela and op != EXCLUSAO]
+        apagar = [i for (t, i), op in finais.items() if t == tabela and op == EXCLUSAO]
+        if not gravar and not apagar:
+            continue
+        origem = Base.metadata.tables[tabela]
+        linhas = []
+        for inicio in range(0, len(gravar), 500):
+            ids = gravar[inicio:inicio + 500]
+            linhas += [dict(r._mapping) for r in connection.execute(select(origem).where(origem.c.id.in_(ids)))]
+        dados[tabela] = {'gravar': linhas, 'apagar': sorted(apagar)}
+    return dados, ultima
+
+
+def descartar_ate(connection, seq):
+    """Apaga do diário as alterações até ``seq`` (já processadas por todos); retorna a quantidade"""
+    return connection.execute(delete(alteracoes).where(alteracoes.c.seq <= seq)).rowcount
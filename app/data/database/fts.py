@@ -0,0 +1,156 @@
+"""
+Índice de busca textual (SQLite FTS5).
+
+Cada tabela FTS usa o id da entidade como rowid e é mantida pelos triggers
+abaixo, então inserções e alterações feitas por qualquer caminho (ORM,
+upsert em lote, SQL direto) já aparecem na busca. O tokenizador remove
+acentos: "jose" encontra "José".
+"""
+import re
+from sqlalchemy import Integer, text, column
+
+TOKENIZADOR = "unicode61 remove_diacritics 2"
+
+# Remove a pontuação do CPF para que "12345678900" encontre "123.456.789-00"
+_CPF_DIGITOS = "replace(replace(replace({}, '.', ''), '-', ''), ' ', '')"
+
+TABELAS_FTS = {
+    'inquilinos_fts': ('nome_completo', 'cpf', 'cpf_digitos', 'telefone'),
+    'casas_fts': ('nome', 'endereco', 'nome_inquilino'),
+    'recibos_fts': ('nome_pagador', 'referente_a', 'descricao'),
+}
+
+_VALORES_INQUILINO = "new.id, new.nome_completo, new.cpf, {}, new.telefone".format(
+    _CPF_DIGITOS.format('new.cpf')
+)
+_VALORES_CASA = (
+    "new.id, new.nome, new.endereco, "
+    "(SELECT nome_completo FROM inquilinos WHERE id = new.inquilino_id)"
+)
+_VALORES_RECIBO = "new.id, new.nome_pagador, new.referente_a, new.descricao"
+
+TRIGGERS = {
+    'inquilinos_fts_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS inquilinos_fts_ai AFTER INSERT ON inquilinos BEGIN
+            INSERT INTO inquilinos_fts(rowid, nome_completo, cpf, cpf_digitos, telefone)
+            VALUES ({_VALORES_INQUILINO});
+        END""",
+    'inquilinos_fts_au': f"""
+        CREATE TRIGGER IF NOT EXISTS inquilinos_fts_au AFTER UPDATE ON inquilinos BEGIN
+            DELETE FROM inquilinos_fts WHERE rowid = old.id;
+            INSERT INTO inquilinos_fts(rowid, nome_completo, cpf, cpf_digitos, telefone)
+            VALUES ({_VALORES_INQUILINO});
+            UPDATE casas_fts SET nome_inquilino = new.nome_completo
+            WHERE rowid IN (SELECT id FROM casas WHERE inquilino_id = new.id);
+        END""",
+    'inquilinos_fts_ad': """
+        CREATE TRIGGER IF NOT EXISTS inquilinos_fts_ad AFTER DELETE ON inquilinos BEGIN
+            DELETE FROM inquilinos_fts WHERE rowid = old.id;
+            UPDATE casas_fts SET nome_inquilino = NULL
+            WHERE rowid IN (SELECT id FROM casas WHERE inquilino_id = old.id);
+        END""",
+    'casas_fts_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS casas_fts_ai AFTER INSERT ON casas BEGIN
+            INSERT INTO casas_fts(rowid, nome, endereco, nome_inquilino)
+            VALUES ({_VALORES_CASA});
+        END""",
+    'casas_fts_au': f"""
+        CREATE TRIGGER IF NOT EXISTS casas_fts_au AFTER UPDATE ON casas BEGIN
+            DELETE FROM casas_fts WHERE rowid = old.id;
+            INSERT INTO casas_fts(rowid, nome, endereco, nome_inquilino)
+            VALUES ({_VALORES_CASA});
+        END""",
+    'casas_fts_ad': """
+        CREATE TRIGGER IF NOT EXISTS casas_fts_ad AFTER DELETE ON casas BEGIN
+            DELETE FROM casas_fts WHERE rowid = old.id;
+        END""",
+    'recibos_fts_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS recibos_fts_ai AFTER INSERT ON recibos BEGIN
+            INSERT INTO recibos_fts(rowid, nome_pagador, referente_a, descricao)
+            VALUES ({_VALORES_RECIBO});
+        END""",
+    'recibos_fts_au': f"""
+        CREATE TRIGGER IF NOT EXISTS recibos_fts_au AFTER UPDATE ON recibos BEGIN
+            DELETE FROM recibos_fts WHERE rowid = old.id;
+            INSERT INTO recibos_fts(rowid, nome_pagador, referente_a, descricao)
+            VALUES ({_VALORES_RECIBO});
+        END""",
+    'recibos_fts_ad': """
+        CREATE TRIGGER IF NOT EXISTS recibos_fts_ad AFTER DELETE ON recibos BEGIN
+            DELETE FROM recibos_fts WHERE rowid = old.id;
+        END""",
+}
+
+_CARGA_INICIAL = {
+    'inquilinos_fts': f"""
+        INSERT INTO inquilinos_fts(rowid, nome_completo, cpf, cpf_digitos, telefone)
+        SELECT id, nome_completo, cpf, {_CPF_DIGITOS.format('cpf')}, telefone FROM inquilinos""",
+    'casas_fts': """
+        INSERT INTO casas_fts(rowid, nome, endereco, nome_inquilino)
+        SELECT c.id, c.nome, c.endereco, i.nome_completo
+        FROM casas c LEFT JOIN inquilinos i ON i.id = c.inquilino_id""",
+    'recibos_fts': """
+        INSERT INTO recibos_fts(rowid, nome_pagador, referente_a, descricao)
+        SELECT id, nome_pagador, referente_a, descricao FROM recibos""",
+}
+
+
+def fts5_suportado(connection):
+    """Verifica se o SQLite em uso foi compilado com FTS5"""
+    opcoes = connection.execute(text("PRAGMA compile_options")).scalars().all()
+    return 'ENABLE_FTS5' in opcoes
+
+
+def criar_indices_fts(connection):
+    """Cria as tabelas FTS e os triggers e indexa os registros existentes"""
+    for tabela, colunas in TABELAS_FTS.items():
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {tabela} "
+            f"USING fts5({', '.join(colunas)}, tokenize='{TOKENIZADOR}')"
+        ))
+    reconstruir_indices_fts(connection)
+    for ddl in TRIGGERS.values():
+        connection.execute(text(ddl))
+
+
+def reconstruir_indices_fts(connection):
+    """Reindexa do zero todas as tabelas FTS a partir das tabelas de origem"""
+    for tabela, carga in _CARGA_INICIAL.items():
+        connection.execute(text(f"DELETE FROM {tabela}"))
+        connection.execute(text(carga))
+
+
+def fts_disponivel(session, tabela):
+    """Indica se a tabela FTS existe no banco da sessão (resultado guardado na sessão)"""
+    cache = session.info.setdefault('fts_tabelas', {})
+    if tabela not in cache:
+        bind = session.get_bind()
+        cache[tabela] = bind.dialect.name == 'sqlite' and session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :nome"),
+            {'nome': tabela}
+        ).first() is not None
+    return cache[tabela]
+
+
+def montar_consulta(termo, coluna=None):
+    """
+    Converte o texto digitado em uma consulta FTS5 por prefixo.
+
+    Cada palavra vira um prefixo ("jo" encontra "José") e todas precisam
+    aparecer. Retorna None se o termo não tiver nenhuma palavra.
+    """
+    palavras = re.findall(r'\w+', termo or '')
+    if not palavras:
+        return None
+    consulta = ' '.join(f'"{p}"*' for p in palavras)
+    return f"{coluna} : ({consulta})" if coluna else consulta
+
+
+def select_ids(tabela, consulta, ordenar=False, limit=None):
+    """SELECT dos rowids que atendem à consulta, opcionalmente por relevância"""
+    sql = f"SELECT rowid FROM {tabela} WHERE {tabela} MATCH :consulta"
+    if ordenar:
+        sql += " ORDER BY rank"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return text(sql).bindparams(consulta=consulta).columns(column('rowid', Integer))
@@ -0,0 +1,307 @@
+"""
+Migrações versionadas do schema.
+
+Cada migração recebe uma conexão já dentro de uma transação e deve ser
+idempotente: bancos criados antes do controle de versões passam por todas
+elas na primeira execução.
+
+No SQLite, depois de migrar, uma impressão digital do schema (tabelas,
+colunas e índices dos modelos mais a lista de migrações) fica gravada em
+``PRAGMA user_version``. Se ela bate com a do código, a abertura do banco
+se resume a essa leitura, sem inspecionar tabelas nem executar DDL.
+"""
+import zlib
+from collections import namedtuple
+from datetime import datetime, date
+from sqlalchemy import Table, Column, Integer, String, DateTime, select, insert, text, inspect, literal, exists
+from sqlalchemy.exc import DBAPIError
+from app.data.database.base import Base
+from app.data.database.fts import fts5_suportado, criar_indices_fts
+from app.data.database.monthly_summary import reconstruir as reconstruir_resumo, CHAVE_TRAVA
+from app.data.database.change_journal import criar_diario
+from app.data.database.archive import ArquivoHistorico, caminho_arquivo
+
+Migracao = namedtuple('Migracao', ['versao', 'descricao', 'aplicar'])
+
+MIGRACOES = []
+
+versoes_schema = Table(
+    'schema_migracoes', Base.metadata,
+    Column('versao', Integer, primary_key=True),
+    Column('descricao', String(200), nullable=False),
+    Column('aplicada_em', DateTime, nullable=False),
+)
+
+
+def migracao(versao, descricao):
+    """Registra uma função como migração do schema"""
+    def registrar(func):
+        MIGRACOES.append(Migracao(versao, descricao, func))
+        return func
+    return registrar
+
+
+class MigracaoError(Exception):
+    """Migração que não pôde ser aplicada (o banco fica na versão anterior)"""
+
+
+def _criar_indices(connection, tabela):
+    """
+    Cria os índices declarados no modelo que ainda não existem no banco.
+    Retorna quantos registros repetidos foram separados para criar os únicos.
+    """
+    separados = 0
+    for index in sorted(Base.metadata.tables[tabela].indexes, key=lambda i: i.name):
+        colunas = [c.name for c in index.columns]
+        if index.unique:
+            movidas = _separar_duplicados(connection, tabela, colunas)
+            if movidas:
+                print(f"🔧 {movidas} registro(s) repetido(s) em {tabela}({', '.join(colunas)}) "
+                      f"movido(s) para {tabela}_duplicados")
+            separados += movidas
+        try:
+            index.create(connection, checkfirst=True)
+        except DBAPIError as e:
+            raise MigracaoError(
+                f"Não foi possível criar o índice único {index.name} em {tabela}: {e.orig}"
+            ) from e
+    return separados
+
+
+def _referencias(tabela):
+    """(tabela, coluna) das chaves estrangeiras que apontam para ``tabela``"""
+    return sorted(
+        (filha.name, fk.parent.name)
+        for filha in Base.metadata.tables.values()
+        for fk in filha.foreign_keys
+        if fk.column.table.name == tabela
+    )
+
+
+def _separar_duplicados(connection, tabela, colunas):
+    """
+    Deixa na tabela só a linha mais recente (maior id) de cada chave repetida.
+
+    As outras são copiadas para ``<tabela>_duplicados`` antes de sair da
+    tabela, para que o usuário possa conferi-las, e as chaves estrangeiras
+    que apontavam para elas (ex.: casas, contratos e recibos de um inquilino
+    com CPF repetido) passam a apontar para a linha mantida. Retorna quantas
+    saíram.
+    """
+    lista = ', '.join(colunas)
+    preenchidas = ' AND '.join(f"{c} IS NOT NULL" for c in colunas)
+    # Tabela derivada: o MySQL não aceita subconsulta na própria tabela do DELETE
+    repetidas = (
+        f"{preenchidas} AND id NOT IN (SELECT id FROM "
+        f"(SELECT MAX(id) AS id FROM {tabela} WHERE {preenchidas} GROUP BY {lista}) AS manter)"
+    )
+    if connection.execute(text(f"SELECT 1 FROM {tabela} WHERE {repetidas} LIMIT 1")).first() is None:
+        return 0
+    connection.execute(text(f"CREATE TABLE IF NOT EXISTS {tabela}_duplicados AS SELECT * FROM {tabela} WHERE 1 = 0"))
+    connection.execute(text(f"INSERT INTO {tabela}_duplicados SELECT * FROM {tabela} WHERE {repetidas}"))
+    mesma_chave = ' AND '.join(f"mantida.{c} = repetida.{c}" for c in colunas)
+    for filha, coluna in _referencias(tabela):
+        connection.execute(text(
+            f"UPDATE {filha} SET {coluna} = (SELECT MAX(mantida.id) FROM {tabela} mantida "
+            f"JOIN {tabela} repetida ON {mesma_chave} WHERE repetida.id = {filha}.{coluna}) "
+            f"WHERE {coluna} IN (SELECT id FROM {tabela} WHERE {repetidas})"
+        ))
+    return connection.execute(text(f"DELETE FROM {tabela} WHERE {repetidas}")).rowcount
+
+
+def _coluna_encerramento(connection):
+    if 'data_encerramento' not in {c['name'] for c in inspect(connection).get_columns('contratos')}:
+        connection.execute(text("ALTER TABLE contratos ADD COLUMN data_encerramento DATE"))
+
+
+def _reconstruir_resumo(connection):
+    """
+    Reconstrói o resumo mensal (o cálculo lê contratos.data_encerramento, da
+    migração 009, e a tabela resumo_arquivado, da 011)
+    """
+    _coluna_encerramento(connection)
+    Base.metadata.tables['resumo_arquivado'].create(connection, checkfirst=True)
+    reconstruir_resumo(connection)
+
+
+@migracao(1, "Schema inicial")
+def _schema_inicial(connection):
+    Base.metadata.create_all(connection)
+
+
+@migracao(2, "Índices compostos dos filtros de consumos, contratos e recibos")
+def _indices_compostos(connection):
+    for tabela in ('casas', 'consumos', 'contratos', 'recibos'):
+        _criar_indices(connection, tabela)
+
+
+@migracao(3, "Tabela de sequências para numeração de recibos")
+def _sequencias(connection):
+    Base.metadata.tables['sequencias'].create(connection, checkfirst=True)
+
+
+@migracao(4, "Índice de busca textual (FTS5) de inquilinos, casas e recibos")
+def _busca_textual(connection):
+    if connection.dialect.name != 'sqlite' or not fts5_suportado(connection):
+        # Sem FTS5 os repositórios continuam buscando com LIKE
+        print("⚠️  Banco sem suporte a FTS5: busca textual usará LIKE")
+        return
+    criar_indices_fts(connection)
+
+
+@migracao(5, "Resumo mensal por casa para o painel")
+def _resumo_mensal(connection):
+    Base.metadata.tables['resumo_mensal'].create(connection, checkfirst=True)
+    _reconstruir_resumo(connection)
+
+
+@migracao(6, "Diário de alterações para exportação incremental")
+def _diario_alteracoes(connection):
+    if connection.dialect.name != 'sqlite':
+        print("⚠️  Diário de alterações disponível apenas no SQLite")
+        return
+    criar_diario(connection)
+
+
+@migracao(7, "Número reservado gravado no recibo")
+def _numero_recibo(connection):
+    if 'numero' not in {c['name'] for c in inspect(connection).get_columns('recibos')}:
+        connection.execute(text("ALTER TABLE recibos ADD COLUMN numero VARCHAR(20)"))
+    # Recibos antigos eram reimpressos com o id: passam a guardar esse número,
+    # e a sequência global continua depois do maior id para não repeti-lo
+    ids = [row[0] for row in connection.execute(text("SELECT id FROM recibos WHERE numero IS NULL"))]
+    if ids:
+        connection.execute(
+            text("UPDATE recibos SET numero = :numero WHERE id = :id"),
+            [{'id': i, 'numero': f"{i:06d}"} for i in ids]
+        )
+    connection.execute(text(
+        "UPDATE sequencias SET ultimo_valor = (SELECT MAX(id) FROM recibos) "
+        "WHERE chave = 'recibo' AND ultimo_valor < (SELECT MAX(id) FROM recibos)"
+    ))
+
+
+@migracao(8, "Unicidade dos índices criados sem ela por causa de registros repetidos")
+def _indices_unicos(connection):
+    existentes = {}
+    for tabela in ('consumos', 'inquilinos'):
+        existentes.update({i['name']: i for i in inspect(connection).get_indexes(tabela)})
+    for tabela in ('consumos', 'inquilinos'):
+        for index in Base.metadata.tables[tabela].indexes:
+            if index.unique and index.name in existentes and not existentes[index.name]['unique']:
+                connection.execute(text(f"DROP INDEX {index.name}"))
+        if _criar_indices(connection, tabela) and tabela == 'consumos':
+            # Os consumos separados ainda somavam no resumo mensal
+            _reconstruir_resumo(connection)
+
+
+@migracao(9, "Data de encerramento dos contratos")
+def _data_encerramento(connection):
+    _coluna_encerramento(connection)
+    # Encerrados antes desta versão: a data real não foi guardada, mas o
+    # contrato não vigora depois de hoje
+    connection.execute(
+        text("UPDATE contratos SET data_encerramento = :hoje "
+             "WHERE (ativo IS NULL OR ativo = 0) AND data_encerramento IS NULL AND data_fim > :hoje"),
+        {'hoje': date.today().isoformat()}
+    )
+    # O resumo passa a contar os meses dos contratos encerrados
+    _reconstruir_resumo(connection)
+
+
+@migracao(10, "Linha de trava do resumo mensal para recibos sem casa")
+def _trava_resumo(connection):
+    sequencias = Base.metadata.tables['sequencias']
+    connection.execute(insert(sequencias).from_select(
+        ['chave', 'ultimo_valor'],
+        select(literal(CHAVE_TRAVA), literal(0)).where(
+            ~exists().where(sequencias.c.chave == CHAVE_TRAVA)
+        )
+    ))
+
+
+@migracao(11, "Resumo dos contratos e recibos do arquivo histórico")
+def _resumo_arquivado(connection):
+    Base.metadata.tables['resumo_arquivado'].create(connection, checkfirst=True)
+    banco = connection.engine.url.database
+    if connection.dialect.name != 'sqlite' or banco in (None, '', ':memory:'):
+        return
+    if ArquivoHistorico(connection.engine, caminho_arquivo(banco)).resumir(connection):
+        # "Recalcular Resumo Mensal" descartava os meses que só tinham registros arquivados
+        _reconstruir_resumo(connection)
+
+
+def get_versao_atual(connection):
+    """Retorna a maior versão de migração aplicada (0 se nenhuma)"""
+    versoes_schema.create(connection, checkfirst=True)
+    versao = connection.execute(select(versoes_schema.c.versao).order_by(
+        versoes_schema.c.versao.desc()
+    )).scalar()
+    return versao or 0
+
+
+def impressao_schema():
+    """
+    Número (31 bits, nunca 0) que muda sempre que um modelo ganha ou perde
+    tabela, coluna ou índice, ou quando uma migração é adicionada.
+    """
+    partes = [f"{m.versao}:{m.descricao}" for m in sorted(MIGRACOES, key=lambda m: m.versao)]
+    for tabela in sorted(Base.metadata.tables.values(), key=lambda t: t.name):
+        colunas = ','.join(
+            f"{c.name} {c.type!r} {c.nullable} {c.primary_key}" for c in tabela.columns
+        )
+        indices = ','.join(sorted(
+            f"{i.name}({'+'.join(c.name for c in i.columns)}){i.unique}" for i in tabela.indexes
+        ))
+        partes.append(f"{tabela.name}[{colunas}][{indices}]")
+    return (zlib.crc32('|'.join(partes).encode('utf-8')) & 0x7FFFFFFF) or 1
+
+
+def _ler_impressao(connection):
+    if connection.dialect.name != 'sqlite':
+        return None
+    return connection.execute(text("PRAGMA user_version")).scalar()
+
+
+def _gravar_impressao(connection, valor):
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text(f"PRAGMA user_version = {int(valor)}"))
+
+
+def aplicar_migracoes(engine, forcar=False):
+    """
+    Aplica, em ordem, as migrações ainda não registradas no banco.
+
+    Se a impressão do schema gravada no banco for a atual (ver
+    ``impressao_schema``), retorna 0 sem mais consultas; ``forcar`` faz a
+    verificação completa mesmo assim.
+    """
+    # Garante que todos os modelos estejam registrados em Base.metadata
+    import app.data.models  # noqa: F401
+
+    impressao = impressao_schema()
+    with engine.connect() as connection:
+        if not forcar and _ler_impressao(connection) == impressao:
+            return 0
+
+    with engine.begin() as connection:
+        versao_atual = get_versao_atual(connection)
+
+    aplicadas = 0
+    for m in sorted(MIGRACOES, key=lambda m: m.versao):
+        if m.versao <= versao_atual:
+            continue
+        with engine.begin() as connection:
+            m.aplicar(connection)
+            connection.execute(insert(versoes_schema).values(
+                versao=m.versao, descricao=m.descricao, aplicada_em=datetime.now()
+            ))
+        print(f"🔧 Migração {m.versao:03d} aplicada: {m.descricao}")
+        aplicadas += 1
+
+    with engine.begin() as connection:
+        # Tabelas de modelos novos que ainda não têm migração própria
+        Base.metadata.create_all(connection)
+        _gravar_impressao(connection, impressao)
+
+    return aplicadas
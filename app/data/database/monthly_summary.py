@@ -0,0 +1,320 @@
+"""
+Manutenção da tabela resumo_mensal.
+
+Sempre que recibos, consumos ou contratos são gravados, os meses/casas
+afetados (valores novos e antigos) são recalculados dentro da mesma
+transação, a partir das linhas de origem e usando os índices por casa e
+data. Assim o painel lê algumas centenas de linhas prontas em vez do
+histórico inteiro. ``reconstruir`` refaz a tabela do zero.
+
+Contratos e recibos movidos para o arquivo histórico continuam contando:
+os totais deles ficam em resumo_arquivado (ver ``reconstruir_arquivado``)
+e são somados a cada cálculo.
+
+Os totais são calculados com consultas agrupadas (GROUP BY) por tabela de
+origem, e não mês a mês, então recalcular muitas chaves custa poucas
+consultas.
+
+Num banco em servidor, duas estações podem gravar na mesma casa ao mesmo
+tempo e cada uma recalcularia sem ver o lançamento da outra. Por isso o
+recálculo trava antes as linhas das casas envolvidas (ver ``_travar``).
+"""
+import calendar
+from datetime import date
+from sqlalchemy import event, inspect, select, delete, insert, func, case, extract, or_
+from sqlalchemy.orm import Session
+from app.data.models.receipt import Recibo
+from app.data.models.consumption import Consumo
+from app.data.models.contract import Contrato
+from app.data.models.monthly_summary import ResumoMensal, ResumoArquivado
+from app.data.models.house import Casa
+from app.data.models.sequence import Sequencia
+from app.data.database.query_cache import registrar_escrita
+
+TABELA = ResumoMensal.__tablename__
+
+# Linha de ``sequencias`` travada no lugar da casa 0 (recibos sem casa)
+CHAVE_TRAVA = 'resumo_mensal'
+
+
+def _meses_entre(inicio, fim):
+    """(ano, mes) de cada mês entre as duas datas, inclusive"""
+    if not inicio or not fim:
+        return []
+    ano, mes = inicio.year, inicio.month
+    meses = []
+    while (ano, mes) <= (fim.year, fim.month):
+        meses.append((ano, mes))
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return meses
+
+
+def _chaves_recibo(data_pagamento, casa_id):
+    if data_pagamento is None:
+        return set()
+    return {(data_pagamento.year, data_pagamento.month, casa_id or 0)}
+
+
+def _chaves_consumo(ano, mes, casa_id):
+    if not ano or not mes or not casa_id:
+        return set()
+    return {(ano, mes, casa_id)}
+
+
+def _chaves_contrato(data_inicio, data_fim, casa_id):
+    if not casa_id:
+        return set()
+    return {(ano, mes, casa_id) for ano, mes in _meses_entre(data_inicio, data_fim)}
+
+
+_CAMPOS = {
+    Recibo: (('data_pagamento', 'casa_id'), _chaves_recibo),
+    Consumo: (('ano', 'mes', 'casa_id'), _chaves_consumo),
+    Contrato: (('data_inicio', 'data_fim', 'casa_id'), _chaves_contrato),
+}
+
+
+def chaves_do_objeto(obj):
+    """Meses/casas afetados por um objeto, com os valores atuais e os anteriores à alteração"""
+    campos = _CAMPOS.get(type(obj))
+    if campos is None:
+        return set()
+    nomes, calcular = campos
+    estado = inspect(obj)
+    atuais = [getattr(obj, n) for n in nomes]
+    chaves = calcular(*atuais)
+
+    anteriores = []
+    for nome, atual in zip(nomes, atuais):
+        historico = estado.attrs[nome].history
+        anteriores.append(historico.deleted[0] if historico.deleted else atual)
+    if anteriores != atuais:
+        chaves |= calcular(*anteriores)
+    return chaves
+
+
+def chaves_de_linhas(model, rows):
+    """Meses/casas afetados por linhas gravadas em lote (dicionários com as colunas)"""
+    campos = _CAMPOS.get(model)
+    if campos is None:
+        return set()
+    nomes, calcular = campos
+    chaves = set()
+    for row in rows:
+        if all(n in row for n in nomes):
+            chaves |= calcular(*(row[n] for n in nomes))
+    return chaves
+
+
+def chaves_por_ids(connection, model, ids):
+    """Meses/casas afetados pelas linhas de ``model`` com os ids informados"""
+    campos = _CAMPOS.get(model)
+    if campos is None or not ids:
+        return set()
+    nomes, calcular = campos
+    colunas = [getattr(model, n) for n in nomes]
+    chaves = set()
+    for row in connection.execute(select(*colunas).where(model.id.in_(ids))):
+        chaves |= calcular(*row)
+    return chaves
+
+
+# Casas por consulta ao recalcular (limite de parâmetros do SQLite)
+LOTE_CASAS = 500
+
+
+def _fim_do_mes(ano, mes):
+    return date(ano, mes, calendar.monthrange(ano, mes)[1])
+
+
+def _calcular(connection, casas=None, inicio=None, fim=None, esquema=None):
+    """
+    Linhas do resumo a partir das tabelas de origem, com uma consulta agrupada
+    por tabela. Sem ``casas`` calcula tudo; com elas, só os meses entre
+    ``inicio`` e ``fim`` dessas casas (0 = recibos sem casa).
+
+    Com ``esquema`` lê só os contratos e recibos desse banco anexado (o
+    arquivo histórico); sem ele, soma às tabelas ativas o resumo_arquivado.
+    """
+    opcoes = {'schema_translate_map': {None: esquema}} if esquema else {}
+    linhas = {}
+
+    def linha(ano, mes, casa_id):
+        chave = (int(ano), int(mes), casa_id or 0)
+        if chave not in linhas:
+            linhas[chave] = {
+                'ano': chave[0], 'mes': chave[1], 'casa_id': chave[2],
+                'receita_total': 0.0, 'receita_aluguel': 0.0, 'quantidade_recibos': 0,
+                'energia_kwh': 0.0, 'energia_valor': 0.0,
+                'aluguel_contratado': 0.0, 'ocupada': 0,
+            }
+        return linhas[chave]
+
+    ano_recibo = extract('year', Recibo.data_pagamento)
+    mes_recibo = extract('month', Recibo.data_pagamento)
+    recibos = select(
+        ano_recibo, mes_recibo, Recibo.casa_id,
+        func.sum(Recibo.valor),
+        func.sum(case((Recibo.tipo_recibo == 'aluguel', Recibo.valor), else_=0.0)),
+        func.count(Recibo.id),
+    ).group_by(ano_recibo, mes_recibo, Recibo.casa_id)
+    periodo_consumo = Consumo.ano * 100 + Consumo.mes
+    consumos = select(
+        Consumo.ano, Consumo.mes, Consumo.casa_id,
+        func.sum(Consumo.consumo_diferenca), func.sum(Consumo.valor_conta),
+    ).where(Consumo.casa_id.is_not(None)).group_by(Consumo.ano, Consumo.mes, Consumo.casa_id)
+    contratos = select(
+        Contrato.casa_id, Contrato.data_inicio, Contrato.data_fim,
+        Contrato.data_encerramento, Contrato.valor_aluguel,
+    )
+
+    if casas is not None:
+        com_casa = [c for c in casas if c]
+        filtro_casa = Recibo.casa_id.in_(com_casa)
+        if 0 in casas:
+            filtro_casa = or_(filtro_casa, Recibo.casa_id.is_(None))
+        recibos = recibos.where(filtro_casa, Recibo.data_pagamento >= inicio, Recibo.data_pagamento <= fim)
+        consumos = consumos.where(
+            Consumo.casa_id.in_(com_casa),
+            periodo_consumo >= inicio.year * 100 + inicio.month,
+            periodo_consumo <= fim.year * 100 + fim.month,
+        )
+        contratos = contratos.where(
+            Contrato.casa_id.in_(com_casa), Contrato.data_inicio <= fim, Contrato.data_fim >= inicio
+        )
+
+    for ano, mes, casa_id, total, aluguel, quantidade in connection.execute(recibos, execution_options=opcoes):
+        valores = linha(ano, mes, casa_id)
+        valores['receita_total'] = total or 0.0
+        valores['receita_aluguel'] = aluguel or 0.0
+        valores['quantidade_recibos'] = quantidade
+
+    # Consumos não são arquivados: só existem no banco ativo
+    if esquema is None:
+        for ano, mes, casa_id, kwh, valor in connection.execute(consumos):
+            valores = linha(ano, mes, casa_id)
+            valores['energia_kwh'] = kwh or 0.0
+            valores['energia_valor'] = valor or 0.0
+
+    # A ocupação vem das datas, não de ``ativo``: um contrato encerrado
+    # continua contando nos meses em que vigorou (até data_encerramento)
+    linhas_contratos = connection.execute(contratos, execution_options=opcoes)
+    for casa_id, data_inicio, data_fim, encerramento, valor_aluguel in linhas_contratos:
+        if encerramento:
+            data_fim = min(data_fim, encerramento)
+        if casas is not None:
+            data_inicio, data_fim = max(data_inicio, inicio), min(data_fim, fim)
+        for ano, mes in _meses_entre(data_inicio, data_fim):
+            valores = linha(ano, mes, casa_id)
+            valores['aluguel_contratado'] += valor_aluguel or 0.0
+            valores['ocupada'] = 1
+
+    if esquema is None:
+        arquivados = select(ResumoArquivado)
+        if casas is not None:
+            periodo = ResumoArquivado.ano * 100 + ResumoArquivado.mes
+            arquivados = arquivados.where(
+                ResumoArquivado.casa_id.in_(casas),
+                periodo >= inicio.year * 100 + inicio.month,
+                periodo <= fim.year * 100 + fim.month,
+            )
+        for arquivado in connection.execute(arquivados).mappings():
+            valores = linha(arquivado['ano'], arquivado['mes'], arquivado['casa_id'])
+            for campo in ('receita_total', 'receita_aluguel', 'quantidade_recibos', 'aluguel_contratado'):
+                valores[campo] += arquivado[campo]
+            valores['ocupada'] = max(valores['ocupada'], arquivado['ocupada'])
+
+    return [
+        valores for valores in linhas.values()
+        if valores['quantidade_recibos'] or valores['energia_valor']
+        or valores['energia_kwh'] or valores['ocupada']
+    ]
+
+
+def _travar(connection, casas):
+    """
+    Trava (SELECT ... FOR UPDATE) as casas que serão recalculadas até o fim
+    da transação. Outra estação que grave nelas espera o nosso commit e, no
+    READ COMMITTED do PostgreSQL, recalcula já vendo os nossos lançamentos.
+    No SQLite as gravações já são serializadas pela conexão de escrita.
+    """
+    if connection.dialect.name == 'sqlite':
+        return
+    com_casa = sorted(c for c in casas if c)
+    if com_casa:
+        # Sempre na ordem dos ids, para duas estações não se travarem em ciclo
+        connection.execute(
+            select(Casa.id).where(Casa.id.in_(com_casa)).order_by(Casa.id).with_for_update()
+        )
+    if 0 in casas:
+        connection.execute(
+            select(Sequencia.chave).where(Sequencia.chave == CHAVE_TRAVA).with_for_update()
+        )
+
+
+def recalcular(connection, chaves):
+    """
+    Recalcula as linhas do resumo para os (ano, mes, casa_id) informados.
+
+    As casas são tratadas em lotes: para cada lote, o intervalo que cobre
+    todos os meses pedidos é apagado e recalculado de uma vez.
+    """
+    if not chaves:
+        return
+    casas = sorted({casa_id for _, _, casa_id in chaves})
+    for i in range(0, len(casas), LOTE_CASAS):
+        lote = set(casas[i:i + LOTE_CASAS])
+        _travar(connection, lote)
+        periodos = [ano * 100 + mes for ano, mes, casa_id in chaves if casa_id in lote]
+        primeiro, ultimo = min(periodos), max(periodos)
+        inicio = date(primeiro // 100, primeiro % 100, 1)
+        fim = _fim_do_mes(ultimo // 100, ultimo % 100)
+
+        periodo = ResumoMensal.ano * 100 + ResumoMensal.mes
+        connection.execute(delete(ResumoMensal).where(
+            ResumoMensal.casa_id.in_(lote), periodo >= primeiro, periodo <= ultimo
+        ))
+        linhas = _calcular(connection, lote, inicio, fim)
+        if linhas:
+            connection.execute(insert(ResumoMensal), linhas)
+
+
+def reconstruir(connection):
+    """Apaga e recalcula todo o resumo a partir de recibos, consumos e contratos"""
+    connection.execute(delete(ResumoMensal))
+    linhas = _calcular(connection)
+    if linhas:
+        connection.execute(insert(ResumoMensal), linhas)
+    return len(linhas)
+
+
+def reconstruir_arquivado(connection, origem=None, esquema='arquivo'):
+    """
+    Regrava resumo_arquivado a partir dos contratos e recibos do arquivo.
+
+    O arquivo é lido em ``origem`` (padrão: a própria ``connection``, com o
+    arquivo anexado como ``esquema``). O resumo mensal não muda: as linhas
+    só trocaram de tabela. Retorna a quantidade de linhas gravadas.
+    """
+    linhas = _calcular(origem or connection, esquema=esquema)
+    connection.execute(delete(ResumoArquivado))
+    if linhas:
+        connection.execute(insert(ResumoArquivado), linhas)
+    return len(linhas)
+
+
+@event.listens_for(Session, 'after_flush')
+def _atualizar_resumo(session, flush_context):
+    chaves = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        chaves |= chaves_do_objeto(obj)
+    if chaves:
+        recalcular(session.connection(), chaves)
+        registrar_escrita(session, [TABELA])
+
+
+def recalcular_na_sessao(session, chaves):
+    """Recalcula meses/casas afetados por SQL em lote executado na sessão"""
+    if chaves:
+        recalcular(session.connection(), chaves)
+        registrar_escrita(session, [TABELA])
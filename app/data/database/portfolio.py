@@ -0,0 +1,163 @@
+"""
+Carteiras de imóveis em bancos separados.
+
+Cada carteira (proprietário) tem o próprio arquivo SQLite: a carteira
+"Principal" usa o banco original (casas_consumo.db) e as demais ficam em
+``carteiras/<nome>.db``, ao lado dele. Assim cada banco e seus índices
+continuam pequenos e cada carteira pode ter backup e arquivo próprios.
+
+``CarteiraRouter`` abre o banco da carteira escolhida (os já abertos ficam em
+cache para a troca ser imediata) e gera relatórios consolidados lendo cada
+arquivo em modo somente leitura, sem migrações nem gravações.
+
+Com ``DATABASE_URL`` apontando para um servidor (ou banco em memória) só
+existe a carteira principal, que usa esse banco.
+"""
+import re
+import sqlite3
+from collections import namedtuple
+from datetime import date
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+from app.data.database.base import DatabaseConfig
+
+PRINCIPAL = 'Principal'
+PASTA = 'carteiras'
+_ARQUIVO_ATIVA = 'carteira_ativa.txt'
+_SUFIXO_ARQUIVO_HISTORICO = '_arquivo'
+
+Carteira = namedtuple('Carteira', ['nome', 'caminho'])
+
+
+def normalizar_nome(nome):
+    """Nome de arquivo seguro para a carteira (letras, números, '-' e '_')"""
+    return re.sub(r'[^\w-]+', '_', (nome or '').strip()).strip('_')
+
+
+class CarteiraRouter:
+    """Localiza, cria e abre os bancos de cada carteira"""
+
+    def __init__(self, caminho_principal, database_url=None):
+        """``database_url``: banco da carteira principal quando não é um arquivo local"""
+        self.caminho_principal = Path(caminho_principal)
+        self.pasta = self.caminho_principal.parent / PASTA
+        self.database_url = database_url
+        self._configs = {}
+        self.ativa = self._ler_ativa()
+
+    @property
+    def multiplas(self):
+        """Indica se é possível ter várias carteiras (só com arquivos SQLite locais)"""
+        return self.database_url is None
+
+    def _ler_ativa(self):
+        if not self.multiplas:
+            return PRINCIPAL
+        arquivo = self.caminho_principal.parent / _ARQUIVO_ATIVA
+        if arquivo.exists():
+            nome = arquivo.read_text(encoding='utf-8').strip()
+            if nome == PRINCIPAL or self.caminho(nome).exists():
+                return nome
+        return PRINCIPAL
+
+    def _salvar_ativa(self):
+        (self.caminho_principal.parent / _ARQUIVO_ATIVA).write_text(self.ativa, encoding='utf-8')
+
+    def caminho(self, nome):
+        """Arquivo de banco da carteira"""
+        if nome == PRINCIPAL:
+            return self.caminho_principal
+        return self.pasta / f"{normalizar_nome(nome)}.db"
+
+    def listar(self):
+        """Carteiras existentes, com a principal primeiro"""
+        carteiras = [Carteira(PRINCIPAL, self.caminho_principal)]
+        if self.multiplas and self.pasta.exists():
+            for arquivo in sorted(self.pasta.glob('*.db')):
+                if not arquivo.stem.endswith(_SUFIXO_ARQUIVO_HISTORICO):
+                    carteiras.append(Carteira(arquivo.stem, arquivo))
+        return carteiras
+
+    def criar(self, nome):
+        """Cria o banco de uma nova carteira (já com o schema atual)"""
+        if not self.multiplas:
+            raise ValueError("Carteiras separadas só estão disponíveis com o banco SQLite local")
+        nome = normalizar_nome(nome)
+        if not nome or nome.lower() == PRINCIPAL.lower() or nome.endswith(_SUFIXO_ARQUIVO_HISTORICO):
+            raise ValueError("Nome de carteira inválido")
+        if self.caminho(nome).exists():
+            raise ValueError(f"A carteira '{nome}' já existe")
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        self.abrir(nome)
+        return Carteira(nome, self.caminho(nome))
+
+    def abrir(self, nome):
+        """DatabaseConfig inicializado da carteira (reaproveitado entre trocas)"""
+        config = self._configs.get(nome)
+        if config is None:
+            if nome == PRINCIPAL and not self.multiplas:
+                config = DatabaseConfig(self.database_url)
+            else:
+                config = DatabaseConfig(f"sqlite:///{self.caminho(nome)}")
+            config.initialize()
+            self._configs[nome] = config
+        return config
+
+    def ativar(self, nome):
+        """Torna a carteira ativa (lembrada na próxima execução) e retorna o banco dela"""
+        if nome != PRINCIPAL and not self.caminho(nome).exists():
+            raise ValueError(f"Carteira '{nome}' não encontrada")
+        config = self.abrir(nome)
+        self.ativa = nome
+        if self.multiplas:
+            self._salvar_ativa()
+        return config
+
+    def pasta_backup(self, nome, pasta_base):
+        """Pasta de backups da carteira: as carteiras extras ficam em subpastas"""
+        return Path(pasta_base) if nome == PRINCIPAL else Path(pasta_base) / normalizar_nome(nome)
+
+    def relatorio_consolidado(self, ano=None, mes=None):
+        """
+        Totais do mês de cada carteira, lidos do resumo mensal em modo somente
+        leitura. Carteiras que não puderem ser lidas vêm com a chave 'erro'.
+        """
+        from app.data.repositories.house_repository import CasaRepository
+        from app.data.repositories.monthly_summary_repository import ResumoMensalRepository
+
+        hoje = date.today()
+        ano, mes = ano or hoje.year, mes or hoje.month
+        linhas = []
+        for carteira in self.listar():
+            linha = {'carteira': carteira.nome}
+            # Sem arquivos locais, o banco da principal já está aberto
+            engine = _engine_somente_leitura(carteira.caminho) if self.multiplas else self.abrir(PRINCIPAL).reader_engine
+            try:
+                with Session(bind=engine) as session:
+                    linha.update(ResumoMensalRepository(session).get_totais_mes(ano, mes))
+                    linha['total_casas'] = CasaRepository(session).count()
+            except Exception as e:
+                linha['erro'] = str(e)
+            finally:
+                if self.multiplas:
+                    engine.dispose()
+            linhas.append(linha)
+        return linhas
+
+    def fechar(self):
+        """Fecha as conexões de todas as carteiras abertas"""
+        for config in self._configs.values():
+            config.close()
+        self._configs.clear()
+
+
+def _engine_somente_leitura(caminho):
+    """Engine que abre o arquivo com mode=ro (falha se não existir, nunca grava)"""
+    uri = f"{Path(caminho).resolve().as_uri()}?mode=ro"
+    return create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False),
+        poolclass=NullPool,
+    )
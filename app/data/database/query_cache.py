@@ -0,0 +1,190 @@
+"""
+Cache de resultados das consultas (contagens, ids, totais e relatórios).
+
+Cada tabela tem um contador de versão incrementado em toda escrita (flush
+do ORM, UPDATE/DELETE/INSERT em lote, commit e rollback). Uma entrada do
+cache guarda as versões das tabelas que a consulta lê; se alguma mudou, a
+entrada é descartada e a consulta volta ao banco. O cache é limitado por
+LRU e compartilhado pelas sessões que recebem o mesmo QueryCache em
+``info['query_cache']`` (o SessionManager passa o seu a todas as sessões
+curtas); sem ele, cada sessão tem o próprio.
+
+Só são guardados resultados que não dependem de uma sessão: contagens,
+ids, linhas e dicionários (copiados a cada uso). Listas de entidades vão
+sempre ao banco: os objetos pertencem à sessão que consulta (carregam
+relacionamentos sob demanda, entram no flush) e copiá-los para outra sessão
+custa tanto quanto carregá-los de novo. Também não são guardados resultados
+lidos por uma sessão com escritas pendentes, ou cuja transação começou antes
+da última escrita nas tabelas lidas: outras sessões veriam dados não
+confirmados ou antigos.
+
+Os contadores só enxergam as escritas deste processo: num banco em servidor,
+em que outras estações também gravam, as sessões são criadas com
+``info={'sem_cache': True}`` (ver SessionManager) e toda consulta vai ao banco.
+"""
+import os
+import threading
+from collections import OrderedDict
+from sqlalchemy import event, inspect, Table
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+TAMANHO_PADRAO = 256
+
+_versoes = {}
+_lock = threading.Lock()
+
+
+def versao(tabela):
+    return _versoes.get(tabela, 0)
+
+
+def invalidar(tabelas):
+    """Incrementa a versão das tabelas informadas"""
+    with _lock:
+        for tabela in tabelas:
+            _versoes[tabela] = _versoes.get(tabela, 0) + 1
+
+
+class QueryCache:
+    """Cache LRU de resultados, validado pelas versões das tabelas (seguro entre threads)"""
+
+    def __init__(self, tamanho=None):
+        if tamanho is None:
+            tamanho = int(os.getenv('DB_CACHE_CONSULTAS', TAMANHO_PADRAO))
+        self.tamanho = tamanho
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave, versoes):
+        """Retorna (True, valor) se há entrada para essas versões, senão (False, None)"""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada[0] == versoes:
+                self._entradas.move_to_end(chave)
+                self.acertos += 1
+                return True, entrada[1]
+            self.falhas += 1
+            return False, None
+
+    def guardar(self, chave, versoes, valor):
+        if self.tamanho <= 0:
+            return
+        with self._lock:
+            self._entradas[chave] = (versoes, valor)
+            self._entradas.move_to_end(chave)
+            while len(self._entradas) > self.tamanho:
+                self._entradas.popitem(last=False)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+def get_cache(session):
+    """Cache compartilhado em session.info, ou um da própria sessão (criado no primeiro uso)"""
+    cache = session.info.get('query_cache')
+    if cache is None:
+        cache = QueryCache()
+        session.info['query_cache'] = cache
+    return cache
+
+
+def _retorna_entidades(query):
+    """Indica se a consulta traz objetos do ORM (que pertencem à sessão)"""
+    return any(
+        isinstance(d['type'], type) and inspect(d['type'], raiseerr=False) is not None
+        for d in query.column_descriptions
+    )
+
+
+def _copiar(valor):
+    """Cópia de listas e dicionários, para quem chama poder alterá-los sem afetar o cache"""
+    if isinstance(valor, list):
+        return [dict(v) if isinstance(v, dict) else v for v in valor]
+    return dict(valor) if isinstance(valor, dict) else valor
+
+
+def consultar(session, query, executar, tabelas=()):
+    """
+    Executa ``executar(query)`` passando pelo cache (ver get_cache).
+
+    A chave é o SQL compilado mais os parâmetros; as tabelas lidas são
+    extraídas do próprio statement (inclusive subconsultas) e somadas a
+    ``tabelas`` para dependências que o statement não mostra (ex.: FTS).
+    """
+    # Alterações ainda não enviadas ao banco mudariam o resultado (autoflush)
+    if session.info.get('sem_cache') or session.new or session.dirty or session.deleted:
+        return executar(query)
+    if _retorna_entidades(query):
+        return executar(query)
+
+    stmt = query.statement
+    compilado = stmt.compile(dialect=session.get_bind().dialect)
+    chave = (str(compilado), repr(sorted(compilado.params.items())))
+    lidas = tuple(sorted(
+        {t.name for t in find_tables(stmt, check_columns=True) if isinstance(t, Table)} | set(tabelas)
+    ))
+
+    cache = get_cache(session)
+    versoes = tuple(versao(t) for t in lidas)
+    encontrado, valor = cache.obter(chave, versoes)
+    if encontrado:
+        return _copiar(valor)
+
+    valor = executar(query)
+    # Só guarda o que qualquer sessão leria agora: nada gravado por esta sessão
+    # e nenhuma escrita nessas tabelas desde o início da sua transação
+    inicio = session.info.get('versoes_inicio', {})
+    if not session.info.get('tabelas_alteradas') and all(
+        inicio.get(t, 0) == v for t, v in zip(lidas, versoes)
+    ):
+        cache.guardar(chave, versoes, _copiar(valor))
+    return valor
+
+
+def _tabelas_alteradas(session):
+    return session.info.setdefault('tabelas_alteradas', set())
+
+
+def registrar_escrita(session, tabelas):
+    """Invalida tabelas alteradas por SQL executado fora do ORM (ex.: na conexão)"""
+    _tabelas_alteradas(session).update(tabelas)
+    invalidar(tabelas)
+
+
+@event.listens_for(Session, 'after_begin')
+def _registrar_inicio(session, transaction, connection):
+    with _lock:
+        session.info['versoes_inicio'] = dict(_versoes)
+
+
+@event.listens_for(Session, 'after_flush')
+def _registrar_flush(session, flush_context):
+    tabelas = _tabelas_alteradas(session)
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        tabelas.update(t.name for t in inspect(obj).mapper.tables)
+    invalidar(tabelas)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _registrar_escrita_em_lote(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        registrar_escrita(orm_execute_state.session, [orm_execute_state.statement.table.name])
+
+
+@event.listens_for(Session, 'after_commit')
+def _registrar_commit(session):
+    # Nova versão após o commit: leituras feitas por outras sessões entre o
+    # flush e o commit ainda viam os dados antigos
+    invalidar(session.info.pop('tabelas_alteradas', ()))
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _registrar_rollback(session, previous_transaction):
+    invalidar(session.info.pop('tabelas_alteradas', ()))
@@ -0,0 +1,65 @@
+"""
+Ciclo de vida das sessões do banco.
+
+Não há sessão compartilhada entre as telas: cada operação abre uma sessão
+curta e a fecha em seguida, então nenhuma conexão fica presa entre um
+evento e outro e toda leitura vê o que já foi gravado (inclusive por outras
+threads ou, num banco em servidor, por outros computadores).
+
+- ``leitura()``: consultas das telas e das threads de trabalho, no pool de
+  leitura (conexões somente leitura, em paralelo com a escrita);
+- ``scope()``: gravações, na conexão de escrita. O bloco é uma unidade de
+  trabalho: os repositórios só fazem flush e o commit é único na saída.
+
+Os objetos das duas continuam legíveis depois do bloco
+(expire_on_commit=False), mas relacionamentos ainda não carregados não:
+desenhe a tela com a sessão aberta ou use joinedload na consulta. Para
+alterar um objeto carregado em outra sessão, passe-o a ``update`` do
+repositório, que copia as colunas para o registro da sessão de escrita.
+
+As sessões das duas compartilham o cache de consultas do SessionManager
+(``cache``), então um resultado lido por uma tela é aproveitado pelas
+próximas sessões até alguma escrita nas tabelas lidas. Com
+``cache_consultas=False`` (banco em servidor, gravado também por outras
+estações) as sessões não usam o cache de consultas.
+"""
+from contextlib import contextmanager
+from sqlalchemy.orm import sessionmaker
+from app.data.database.query_cache import QueryCache
+from app.data.database.unit_of_work import unit_of_work
+
+
+class SessionManager:
+    """Fornece sessões curtas por operação, de leitura e de escrita"""
+
+    def __init__(self, engine, reader_engine=None, cache_consultas=True):
+        self.cache = QueryCache() if cache_consultas else None
+        info = {'query_cache': self.cache} if cache_consultas else {'sem_cache': True}
+        self._scope_factory = sessionmaker(bind=engine, expire_on_commit=False, info=info)
+        self._leitura_factory = sessionmaker(bind=reader_engine or engine, expire_on_commit=False, info=info)
+
+    @contextmanager
+    def scope(self):
+        """
+        Sessão de vida curta para gravação: commit ao sair do bloco, rollback
+        em caso de erro. Pode ser usada em qualquer thread.
+        """
+        session = self._scope_factory()
+        try:
+            with unit_of_work(session):
+                yield session
+        finally:
+            session.close()
+
+    @contextmanager
+    def leitura(self):
+        """
+        Sessão somente leitura, usada pelas telas e pelas threads de trabalho.
+
+        Usa o pool de leitura, então não disputa a conexão de escrita.
+        """
+        session = self._leitura_factory()
+        try:
+            yield session
+        finally:
+            session.close()
@@ -0,0 +1,318 @@
+"""
+Instrumentação do SQL executado pelo aplicativo (opcional).
+
+Ativada com SQL_INSTRUMENTACAO=1 no .env. Cada comando enviado ao banco é
+registrado pelos eventos before/after_cursor_execute dos engines, com a
+duração, as linhas lidas ou alteradas e a tela que o originou (o primeiro
+método de ``app.presentation`` na pilha, ex.: ``HouseListWidget.add_item``).
+
+Uma ação da interface é tudo o que roda a partir de um mesmo callback do
+Tkinter (clique, ``after``...). Se o mesmo comando (mesmo SQL, parâmetros
+diferentes) se repete SQL_N1_REPETICOES vezes (padrão 5) dentro de uma ação,
+é um provável N+1: tipicamente um relacionamento lazy carregado item a item
+em uma listagem. Comandos acima de SQL_LENTA_MS (padrão 100 ms) são lentos.
+Os dois casos são avisados no console na hora, e ao fechar o programa um
+relatório da sessão é salvo em ``RelatoriosSQL``.
+
+No SQLite as linhas de um SELECT só são conhecidas depois de lidas: com a
+instrumentação ativa as conexões usam um cursor que conta as linhas buscadas.
+"""
+import atexit
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import event
+
+LENTA_MS_PADRAO = 100
+REPETICOES_N1_PADRAO = 5
+
+# Quantidade máxima de consultas lentas guardadas para o relatório
+MAXIMO_LENTAS = 200
+
+_MODULOS_TELA = 'app.presentation'
+_MODULOS_APP = ('app.', '__main__', 'main')
+
+# Listas de parâmetros de tamanho variável (IN (?, ?, ?)) contam como o mesmo comando
+_LISTA_PARAMETROS = re.compile(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)")
+
+_coletor = None
+
+
+def _forma(sql):
+    """SQL normalizado para agrupar execuções do mesmo comando"""
+    return _LISTA_PARAMETROS.sub('(...)', ' '.join(sql.split()))
+
+
+def _nome(frame):
+    codigo = frame.f_code
+    return getattr(codigo, 'co_qualname', codigo.co_name)
+
+
+def _origem():
+    """
+    Retorna (tela, raiz): o método de tela mais interno na pilha e o frame
+    que iniciou a ação (o primeiro código do aplicativo chamado pelo Tkinter,
+    ou o mais externo se não houver callback do Tkinter na pilha).
+    """
+    frame = sys._getframe(1)
+    tela = raiz = None
+    while frame is not None:
+        modulo = frame.f_globals.get('__name__', '')
+        if modulo == __name__:
+            pass
+        elif modulo.startswith(_MODULOS_APP):
+            if tela is None and modulo.startswith(_MODULOS_TELA):
+                tela = frame
+            raiz = frame
+        elif modulo == 'tkinter' and raiz is not None:
+            break
+        frame = frame.f_back
+    return (_nome(tela) if tela is not None else None), raiz
+
+
+class _Estatistica:
+    """Totais de um comando (forma do SQL) na sessão"""
+
+    __slots__ = ('sql', 'execucoes', 'total_ms', 'maximo_ms', 'linhas', 'telas')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.execucoes = 0
+        self.total_ms = 0.0
+        self.maximo_ms = 0.0
+        self.linhas = 0
+        self.telas = set()
+
+
+class _Execucao:
+    """Uma execução; ``linhas`` é atualizado pelo cursor enquanto as linhas são lidas"""
+
+    __slots__ = ('estatistica', 'sql', 'tela', 'ms', 'linhas')
+
+    def __init__(self, estatistica, sql, tela, ms, linhas):
+        self.estatistica = estatistica
+        self.sql = sql
+        self.tela = tela
+        self.ms = ms
+        self.linhas = linhas
+
+    def contar(self, quantidade):
+        self.linhas += quantidade
+        self.estatistica.linhas += quantidade
+
+
+class _CursorContador(sqlite3.Cursor):
+    """Cursor do sqlite3 que conta as linhas buscadas para a execução registrada"""
+
+    execucao = None
+
+    def _contar(self, quantidade):
+        if self.execucao is not None and quantidade:
+            self.execucao.contar(quantidade)
+
+    def fetchone(self):
+        linha = super().fetchone()
+        self._contar(linha is not None)
+        return linha
+
+    def fetchmany(self, size=None):
+        linhas = super().fetchmany(self.arraysize if size is None else size)
+        self._contar(len(linhas))
+        return linhas
+
+    def fetchall(self):
+        linhas = super().fetchall()
+        self._contar(len(linhas))
+        return linhas
+
+
+class _ConexaoContadora(sqlite3.Connection):
+    def cursor(self, factory=_CursorContador):
+        return super().cursor(factory)
+
+
+class ColetorSQL:
+    """Recebe as execuções dos engines instrumentados e monta o relatório da sessão"""
+
+    def __init__(self, pasta, lenta_ms=LENTA_MS_PADRAO, repeticoes_n1=REPETICOES_N1_PADRAO):
+        self.pasta = Path(pasta)
+        self.lenta_ms = lenta_ms
+        self.repeticoes_n1 = repeticoes_n1
+        self.inicio = datetime.now()
+        self.estatisticas = {}
+        self.lentas = []
+        self.n1 = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._salvo = False
+
+    def instrumentar(self, engine):
+        """Registra os eventos de execução no engine"""
+        event.listen(engine, 'before_cursor_execute', self._antes)
+        event.listen(engine, 'after_cursor_execute', self._depois)
+
+    def _antes(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_sql_inicio', []).append(time.perf_counter())
+
+    def _depois(self, conn, cursor, statement, parameters, context, executemany):
+        ms = (time.perf_counter() - conn.info['_sql_inicio'].pop()) * 1000
+        forma = _forma(statement)
+        tela, raiz = _origem()
+
+        contar_cursor = isinstance(cursor, _CursorContador) and cursor.rowcount < 0
+        linhas = 0 if contar_cursor else max(cursor.rowcount, 0)
+
+        with self._lock:
+            estatistica = self.estatisticas.get(forma)
+            if estatistica is None:
+                estatistica = self.estatisticas[forma] = _Estatistica(forma)
+            estatistica.execucoes += 1
+            estatistica.total_ms += ms
+            estatistica.maximo_ms = max(estatistica.maximo_ms, ms)
+            estatistica.linhas += linhas
+            if tela:
+                estatistica.telas.add(tela)
+
+        execucao = _Execucao(estatistica, statement, tela, ms, linhas)
+        if contar_cursor:
+            cursor.execucao = execucao
+        if ms >= self.lenta_ms:
+            self._registrar_lenta(execucao)
+        self._contar_na_acao(forma, tela, raiz)
+
+    def _registrar_lenta(self, execucao):
+        with self._lock:
+            if len(self.lentas) < MAXIMO_LENTAS:
+                self.lentas.append(execucao)
+        print(f"🐢 SQL lento ({execucao.ms:.0f} ms) em {execucao.tela or '?'}: {_resumo(execucao.sql)}")
+
+    def _contar_na_acao(self, forma, tela, raiz):
+        local = self._local
+        # Nova ação: outro callback (frame raiz diferente) na mesma thread
+        if getattr(local, 'raiz', None) is not raiz or raiz is None:
+            local.raiz = raiz
+            local.acao = _nome(raiz) if raiz is not None else None
+            local.contagem = {}
+        if tela is None:
+            # Fora das telas (migrações, tarefas) repetições são esperadas
+            return
+        contagem = local.contagem.get(forma, 0) + 1
+        local.contagem[forma] = contagem
+        if contagem < self.repeticoes_n1:
+            return
+        with self._lock:
+            ocorrencia = self.n1.get((tela, forma))
+            if ocorrencia is None:
+                ocorrencia = self.n1[(tela, forma)] = {'acao': local.acao, 'acoes': 0, 'maximo': 0}
+            if contagem == self.repeticoes_n1:
+                ocorrencia['acoes'] += 1
+            ocorrencia['maximo'] = max(ocorrencia['maximo'], contagem)
+            primeira = ocorrencia['acoes'] == 1 and contagem == self.repeticoes_n1
+        if primeira:
+            print(f"🔁 Provável N+1 em {tela} (ação {local.acao}): "
+                  f"{contagem}x o mesmo comando: {_resumo(forma)}")
+
+    def relatorio(self):
+        """Texto do relatório da sessão"""
+        with self._lock:
+            estatisticas = sorted(self.estatisticas.values(), key=lambda e: e.total_ms, reverse=True)
+            lentas = sorted(self.lentas, key=lambda e: e.ms, reverse=True)
+            n1 = sorted(self.n1.items(), key=lambda i: i[1]['maximo'], reverse=True)
+
+        total_ms = sum(e.total_ms for e in estatisticas)
+        total = sum(e.execucoes for e in estatisticas)
+        linhas = [
+            f"Relatório de SQL - sessão iniciada em {self.inicio:%d/%m/%Y %H:%M:%S}",
+            f"{total} comando(s), {len(estatisticas)} distinto(s), {total_ms:.0f} ms no banco",
+            "",
+        ]
+
+        por_tela = {}
+        for e in estatisticas:
+            for tela in e.telas or {'(fora das telas)'}:
+                soma = por_tela.setdefault(tela, [0, 0.0])
+                soma[0] += e.execucoes
+                soma[1] += e.total_ms
+        linhas.append("== Por tela (comandos em que a tela aparece na pilha) ==")
+        for tela, (quantidade, ms) in sorted(por_tela.items(), key=lambda t: t[1][1], reverse=True):
+            linhas.append(f"{ms:10.1f} ms {quantidade:7d}x  {tela}")
+
+        linhas += ["", f"== Prováveis N+1 ({self.repeticoes_n1}+ repetições na mesma ação) =="]
+        if not n1:
+            linhas.append("nenhum")
+        for (tela, forma), ocorrencia in n1:
+            linhas.append(
+                f"- {tela} (ação: {ocorrencia['acao']}): até {ocorrencia['maximo']}x por ação, "
+                f"em {ocorrencia['acoes']} ação(ões)"
+            )
+            linhas.append(f"  {forma}")
+
+        linhas += ["", f"== Comandos lentos (>= {self.lenta_ms} ms) =="]
+        if not lentas:
+            linhas.append("nenhum")
+        for execucao in lentas:
+            linhas.append(f"- {execucao.ms:.1f} ms, {execucao.linhas} linha(s), {execucao.tela or '?'}")
+            linhas.append(f"  {_forma(execucao.sql)}")
+
+        linhas += ["", "== Comandos por tempo total =="]
+        for e in estatisticas:
+            linhas.append(
+                f"{e.total_ms:10.1f} ms {e.execucoes:7d}x  máx {e.maximo_ms:.1f} ms  "
+                f"{e.linhas} linha(s)  [{', '.join(sorted(e.telas)) or '-'}]"
+            )
+            linhas.append(f"    {e.sql}")
+        return '\n'.join(linhas) + '\n'
+
+    def salvar_relatorio(self):
+        """Grava o relatório em ``pasta`` (uma vez por sessão); retorna o caminho"""
+        if self._salvo or not self.estatisticas:
+            return None
+        self._salvo = True
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        caminho = self.pasta / f"sql_{self.inicio:%Y%m%d_%H%M%S}.txt"
+        caminho.write_text(self.relatorio(), encoding='utf-8')
+        print(f"📝 Relatório de SQL salvo em: {caminho}")
+        return caminho
+
+
+def _resumo(sql, tamanho=120):
+    sql = ' '.join(sql.split())
+    return sql if len(sql) <= tamanho else sql[:tamanho - 3] + '...'
+
+
+def ativar_se_configurado(pasta):
+    """
+    Ativa a instrumentação se SQL_INSTRUMENTACAO=1; o relatório vai para
+    ``pasta`` ao encerrar o programa. Deve ser chamado antes de criar os engines.
+    """
+    global _coletor
+    if _coletor is None and os.getenv('SQL_INSTRUMENTACAO', '').strip().lower() in ('1', 'true', 'sim'):
+        _coletor = ColetorSQL(
+            pasta,
+            lenta_ms=float(os.getenv('SQL_LENTA_MS', LENTA_MS_PADRAO)),
+            repeticoes_n1=int(os.getenv('SQL_N1_REPETICOES', REPETICOES_N1_PADRAO)),
+        )
+        atexit.register(_coletor.salvar_relatorio)
+        print("🔬 Instrumentação de SQL ativa")
+    return _coletor
+
+
+def coletor():
+    """Coletor ativo (None se a instrumentação estiver desligada)"""
+    return _coletor
+
+
+def instrumentar(engine):
+    """Instrumenta o engine se a instrumentação estiver ativa"""
+    if _coletor is not None:
+        _coletor.instrumentar(engine)
+
+
+def connect_args_sqlite():
+    """Argumentos extras de sqlite3.connect: o cursor que conta linhas, se ativo"""
+    return {'factory': _ConexaoContadora} if _coletor is not None else {}
@@ -0,0 +1,121 @@
+"""
+Perfil de conexão do SQLite.
+
+Os PRAGMAs são aplicados em cada conexão aberta pelo engine (evento
+``connect``), então valem tanto para a sessão da interface quanto para
+qualquer outra conexão do pool.
+"""
+import os
+from sqlalchemy import event
+
+# Valores de cache em KiB e mmap em MiB para facilitar a edição no .env
+PERFIS = {
+    'desempenho': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size_kb': 16384,
+        'mmap_size_mb': 64,
+        'temp_store': 'MEMORY',
+        'busy_timeout_ms': 5000,
+    },
+    'seguro': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size_kb': 8192,
+        'mmap_size_mb': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout_ms': 5000,
+    },
+    'padrao': {
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+        'cache_size_kb': 2000,
+        'mmap_size_mb': 0,
+        'temp_store': 'DEFAULT',
+        'busy_timeout_ms': 5000,
+    },
+}
+
+PERFIL_PADRAO = 'desempenho'
+
+_OPCOES = {
+    'journal_mode': ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'),
+    'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+    'temp_store': ('DEFAULT', 'FILE', 'MEMORY'),
+}
+
+# Variável do .env -> chave do perfil
+_VARIAVEIS = {
+    'DB_JOURNAL_MODE': 'journal_mode',
+    'DB_SYNCHRONOUS': 'synchronous',
+    'DB_CACHE_SIZE_KB': 'cache_size_kb',
+    'DB_MMAP_SIZE_MB': 'mmap_size_mb',
+    'DB_TEMP_STORE': 'temp_store',
+    'DB_BUSY_TIMEOUT_MS': 'busy_timeout_ms',
+}
+
+
+def carregar_perfil(nome=None):
+    """
+    Monta o perfil a partir do .env.
+
+    DB_PERFIL escolhe a base ('desempenho', 'seguro' ou 'padrao') e as
+    variáveis DB_* individuais sobrescrevem valores específicos.
+    """
+    nome = (nome or os.getenv('DB_PERFIL') or PERFIL_PADRAO).strip().lower()
+    if nome not in PERFIS:
+        raise ValueError(f"Perfil de banco desconhecido: '{nome}'. Use: {', '.join(PERFIS)}")
+
+    perfil = dict(PERFIS[nome])
+    for variavel, chave in _VARIAVEIS.items():
+        valor = os.getenv(variavel)
+        if valor is None or valor.strip() == '':
+            continue
+        valor = valor.strip().upper()
+        if chave in _OPCOES:
+            if valor not in _OPCOES[chave]:
+                raise ValueError(f"{variavel}={valor} inválido. Use: {', '.join(_OPCOES[chave])}")
+            perfil[chave] = valor
+        else:
+            try:
+                perfil[chave] = int(valor)
+            except ValueError:
+                raise ValueError(f"{variavel} deve ser um número inteiro (recebido: {valor})")
+    return perfil
+
+
+def get_pragmas(perfil, somente_leitura=False):
+    """
+    Converte o perfil na lista de comandos PRAGMA.
+
+    Conexões somente leitura não alteram o journal_mode (definido pela
+    conexão de escrita) e recebem query_only para recusar gravações.
+    """
+    pragmas = [] if somente_leitura else [f"PRAGMA journal_mode={perfil['journal_mode']}"]
+    pragmas += [
+        f"PRAGMA synchronous={perfil['synchronous']}",
+        # Valor negativo = tamanho em KiB em vez de número de páginas
+        f"PRAGMA cache_size=-{int(perfil['cache_size_kb'])}",
+        f"PRAGMA mmap_size={int(perfil['mmap_size_mb']) * 1024 * 1024}",
+        f"PRAGMA temp_store={perfil['temp_store']}",
+        f"PRAGMA busy_timeout={int(perfil['busy_timeout_ms'])}",
+    ]
+    if somente_leitura:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def aplicar_perfil(engine, perfil, somente_leitura=False):
+    """Registra o perfil para ser aplicado em cada nova conexão do engine"""
+    pragmas = get_pragmas(perfil, somente_leitura)
+
+    @event.listens_for(engine, "connect")
+    def _configurar_conexao(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    return pragmas
@@ -0,0 +1,33 @@
+"""
+Unidade de trabalho (transação de negócio).
+
+Dentro de ``unit_of_work(session)`` os repositórios apenas fazem flush em vez
+de commit, e o commit único acontece na saída do bloco. Se ocorrer uma
+exceção, tudo o que foi feito no bloco é desfeito. Blocos aninhados
+participam da transação do bloco mais externo.
+"""
+from contextlib import contextmanager
+
+_CHAVE = 'unit_of_work_nivel'
+
+
+def em_unidade_de_trabalho(session):
+    """Indica se a sessão está dentro de um bloco unit_of_work"""
+    return session.info.get(_CHAVE, 0) > 0
+
+
+@contextmanager
+def unit_of_work(session):
+    """Agrupa as operações dos repositórios em um único commit"""
+    nivel = session.info.get(_CHAVE, 0)
+    session.info[_CHAVE] = nivel + 1
+    try:
+        yield session
+        if nivel == 0:
+            session.commit()
+    except Exception:
+        if nivel == 0:
+            session.rollback()
+        raise
+    finally:
+        session.info[_CHAVE] = nivel
@@ -2,4 +2,6 @@ from .consumption import Consumo
 from .house import Casa
 from .Tenant import Inquilino
 from .contract import Contrato
-from .receipt import Recibo
\ No newline at end of file
+from .receipt import Recibo
+from .sequence import Sequencia
+from .monthly_summary import ResumoMensal, ResumoArquivado
\ No newline at end of file
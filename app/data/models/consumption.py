@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, Float, ForeignKey
+from sqlalchemy import Column, Integer, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.data.database.base import Base
 
 
@@ -8,6 +9,10 @@ class Consumo(Base):
     """Modelo de dados para Consumo mensal"""
     
     __tablename__ = 'consumos'
+    __table_args__ = (
+        # Um consumo por casa e período; atende get_by_casa_e_periodo e o histórico ordenado
+        Index('uq_consumos_casa_periodo', 'casa_id', 'ano', 'mes', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     casa_id = Column(Integer, ForeignKey('casas.id'), nullable=False)
@@ -28,9 +33,9 @@ class Consumo(Base):
     def __repr__(self):
         return f"<Consumo(id={self.id}, casa_id={self.casa_id}, mes={self.mes}/{self.ano})>"
     
-    @property
+    @hybrid_property
     def consumo_diferenca(self):
-        """Calcula a diferença de consumo entre o mês atual e anterior"""
+        """Calcula a diferença de consumo entre o mês atual e anterior (também em SQL)"""
         return self.consumo_mes_atual - self.consumo_mes_anterior
     
     def to_dict(self):
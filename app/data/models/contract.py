@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey, Text, Index, case, or_
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from app.data.database.base import Base
-from datetime import datetime
+from datetime import datetime, date
 
 
 class Contrato(Base):
     """Modelo de dados para Contratos de Locação"""
     
     __tablename__ = 'contratos'
+    __table_args__ = (
+        Index('ix_contratos_casa_ativo', 'casa_id', 'ativo', 'data_inicio'),
+        Index('ix_contratos_ativo_periodo', 'ativo', 'data_fim', 'data_inicio'),
+        Index('ix_contratos_inquilino', 'inquilino_id', 'data_inicio'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     casa_id = Column(Integer, ForeignKey('casas.id'), nullable=False)
@@ -31,6 +37,7 @@ class Contrato(Base):
     
     # Status
     ativo = Column(Integer, default=1)  # 1=ativo, 0=encerrado
+    data_encerramento = Column(Date, nullable=True)  # preenchida ao encerrar antes do fim
     
     # Observações
     observacoes = Column(Text, nullable=True)
@@ -42,7 +49,7 @@ class Contrato(Base):
     def __repr__(self):
         return f"<Contrato(id={self.id}, casa_id={self.casa_id}, inquilino_id={self.inquilino_id}, ativo={self.ativo})>"
     
-    @property
+    @hybrid_property
     def status_descricao(self):
         """Retorna descrição do status do contrato"""
         hoje = datetime.now().date()
@@ -55,6 +62,17 @@ class Contrato(Base):
         else:
             return "Vigente"
     
+    @status_descricao.expression
+    def status_descricao(cls):
+        """Mesmo status como CASE em SQL (utilizável em WHERE, ORDER BY e GROUP BY)"""
+        hoje = date.today()
+        return case(
+            (or_(cls.ativo.is_(None), cls.ativo == 0), "Encerrado"),
+            (cls.data_fim < hoje, "Vencido"),
+            (cls.data_inicio > hoje, "Futuro"),
+            else_="Vigente"
+        )
+    
     @property
     def valor_total_garantias(self):
         """Retorna o valor total das garantias (caução + seguro fiança)"""
@@ -79,6 +97,7 @@ class Contrato(Base):
             'juros_dia_percentual': self.juros_dia_percentual,
             'multa_rescisao_meses': self.multa_rescisao_meses,
             'ativo': self.ativo,
+            'data_encerramento': self.data_encerramento.isoformat() if self.data_encerramento else None,
             'status_descricao': self.status_descricao,
             'observacoes': self.observacoes
         }
\ No newline at end of file
@@ -12,7 +12,7 @@ class Casa(Base):
     nome = Column(String(100), nullable=False)
     endereco = Column(String(300), nullable=False)
     numero_quartos = Column(Integer, nullable=True)  # NOVO: número de quartos
-    inquilino_id = Column(Integer, ForeignKey('inquilinos.id'), nullable=True)
+    inquilino_id = Column(Integer, ForeignKey('inquilinos.id'), nullable=True, index=True)
     
     # Relacionamentos
     inquilino_atual = relationship("Inquilino", back_populates="casa")
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, Float
+from app.data.database.base import Base
+
+
+class TotaisMensais:
+    """Colunas comuns ao resumo mensal e à parte que vem do arquivo histórico"""
+    
+    ano = Column(Integer, primary_key=True)
+    mes = Column(Integer, primary_key=True)  # 1-12
+    casa_id = Column(Integer, primary_key=True)  # 0 = recibos sem casa vinculada
+    
+    # Recibos pela data de pagamento
+    receita_total = Column(Float, nullable=False, default=0.0)
+    receita_aluguel = Column(Float, nullable=False, default=0.0)
+    quantidade_recibos = Column(Integer, nullable=False, default=0)
+    
+    # Contas de energia do mês
+    energia_kwh = Column(Float, nullable=False, default=0.0)
+    energia_valor = Column(Float, nullable=False, default=0.0)
+    
+    # Contratos que cobrem o mês (pelas datas de início e fim)
+    aluguel_contratado = Column(Float, nullable=False, default=0.0)
+    ocupada = Column(Integer, nullable=False, default=0)  # 1 = casa com contrato no mês
+
+
+class ResumoMensal(TotaisMensais, Base):
+    """Totais pré-calculados por mês e casa, lidos pelo painel e pelos relatórios"""
+    
+    __tablename__ = 'resumo_mensal'
+    
+    def __repr__(self):
+        return f"<ResumoMensal({self.mes:02d}/{self.ano}, casa_id={self.casa_id}, receita={self.receita_total})>"
+
+
+class ResumoArquivado(TotaisMensais, Base):
+    """
+    Totais dos contratos e recibos que estão no arquivo histórico.
+    
+    Regravado ao arquivar e ao restaurar; o cálculo do resumo mensal soma
+    estas linhas às do banco ativo, então os meses arquivados continuam
+    completos mesmo depois de "Recalcular Resumo Mensal".
+    """
+    
+    __tablename__ = 'resumo_arquivado'
+    
+    def __repr__(self):
+        return f"<ResumoArquivado({self.mes:02d}/{self.ano}, casa_id={self.casa_id}, receita={self.receita_total})>"
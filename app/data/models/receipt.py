@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Date, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.data.database.base import Base
 from datetime import datetime
@@ -8,9 +8,19 @@ class Recibo(Base):
     """Modelo de dados para Recibos de Pagamento"""
     
     __tablename__ = 'recibos'
+    __table_args__ = (
+        Index('ix_recibos_data_pagamento', 'data_pagamento'),
+        Index('ix_recibos_tipo_data', 'tipo_recibo', 'data_pagamento'),
+        Index('ix_recibos_casa_data', 'casa_id', 'data_pagamento'),
+        Index('ix_recibos_inquilino_data', 'inquilino_id', 'data_pagamento'),
+        Index('ix_recibos_referencia', 'ano_referencia', 'mes_referencia'),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     
+    # Número impresso no PDF (reservado em ReciboRepository.reservar_numero)
+    numero = Column(String(20), nullable=True)
+    
     # Tipo de recibo
     tipo_recibo = Column(String(50), nullable=False)  # 'aluguel', 'energia', 'servico', 'outros'
     
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String
+from app.data.database.base import Base
+
+
+class Sequencia(Base):
+    """Contador persistente usado para numerar documentos (ex.: recibos)"""
+    
+    __tablename__ = 'sequencias'
+    
+    chave = Column(String(50), primary_key=True)  # 'recibo' ou 'recibo:2025'
+    ultimo_valor = Column(Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f"<Sequencia(chave='{self.chave}', ultimo_valor={self.ultimo_valor})>"
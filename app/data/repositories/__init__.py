@@ -3,4 +3,9 @@ from .house_repository import CasaRepository
 from .tenant_repository import InquilinoRepository
 from .consumption_repository import ConsumoRepository
 from .contract_repository import ContratoRepository
-from .receipt_repository import ReciboRepository
\ No newline at end of file
+from .receipt_repository import ReciboRepository
+from .monthly_summary_repository import ResumoMensalRepository
+from .async_repository import (
+    AsyncBaseRepository, AsyncCasaRepository, AsyncInquilinoRepository, AsyncConsumoRepository,
+    AsyncContratoRepository, AsyncReciboRepository, AsyncResumoMensalRepository
+)
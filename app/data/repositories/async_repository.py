@@ -0,0 +1,110 @@
+"""
+Versões assíncronas dos repositórios.
+
+Cada método executa o método do repositório síncrono correspondente em
+``AsyncSession.run_sync``, então cache de consultas e busca FTS continuam
+valendo sem duplicar as consultas. Métodos específicos (ex.: ``buscar``,
+``get_pagina``) são encaminhados da mesma forma.
+
+São só de leitura: o engine assíncrono é somente leitura (ver
+async_engine) e gravações usam os repositórios síncronos em
+SessionManager.scope(), na conexão de escrita única.
+
+Os objetos retornados pertencem à AsyncSession: relacionamentos ainda não
+carregados não podem ser lidos fora dela (carregamento lazy não funciona com
+asyncio), então prefira métodos que retornam dicionários ou use joinedload.
+"""
+from typing import Generic, TypeVar, Type, List, Optional, Tuple
+from app.data.repositories.base_repository import BaseRepository
+from app.data.repositories.house_repository import CasaRepository
+from app.data.repositories.tenant_repository import InquilinoRepository
+from app.data.repositories.consumption_repository import ConsumoRepository
+from app.data.repositories.contract_repository import ContratoRepository
+from app.data.repositories.receipt_repository import ReciboRepository
+from app.data.repositories.monthly_summary_repository import ResumoMensalRepository
+
+T = TypeVar('T')
+
+# Métodos dos repositórios síncronos que gravam (não encaminhados)
+ESCRITAS = frozenset({
+    'create', 'create_many', 'update', 'update_many', 'upsert_many', 'delete',
+    'encerrar_contrato', 'reativar_contrato', 'reservar_numero', 'reconstruir',
+})
+
+
+class AsyncBaseRepository(Generic[T]):
+    """Repositório assíncrono que delega ao repositório síncrono da sessão"""
+
+    # Classe do repositório síncrono (definida pelas subclasses)
+    repository_class: Type[BaseRepository] = None
+
+    def __init__(self, session):
+        self.session = session
+
+    def _repositorio(self, sync_session) -> BaseRepository:
+        return self.repository_class(sync_session)
+
+    async def _executar(self, metodo: str, *args, **kwargs):
+        """Chama ``metodo`` do repositório síncrono dentro de run_sync"""
+        def chamar(sync_session):
+            return getattr(self._repositorio(sync_session), metodo)(*args, **kwargs)
+        return await self.session.run_sync(chamar)
+
+    def __getattr__(self, nome):
+        # Encaminha os métodos públicos específicos de cada repositório
+        if nome.startswith('_') or not callable(getattr(self.repository_class, nome, None)):
+            raise AttributeError(f"{type(self).__name__} não possui '{nome}'")
+        if nome in ESCRITAS:
+            raise AttributeError(
+                f"{type(self).__name__} é somente leitura: use {self.repository_class.__name__} "
+                f"em SessionManager.scope() para '{nome}'"
+            )
+
+        async def metodo(*args, **kwargs):
+            return await self._executar(nome, *args, **kwargs)
+        metodo.__name__ = nome
+        return metodo
+
+    async def get_by_id(self, entity_id: int) -> Optional[T]:
+        return await self._executar('get_by_id', entity_id)
+
+    async def get_all(self) -> List[T]:
+        return await self._executar('get_all')
+
+    async def get_page(self, limit: int = 50, after: Optional[tuple] = None, order_by=None,
+                       descending: bool = False, filters: Optional[list] = None,
+                       options: Optional[list] = None) -> Tuple[List[T], Optional[tuple]]:
+        return await self._executar('get_page', limit, after, order_by, descending, filters, options)
+
+    async def count(self, filters: Optional[list] = None) -> int:
+        return await self._executar('count', filters)
+
+    async def search_ids(self, termo: str, coluna: str = None, limit: int = None) -> List[int]:
+        return await self._executar('search_ids', termo, coluna, limit)
+
+    async def search(self, termo: str, coluna: str = None, limit: int = None) -> List[T]:
+        return await self._executar('search', termo, coluna, limit)
+
+
+class AsyncCasaRepository(AsyncBaseRepository):
+    repository_class = CasaRepository
+
+
+class AsyncInquilinoRepository(AsyncBaseRepository):
+    repository_class = InquilinoRepository
+
+
+class AsyncConsumoRepository(AsyncBaseRepository):
+    repository_class = ConsumoRepository
+
+
+class AsyncContratoRepository(AsyncBaseRepository):
+    repository_class = ContratoRepository
+
+
+class AsyncReciboRepository(AsyncBaseRepository):
+    repository_class = ReciboRepository
+
+
+class AsyncResumoMensalRepository(AsyncBaseRepository):
+    repository_class = ResumoMensalRepository
@@ -1,4 +1,9 @@
-from typing import Generic, TypeVar, Type, List, Optional
+from typing import Generic, TypeVar, Type, List, Optional, Tuple, Dict
+from sqlalchemy import func, or_, and_, insert, update, tuple_, inspect
+from app.data.database.unit_of_work import em_unidade_de_trabalho
+from app.data.database.fts import fts_disponivel, montar_consulta, select_ids
+from app.data.database.query_cache import consultar
+from app.data.database.monthly_summary import chaves_de_linhas, chaves_por_ids, recalcular_na_sessao
 
 T = TypeVar('T')
 
@@ -6,37 +11,266 @@ T = TypeVar('T')
 class BaseRepository(Generic[T]):
     """Repositório base com operações CRUD genéricas"""
     
+    # Colunas que identificam um registro fora do id (usadas por upsert_many)
+    natural_key: Tuple[str, ...] = ()
+    
+    # Tabela FTS5 da entidade (ver app/data/database/fts.py); None = sem busca textual
+    fts_table: Optional[str] = None
+    
     def __init__(self, session, model: Type[T]):
         self.session = session
         self.model = model
     
+    def _commit(self):
+        """Confirma a transação, ou só envia as alterações se houver uma unidade de trabalho aberta"""
+        if em_unidade_de_trabalho(self.session):
+            self.session.flush()
+        else:
+            self.session.commit()
+    
+    def _refresh(self, entity: T):
+        """Recarrega a entidade; dentro da unidade de trabalho o flush já preencheu os ids"""
+        if not em_unidade_de_trabalho(self.session):
+            self.session.refresh(entity)
+    
     def create(self, entity: T) -> T:
         """Cria uma nova entidade"""
         self.session.add(entity)
-        self.session.commit()
-        self.session.refresh(entity)
+        self._commit()
+        self._refresh(entity)
         return entity
     
+    def create_many(self, entities: List[T]) -> List[T]:
+        """Cria várias entidades em uma única transação (INSERTs em lote)"""
+        if not entities:
+            return entities
+        self.session.add_all(entities)
+        self._commit()
+        return entities
+    
     def get_by_id(self, entity_id: int) -> Optional[T]:
-        """Busca entidade por ID"""
-        return self.session.query(self.model).filter(self.model.id == entity_id).first()
+        """Busca entidade por ID (usa o identity map da sessão antes de ir ao banco)"""
+        return self.session.get(self.model, entity_id)
     
     def get_all(self) -> List[T]:
         """Retorna todas as entidades"""
-        return self.session.query(self.model).all()
+        return consultar(self.session, self.session.query(self.model), lambda q: q.all())
+    
+    def get_page(self, limit: int = 50, after: Optional[tuple] = None, order_by=None,
+                 descending: bool = False, filters: Optional[list] = None,
+                 options: Optional[list] = None) -> Tuple[List[T], Optional[tuple]]:
+        """
+        Retorna uma página de entidades usando paginação por chave (keyset).
+        
+        order_by é a coluna de ordenação (padrão: id); o id é sempre usado como
+        desempate. after é o cursor devolvido pela página anterior. Retorna
+        (itens, proximo_cursor), com proximo_cursor None na última página.
+        """
+        coluna = order_by if order_by is not None else self.model.id
+        por_id = coluna is self.model.id
+        
+        query = self.session.query(self.model)
+        if filters:
+            query = query.filter(*filters)
+        if options:
+            query = query.options(*options)
+        
+        if after is not None:
+            valor, ultimo_id = after
+            if por_id:
+                query = query.filter(coluna < ultimo_id if descending else coluna > ultimo_id)
+            elif descending:
+                query = query.filter(or_(coluna < valor, and_(coluna == valor, self.model.id < ultimo_id)))
+            else:
+                query = query.filter(or_(coluna > valor, and_(coluna == valor, self.model.id > ultimo_id)))
+        
+        if descending:
+            ordem = [coluna.desc()] if por_id else [coluna.desc(), self.model.id.desc()]
+        else:
+            ordem = [coluna] if por_id else [coluna, self.model.id]
+        
+        # Busca um item a mais para saber se existe próxima página sem um COUNT
+        itens = consultar(self.session, query.order_by(*ordem).limit(limit + 1), lambda q: q.all())
+        if len(itens) <= limit:
+            return itens, None
+        
+        itens = itens[:limit]
+        ultimo = itens[-1]
+        return itens, (getattr(ultimo, coluna.key), ultimo.id)
+    
+    def count(self, filters: Optional[list] = None) -> int:
+        """Conta as entidades que atendem aos filtros"""
+        query = self.session.query(func.count(self.model.id))
+        if filters:
+            query = query.filter(*filters)
+        return consultar(self.session, query, lambda q: q.scalar())
+    
+    def _colunas_busca(self) -> Dict[str, object]:
+        """Colunas da busca textual (nome na tabela FTS -> expressão SQL), usadas sem FTS5"""
+        return {}
+    
+    def _usa_fts(self) -> bool:
+        return self.fts_table is not None and fts_disponivel(self.session, self.fts_table)
+    
+    def _filtro_texto(self, termo: str, coluna: str = None):
+        """
+        Critério de busca textual por prefixo de palavras, sem acentos.
+        
+        Usa o índice FTS5 quando disponível e ILIKE nas colunas de
+        _colunas_busca nos demais casos. Retorna None se não houver o que buscar.
+        """
+        consulta = montar_consulta(termo, coluna)
+        if consulta is None:
+            return None
+        if self._usa_fts():
+            return self.model.id.in_(select_ids(self.fts_table, consulta))
+        
+        colunas = self._colunas_busca()
+        if coluna:
+            colunas = {coluna: colunas[coluna]}
+        termo = termo.strip()
+        return or_(*(expr.ilike(f'%{termo}%') for expr in colunas.values()))
+    
+    def search_ids(self, termo: str, coluna: str = None, limit: int = None) -> List[int]:
+        """Ids que atendem à busca textual, do mais relevante ao menos relevante"""
+        consulta = montar_consulta(termo, coluna)
+        if consulta is None:
+            return []
+        if self._usa_fts():
+            query = self.session.query(select_ids(self.fts_table, consulta, ordenar=True, limit=limit).subquery())
+        else:
+            query = self.session.query(self.model.id).filter(
+                self._filtro_texto(termo, coluna)
+            ).order_by(self.model.id)
+            if limit:
+                query = query.limit(limit)
+        # A tabela FTS é mantida por triggers da tabela da entidade
+        return consultar(self.session, query, lambda q: [row[0] for row in q],
+                         tabelas=[self.model.__tablename__])
+    
+    def search(self, termo: str, coluna: str = None, limit: int = None) -> List[T]:
+        """Entidades que atendem à busca textual, em ordem de relevância"""
+        ids = self.search_ids(termo, coluna, limit)
+        if not ids:
+            return []
+        por_id = {e.id: e for e in self.session.query(self.model).filter(self.model.id.in_(ids))}
+        return [por_id[i] for i in ids if i in por_id]
     
     def update(self, entity: T) -> T:
-        """Atualiza uma entidade"""
-        self.session.commit()
-        self.session.refresh(entity)
+        """
+        Atualiza uma entidade. Objetos carregados em outra sessão (ex.: a
+        leitura que montou a tela) têm as colunas copiadas para o registro
+        desta sessão, que é o retornado.
+        """
+        if entity not in self.session:
+            entity = self._incorporar(entity)
+        self._commit()
+        self._refresh(entity)
         return entity
     
+    def _incorporar(self, entity: T) -> T:
+        """
+        Registro desta sessão com os valores das colunas de ``entity``.
+        
+        Só colunas: relacionamentos carregados na outra sessão podem estar
+        desatualizados e, copiados, sobrescreveriam as chaves estrangeiras.
+        """
+        atual = self.session.get(self.model, entity.id)
+        if atual is None:
+            raise ValueError(f"{self.model.__name__} {entity.id} não existe mais")
+        valores = inspect(entity).dict
+        for coluna in inspect(self.model).column_attrs:
+            if coluna.key in valores and coluna.key != 'id':
+                setattr(atual, coluna.key, valores[coluna.key])
+        return atual
+    
+    def update_many(self, rows: List[dict]) -> int:
+        """
+        Atualiza vários registros pelo id em uma única transação.
+        
+        Cada item é um dicionário com 'id' e as colunas a alterar; todos os
+        itens devem ter as mesmas chaves para serem enviados em um executemany.
+        """
+        if not rows:
+            return 0
+        # SQL em lote não passa pelo flush: o resumo mensal é atualizado aqui
+        ids = [r['id'] for r in rows]
+        chaves = chaves_por_ids(self.session.connection(), self.model, ids)
+        self.session.execute(update(self.model), rows)
+        chaves |= chaves_por_ids(self.session.connection(), self.model, ids)
+        recalcular_na_sessao(self.session, chaves)
+        self._commit()
+        self._expirar_instancias()
+        return len(rows)
+    
+    def upsert_many(self, rows: List[dict]) -> int:
+        """
+        Insere ou atualiza vários registros pela chave natural do repositório.
+        
+        Registros cuja chave natural já existe têm as demais colunas
+        atualizadas; os outros são inseridos. Tudo em uma única transação.
+        """
+        if not self.natural_key:
+            raise ValueError(f"{type(self).__name__} não define natural_key")
+        if not rows:
+            return 0
+        
+        dialeto = self.session.get_bind().dialect.name
+        if dialeto in ('sqlite', 'postgresql'):
+            self._upsert_on_conflict(dialeto, rows)
+        else:
+            self._upsert_generico(rows)
+        recalcular_na_sessao(self.session, chaves_de_linhas(self.model, rows))
+        self._commit()
+        self._expirar_instancias()
+        return len(rows)
+    
+    def _expirar_instancias(self):
+        """Expira os objetos do modelo já carregados, alterados por SQL em lote"""
+        for obj in list(self.session.identity_map.values()):
+            if isinstance(obj, self.model):
+                self.session.expire(obj)
+    
+    def _upsert_on_conflict(self, dialeto, rows):
+        """Upsert em um único executemany com INSERT ... ON CONFLICT DO UPDATE"""
+        if dialeto == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        
+        stmt = dialect_insert(self.model.__table__)
+        colunas = [c for c in rows[0] if c not in self.natural_key and c != 'id']
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(self.natural_key),
+            set_={c: stmt.excluded[c] for c in colunas}
+        )
+        self.session.execute(stmt, rows)
+    
+    def _upsert_generico(self, rows):
+        """Upsert para bancos sem ON CONFLICT: busca as chaves existentes de uma vez"""
+        colunas_chave = [getattr(self.model, c) for c in self.natural_key]
+        chaves = list({tuple(r[c] for c in self.natural_key) for r in rows})
+        existentes = {
+            tuple(getattr(row, c) for c in self.natural_key): row.id
+            for row in self.session.query(self.model.id, *colunas_chave)
+            .filter(tuple_(*colunas_chave).in_(chaves))
+        }
+        
+        novos = [r for r in rows if tuple(r[c] for c in self.natural_key) not in existentes]
+        alterados = [
+            dict(r, id=existentes[tuple(r[c] for c in self.natural_key)])
+            for r in rows if tuple(r[c] for c in self.natural_key) in existentes
+        ]
+        if novos:
+            self.session.execute(insert(self.model.__table__), novos)
+        if alterados:
+            self.session.execute(update(self.model), alterados)
+    
     def delete(self, entity_id: int) -> bool:
         """Deleta uma entidade por ID"""
         entity = self.get_by_id(entity_id)
         if entity:
             self.session.delete(entity)
-            self.session.commit()
+            self._commit()
             return True
         return False
-
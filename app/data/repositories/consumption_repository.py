@@ -1,11 +1,18 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import date
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import joinedload
+from app.data.database.query_cache import consultar
 from app.data.models.consumption import Consumo
+from app.data.models.house import Casa
 from app.data.repositories.base_repository import BaseRepository
 
 
 class ConsumoRepository(BaseRepository[Consumo]):
     """Repositório específico para Consumos"""
     
+    natural_key = ('casa_id', 'mes', 'ano')
+    
     def __init__(self, session):
         super().__init__(session, Consumo)
     
@@ -28,3 +35,82 @@ class ConsumoRepository(BaseRepository[Consumo]):
         return self.session.query(Consumo).filter(
             Consumo.casa_id == casa_id
         ).order_by(Consumo.ano.desc(), Consumo.mes.desc()).first()
+    
+    def get_historico(self, casa_id: int = None) -> List[Consumo]:
+        """
+        Retorna o histórico de consumos (de uma casa ou de todas) do período mais
+        recente ao mais antigo, com a casa e o inquilino atual já carregados.
+        """
+        query = self.session.query(Consumo).options(
+            joinedload(Consumo.casa).joinedload(Casa.inquilino_atual)
+        )
+        if casa_id is not None:
+            query = query.filter(Consumo.casa_id == casa_id)
+        return query.order_by(Consumo.ano.desc(), Consumo.mes.desc(), Consumo.casa_id).all()
+    
+    def _filtro_periodo(self, inicio: Tuple[int, int] = None, fim: Tuple[int, int] = None) -> list:
+        """Critérios para um intervalo de (ano, mes), inclusive"""
+        filtros = []
+        if inicio:
+            filtros.append(tuple_(Consumo.ano, Consumo.mes) >= tuple(inicio))
+        if fim:
+            filtros.append(tuple_(Consumo.ano, Consumo.mes) <= tuple(fim))
+        return filtros
+    
+    def _agregados(self):
+        return [
+            func.count(Consumo.id).label('quantidade'),
+            func.coalesce(func.sum(Consumo.consumo_diferenca), 0.0).label('total_kwh'),
+            func.coalesce(func.avg(Consumo.consumo_diferenca), 0.0).label('media_kwh'),
+            func.coalesce(func.sum(Consumo.valor_conta), 0.0).label('total_valor'),
+            func.coalesce(func.avg(Consumo.valor_conta), 0.0).label('media_valor'),
+        ]
+    
+    def get_totais_por_casa(self, inicio: Tuple[int, int] = None,
+                            fim: Tuple[int, int] = None) -> List[dict]:
+        """
+        Retorna soma e média de kWh e do valor da conta por casa no intervalo (ano, mes).
+        
+        Cada item tem: casa_id, casa_nome, quantidade, total_kwh, media_kwh,
+        total_valor e media_valor. Ordenado pelo maior consumo.
+        """
+        query = self.session.query(
+            Consumo.casa_id, Casa.nome.label('casa_nome'), *self._agregados()
+        ).join(Casa, Casa.id == Consumo.casa_id).filter(
+            *self._filtro_periodo(inicio, fim)
+        ).group_by(Consumo.casa_id, Casa.nome).order_by(func.sum(Consumo.consumo_diferenca).desc())
+        return consultar(self.session, query, lambda q: [dict(row._mapping) for row in q])
+    
+    def get_totais_por_periodo(self, casa_id: int = None, inicio: Tuple[int, int] = None,
+                               fim: Tuple[int, int] = None) -> List[dict]:
+        """
+        Retorna soma e média de kWh e do valor da conta por mês (de uma casa ou de todas).
+        
+        Cada item tem: ano, mes, quantidade, total_kwh, media_kwh, total_valor e
+        media_valor. Ordem cronológica, pronta para gráficos.
+        """
+        query = self.session.query(Consumo.ano, Consumo.mes, *self._agregados()).filter(
+            *self._filtro_periodo(inicio, fim)
+        )
+        if casa_id is not None:
+            query = query.filter(Consumo.casa_id == casa_id)
+        query = query.group_by(Consumo.ano, Consumo.mes).order_by(Consumo.ano, Consumo.mes)
+        return consultar(self.session, query, lambda q: [dict(row._mapping) for row in q])
+    
+    def get_maiores_consumidores(self, ano: int = None, mes: int = None, limite: int = 5) -> List[dict]:
+        """
+        Retorna as casas com maior consumo (kWh) em um mês (padrão: mês atual).
+        
+        Cada item tem: casa_id, casa_nome, consumo_kwh e valor_conta.
+        """
+        hoje = date.today()
+        query = self.session.query(
+            Consumo.casa_id,
+            Casa.nome.label('casa_nome'),
+            Consumo.consumo_diferenca.label('consumo_kwh'),
+            Consumo.valor_conta,
+        ).join(Casa, Casa.id == Consumo.casa_id).filter(
+            Consumo.ano == (ano or hoje.year),
+            Consumo.mes == (mes or hoje.month)
+        ).order_by(Consumo.consumo_diferenca.desc()).limit(limite)
+        return consultar(self.session, query, lambda q: [dict(row._mapping) for row in q])
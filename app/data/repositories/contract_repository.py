@@ -1,7 +1,11 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict
 from datetime import datetime, date
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import joinedload
 from app.data.models.contract import Contrato
+from app.data.models.Tenant import Inquilino
 from app.data.repositories.base_repository import BaseRepository
+from app.data.repositories.tenant_repository import InquilinoRepository
 
 
 class ContratoRepository(BaseRepository[Contrato]):
@@ -61,11 +65,13 @@ class ContratoRepository(BaseRepository[Contrato]):
         ).first()
     
     def encerrar_contrato(self, contrato_id: int) -> bool:
-        """Encerra um contrato (marca como inativo)"""
+        """Encerra um contrato (marca como inativo e guarda a data do encerramento)"""
         contrato = self.get_by_id(contrato_id)
         if contrato:
+            if contrato.ativo != 0:
+                contrato.data_encerramento = date.today()
             contrato.ativo = 0
-            self.session.commit()
+            self._commit()
             return True
         return False
     
@@ -74,6 +80,66 @@ class ContratoRepository(BaseRepository[Contrato]):
         contrato = self.get_by_id(contrato_id)
         if contrato:
             contrato.ativo = 1
-            self.session.commit()
+            contrato.data_encerramento = None
+            self._commit()
             return True
-        return False
\ No newline at end of file
+        return False
+    
+    def _filtro_status(self, status: str):
+        """
+        Critério equivalente a Contrato.status_descricao == status.
+        
+        Escrito como comparações diretas em ativo/data_fim/data_inicio para
+        usar os índices de contratos, em vez de comparar o CASE linha a linha.
+        """
+        hoje = date.today()
+        if status == 'Encerrado':
+            return or_(Contrato.ativo.is_(None), Contrato.ativo == 0)
+        if status == 'Vencido':
+            return (Contrato.ativo == 1) & (Contrato.data_fim < hoje)
+        if status == 'Futuro':
+            return (Contrato.ativo == 1) & (Contrato.data_fim >= hoje) & (Contrato.data_inicio > hoje)
+        if status == 'Vigente':
+            return (Contrato.ativo == 1) & (Contrato.data_fim >= hoje) & (Contrato.data_inicio <= hoje)
+        raise ValueError(f"Status de contrato desconhecido: {status}")
+    
+    def _filtros_lista(self, casa_id: int = None, nome_inquilino: str = None, status: str = None) -> list:
+        """Monta os critérios usados pela lista de contratos"""
+        filtros = []
+        if status:
+            filtros.append(self._filtro_status(status))
+        if casa_id:
+            filtros.append(Contrato.casa_id == casa_id)
+        # Nome do inquilino pelo índice de busca textual de inquilinos
+        filtro_nome = InquilinoRepository(self.session).filtro_nome(nome_inquilino)
+        if filtro_nome is not None:
+            filtros.append(Contrato.inquilino_id.in_(select(Inquilino.id).where(filtro_nome)))
+        return filtros
+    
+    def get_pagina(self, casa_id: int = None, nome_inquilino: str = None, status: str = None,
+                   limit: int = 50, after: tuple = None) -> Tuple[List[Contrato], Optional[tuple]]:
+        """
+        Retorna uma página de contratos (mais recentes primeiro) com casa e inquilino carregados.
+        
+        Status, casa e busca por nome do inquilino são combinados em uma única consulta.
+        """
+        return self.get_page(
+            limit=limit,
+            after=after,
+            order_by=Contrato.data_inicio,
+            descending=True,
+            filters=self._filtros_lista(casa_id, nome_inquilino, status),
+            options=[joinedload(Contrato.casa), joinedload(Contrato.inquilino)]
+        )
+    
+    def contar(self, casa_id: int = None, nome_inquilino: str = None, status: str = None) -> int:
+        """Conta os contratos que atendem aos filtros da lista"""
+        return self.count(self._filtros_lista(casa_id, nome_inquilino, status))
+    
+    def contar_por_status(self, casa_id: int = None) -> Dict[str, int]:
+        """Retorna a quantidade de contratos por status (ex.: {'Vigente': 8, 'Vencido': 1})"""
+        status = Contrato.status_descricao
+        query = self.session.query(status, func.count(Contrato.id))
+        if casa_id:
+            query = query.filter(Contrato.casa_id == casa_id)
+        return dict(query.group_by(status).all())
\ No newline at end of file
@@ -1,14 +1,25 @@
-from typing import List, Optional
+from typing import List, Optional, Dict
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
 from app.data.models.house import Casa
+from app.data.models.Tenant import Inquilino
+from app.data.database.query_cache import consultar
 from app.data.repositories.base_repository import BaseRepository
 
 
 class CasaRepository(BaseRepository[Casa]):
     """Repositório específico para Casas"""
     
+    fts_table = 'casas_fts'
+    
     def __init__(self, session):
         super().__init__(session, Casa)
     
+    def get_all(self) -> List[Casa]:
+        """Retorna todas as casas com o inquilino atual já carregado (as telas o mostram)"""
+        query = self.session.query(Casa).options(joinedload(Casa.inquilino_atual))
+        return consultar(self.session, query, lambda q: q.all())
+    
     def get_by_inquilino(self, inquilino_id: int) -> Optional[Casa]:
         """Busca casa por inquilino"""
         return self.session.query(Casa).filter(Casa.inquilino_id == inquilino_id).first()
@@ -16,4 +27,22 @@ class CasaRepository(BaseRepository[Casa]):
     def get_casas_disponiveis(self) -> List[Casa]:
         """Retorna casas sem inquilino"""
         return self.session.query(Casa).filter(Casa.inquilino_id.is_(None)).all()
-
+    
+    def _colunas_busca(self) -> Dict[str, object]:
+        return {
+            'nome': Casa.nome,
+            'endereco': Casa.endereco,
+            'nome_inquilino': select(Inquilino.nome_completo).where(
+                Inquilino.id == Casa.inquilino_id
+            ).scalar_subquery(),
+        }
+    
+    def buscar(self, termo: str = None) -> List[Casa]:
+        """Busca casas por nome, endereço ou nome do inquilino (todas se o termo for vazio)"""
+        query = self.session.query(Casa).options(joinedload(Casa.inquilino_atual))
+        filtro = self._filtro_texto(termo)
+        if filtro is not None:
+            query = query.filter(filtro)
+        # O índice de casas também guarda o nome do inquilino
+        return consultar(self.session, query.order_by(Casa.id), lambda q: q.all(),
+                         tabelas=['inquilinos'])
@@ -0,0 +1,61 @@
+from typing import List
+from datetime import date
+from sqlalchemy import func
+from app.data.models.monthly_summary import ResumoMensal
+from app.data.database.monthly_summary import reconstruir
+from app.data.database.query_cache import consultar
+from app.data.repositories.base_repository import BaseRepository
+
+
+class ResumoMensalRepository(BaseRepository[ResumoMensal]):
+    """Repositório do resumo mensal pré-calculado (somente leitura, exceto a reconstrução)"""
+    
+    natural_key = ('ano', 'mes', 'casa_id')
+    
+    def __init__(self, session):
+        super().__init__(session, ResumoMensal)
+    
+    def get_totais_mes(self, ano: int = None, mes: int = None) -> dict:
+        """
+        Retorna os totais da carteira em um mês (padrão: mês atual).
+        
+        Chaves: receita_total, receita_aluguel, quantidade_recibos, energia_kwh,
+        energia_valor, aluguel_contratado e casas_ocupadas.
+        """
+        hoje = date.today()
+        ano = ano or hoje.year
+        mes = mes or hoje.month
+        query = self.session.query(
+            func.coalesce(func.sum(ResumoMensal.receita_total), 0.0).label('receita_total'),
+            func.coalesce(func.sum(ResumoMensal.receita_aluguel), 0.0).label('receita_aluguel'),
+            func.coalesce(func.sum(ResumoMensal.quantidade_recibos), 0).label('quantidade_recibos'),
+            func.coalesce(func.sum(ResumoMensal.energia_kwh), 0.0).label('energia_kwh'),
+            func.coalesce(func.sum(ResumoMensal.energia_valor), 0.0).label('energia_valor'),
+            func.coalesce(func.sum(ResumoMensal.aluguel_contratado), 0.0).label('aluguel_contratado'),
+            func.coalesce(func.sum(ResumoMensal.ocupada), 0).label('casas_ocupadas'),
+        ).filter(ResumoMensal.ano == ano, ResumoMensal.mes == mes)
+        return dict(consultar(self.session, query, lambda q: q.one())._mapping)
+    
+    def get_periodo(self, ano_inicio: int, mes_inicio: int, ano_fim: int, mes_fim: int,
+                    casa_id: int = None) -> List[dict]:
+        """
+        Retorna as linhas do resumo entre dois meses (inclusive), em ordem cronológica.
+        
+        As linhas vêm como dicionários (não entidades): a tabela é regravada por
+        SQL a cada alteração e objetos no identity map ficariam desatualizados.
+        """
+        periodo = ResumoMensal.ano * 100 + ResumoMensal.mes
+        query = self.session.query(*ResumoMensal.__table__.columns).filter(
+            periodo >= ano_inicio * 100 + mes_inicio,
+            periodo <= ano_fim * 100 + mes_fim
+        )
+        if casa_id is not None:
+            query = query.filter(ResumoMensal.casa_id == casa_id)
+        query = query.order_by(ResumoMensal.ano, ResumoMensal.mes, ResumoMensal.casa_id)
+        return consultar(self.session, query, lambda q: [dict(row._mapping) for row in q])
+    
+    def reconstruir(self) -> int:
+        """Recalcula todo o resumo a partir de recibos, consumos e contratos"""
+        total = reconstruir(self.session.connection())
+        self._commit()
+        return total
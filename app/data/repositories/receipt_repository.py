@@ -1,12 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict
 from datetime import datetime, date
+from sqlalchemy import func, extract, select, insert, update, literal, exists
+from sqlalchemy.exc import IntegrityError
 from app.data.models.receipt import Recibo
+from app.data.models.sequence import Sequencia
 from app.data.repositories.base_repository import BaseRepository
 
 
 class ReciboRepository(BaseRepository[Recibo]):
     """Repositório específico para Recibos"""
     
+    fts_table = 'recibos_fts'
+    
     def __init__(self, session):
         super().__init__(session, Recibo)
     
@@ -43,24 +48,135 @@ class ReciboRepository(BaseRepository[Recibo]):
         ).order_by(Recibo.data_pagamento.desc()).all()
     
     def get_recibos_pagador(self, nome_pagador: str) -> List[Recibo]:
-        """Busca recibos por nome do pagador (parcial)"""
-        return self.session.query(Recibo).filter(
-            Recibo.nome_pagador.ilike(f'%{nome_pagador}%')
-        ).order_by(Recibo.data_pagamento.desc()).all()
+        """Busca recibos por nome do pagador (prefixo de palavras, sem acentos)"""
+        filtro = self._filtro_texto(nome_pagador, coluna='nome_pagador')
+        if filtro is None:
+            return []
+        return self.session.query(Recibo).filter(filtro).order_by(Recibo.data_pagamento.desc()).all()
+    
+    def _colunas_busca(self) -> Dict[str, object]:
+        return {
+            'nome_pagador': Recibo.nome_pagador,
+            'referente_a': Recibo.referente_a,
+            'descricao': Recibo.descricao,
+        }
+    
+    def _filtros_lista(self, tipo_recibo: str = None, termo: str = None) -> list:
+        """Monta os critérios usados pela lista de recibos (termo busca pagador, referência e descrição)"""
+        filtros = []
+        if tipo_recibo:
+            filtros.append(Recibo.tipo_recibo == tipo_recibo)
+        filtro_texto = self._filtro_texto(termo)
+        if filtro_texto is not None:
+            filtros.append(filtro_texto)
+        return filtros
+    
+    def get_pagina(self, tipo_recibo: str = None, termo: str = None,
+                   limit: int = 50, after: tuple = None) -> Tuple[List[Recibo], Optional[tuple]]:
+        """Retorna uma página de recibos, do pagamento mais recente ao mais antigo"""
+        return self.get_page(
+            limit=limit,
+            after=after,
+            order_by=Recibo.data_pagamento,
+            descending=True,
+            filters=self._filtros_lista(tipo_recibo, termo)
+        )
+    
+    def contar(self, tipo_recibo: str = None, termo: str = None) -> int:
+        """Conta os recibos que atendem aos filtros da lista"""
+        return self.count(self._filtros_lista(tipo_recibo, termo))
     
     def get_total_recebido_periodo(self, data_inicio: date, data_fim: date) -> float:
         """Retorna o total recebido em um período"""
-        recibos = self.get_by_data_pagamento(data_inicio, data_fim)
-        return sum(r.valor for r in recibos)
+        total = self.session.query(func.coalesce(func.sum(Recibo.valor), 0.0)).filter(
+            Recibo.data_pagamento >= data_inicio,
+            Recibo.data_pagamento <= data_fim
+        ).scalar()
+        return float(total)
     
     def get_total_por_tipo(self, tipo_recibo: str, data_inicio: date = None, data_fim: date = None) -> float:
         """Retorna o total recebido por tipo de recibo"""
-        query = self.session.query(Recibo).filter(Recibo.tipo_recibo == tipo_recibo)
+        query = self.session.query(func.coalesce(func.sum(Recibo.valor), 0.0)).filter(
+            Recibo.tipo_recibo == tipo_recibo
+        )
         
         if data_inicio:
             query = query.filter(Recibo.data_pagamento >= data_inicio)
         if data_fim:
             query = query.filter(Recibo.data_pagamento <= data_fim)
         
-        recibos = query.all()
-        return sum(r.valor for r in recibos)
\ No newline at end of file
+        return float(query.scalar())
+    
+    def get_resumo_mensal(self, data_inicio: date = None, data_fim: date = None) -> List[dict]:
+        """
+        Retorna os totais recebidos agrupados por mês de pagamento, tipo, casa e inquilino.
+        
+        Cada item é um dicionário com as chaves: ano, mes, tipo_recibo, casa_id,
+        inquilino_id, total e quantidade. Ordenado do mês mais recente ao mais antigo.
+        """
+        ano = extract('year', Recibo.data_pagamento)
+        mes = extract('month', Recibo.data_pagamento)
+        
+        query = self.session.query(
+            ano.label('ano'),
+            mes.label('mes'),
+            Recibo.tipo_recibo,
+            Recibo.casa_id,
+            Recibo.inquilino_id,
+            func.sum(Recibo.valor).label('total'),
+            func.count(Recibo.id).label('quantidade')
+        )
+        
+        if data_inicio:
+            query = query.filter(Recibo.data_pagamento >= data_inicio)
+        if data_fim:
+            query = query.filter(Recibo.data_pagamento <= data_fim)
+        
+        query = query.group_by(
+            ano, mes, Recibo.tipo_recibo, Recibo.casa_id, Recibo.inquilino_id
+        ).order_by(ano.desc(), mes.desc(), Recibo.tipo_recibo)
+        
+        return [dict(row._mapping) for row in query.all()]
+    
+    def reservar_numero(self, ano: int = None) -> str:
+        """
+        Reserva o próximo número de recibo e o retorna formatado.
+        
+        Sem ano, usa a numeração global ('000123'); com ano, a numeração
+        reinicia a cada ano ('000045-2025'). O incremento e a leitura ocorrem
+        na mesma transação, então dois emissores nunca recebem o mesmo número.
+        """
+        chave = f'recibo:{ano}' if ano else 'recibo'
+        incrementar = (
+            update(Sequencia)
+            .where(Sequencia.chave == chave)
+            .values(ultimo_valor=Sequencia.ultimo_valor + 1)
+        )
+        
+        if self.session.execute(incrementar).rowcount == 0:
+            # Primeiro uso da chave: a numeração global continua depois do maior
+            # id (número dos recibos antigos, mesmo com exclusões); a anual começa do zero
+            semente = 0 if ano else self.session.query(func.coalesce(func.max(Recibo.id), 0)).scalar()
+            try:
+                # Savepoint: em banco no servidor outra estação pode criar a
+                # chave ao mesmo tempo; a nossa inserção falha e o UPDATE
+                # abaixo incrementa a linha que ela criou
+                with self.session.begin_nested():
+                    self.session.execute(
+                        insert(Sequencia).from_select(
+                            ['chave', 'ultimo_valor'],
+                            select(literal(chave), literal(semente)).where(
+                                ~exists().where(Sequencia.chave == chave)
+                            )
+                        )
+                    )
+            except IntegrityError:
+                pass
+            self.session.execute(incrementar)
+        
+        numero = self.session.execute(
+            select(Sequencia.ultimo_valor).where(Sequencia.chave == chave)
+        ).scalar_one()
+        self._commit()
+        
+        return f"{numero:06d}-{ano}" if ano else f"{numero:06d}"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple, Dict
 from app.data.models.Tenant import Inquilino
 from app.data.repositories.base_repository import BaseRepository
 
@@ -6,6 +6,9 @@ from app.data.repositories.base_repository import BaseRepository
 class InquilinoRepository(BaseRepository[Inquilino]):
     """Repositório específico para Inquilinos"""
     
+    natural_key = ('cpf',)
+    fts_table = 'inquilinos_fts'
+    
     def __init__(self, session):
         super().__init__(session, Inquilino)
     
@@ -14,7 +17,35 @@ class InquilinoRepository(BaseRepository[Inquilino]):
         return self.session.query(Inquilino).filter(Inquilino.cpf == cpf).first()
     
     def search_by_name(self, nome: str) -> List[Inquilino]:
-        """Busca inquilinos por nome (parcial)"""
-        return self.session.query(Inquilino).filter(
-            Inquilino.nome_completo.ilike(f'%{nome}%')
-        ).all()
+        """Busca inquilinos por nome (prefixo de palavras, sem acentos), por relevância"""
+        return self.search(nome, coluna='nome_completo')
+    
+    def filtro_nome(self, nome: str):
+        """Critério de busca por nome (o mesmo de search_by_name) para filtrar outras consultas; None se vazio"""
+        return self._filtro_texto(nome, coluna='nome_completo')
+    
+    def _colunas_busca(self) -> Dict[str, object]:
+        return {
+            'nome_completo': Inquilino.nome_completo,
+            'cpf': Inquilino.cpf,
+            'telefone': Inquilino.telefone,
+        }
+    
+    def _filtros_busca(self, termo: str = None) -> list:
+        """Monta o critério de busca por nome, CPF ou telefone"""
+        filtro = self._filtro_texto(termo)
+        return [filtro] if filtro is not None else []
+    
+    def get_pagina(self, termo: str = None, limit: int = 50,
+                   after: tuple = None) -> Tuple[List[Inquilino], Optional[tuple]]:
+        """Retorna uma página de inquilinos em ordem alfabética"""
+        return self.get_page(
+            limit=limit,
+            after=after,
+            order_by=Inquilino.nome_completo,
+            filters=self._filtros_busca(termo)
+        )
+    
+    def contar(self, termo: str = None) -> int:
+        """Conta os inquilinos que atendem à busca"""
+        return self.count(self._filtros_busca(termo))
\ No newline at end of file
@@ -0,0 +1,113 @@
+"""
+Ponte entre o Tkinter e o asyncio.
+
+O loop asyncio roda em uma thread própria; as telas enviam corrotinas com
+``executar`` (um método de repositório com ``chamar`` ou uma função
+bloqueante com ``executar_em_thread``) e recebem o resultado em um callback
+executado na thread do Tkinter, entregue por um ``after`` que só fica
+agendado enquanto houver tarefas em andamento. Assim a janela continua
+redesenhando enquanto a consulta roda.
+"""
+import asyncio
+import queue
+import threading
+
+
+class AsyncBridge:
+    """Executa corrotinas em segundo plano e devolve os resultados à interface"""
+
+    # Intervalo de verificação dos resultados enquanto há tarefas pendentes
+    INTERVALO_MS = 30
+
+    def __init__(self, root, engine=None):
+        self.root = root
+        self.engine = engine
+        self.session_factory = None
+        if engine is not None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+            self.session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        self._loop = asyncio.new_event_loop()
+        self._resultados = queue.Queue()
+        self._pendentes = 0
+        self._agendamento = None
+        self._thread = threading.Thread(target=self._rodar_loop, name='asyncio', daemon=True)
+        self._thread.start()
+
+    def _rodar_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def executar(self, coro, ao_concluir=None, ao_falhar=None):
+        """
+        Agenda a corrotina no loop asyncio (chamar na thread do Tkinter).
+
+        ``ao_concluir(resultado)`` ou ``ao_falhar(erro)`` são chamados na
+        thread do Tkinter. Retorna o concurrent.futures.Future da tarefa.
+        """
+        futuro = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        futuro.add_done_callback(lambda f: self._resultados.put((f, ao_concluir, ao_falhar)))
+        self._pendentes += 1
+        self._agendar()
+        return futuro
+
+    def executar_em_thread(self, funcao, *args, ao_concluir=None, ao_falhar=None):
+        """Executa uma função bloqueante (ex.: backup, PDF) em uma thread do executor do loop"""
+        return self.executar(asyncio.to_thread(funcao, *args), ao_concluir, ao_falhar)
+
+    @property
+    def tem_banco(self):
+        """Indica se há engine assíncrono para as sessões (aiosqlite instalado)"""
+        return self.session_factory is not None
+
+    def sessao(self):
+        """Nova AsyncSession (usar com ``async with`` dentro da corrotina)"""
+        if self.session_factory is None:
+            raise RuntimeError("AsyncBridge criado sem engine assíncrono")
+        return self.session_factory()
+
+    def chamar(self, repositorio, metodo, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+        """Executa ``repositorio(sessao).metodo(*args, **kwargs)`` em uma sessão própria"""
+        async def tarefa():
+            async with self.sessao() as session:
+                return await getattr(repositorio(session), metodo)(*args, **kwargs)
+        return self.executar(tarefa(), ao_concluir, ao_falhar)
+
+    def _agendar(self):
+        if self._agendamento is None:
+            self._agendamento = self.root.after(self.INTERVALO_MS, self._entregar)
+
+    def _entregar(self):
+        """Chama na thread do Tkinter os callbacks das tarefas concluídas"""
+        self._agendamento = None
+        while True:
+            try:
+                futuro, ao_concluir, ao_falhar = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            self._pendentes -= 1
+            if futuro.cancelled():
+                continue
+            erro = futuro.exception()
+            if erro is None:
+                if ao_concluir:
+                    ao_concluir(futuro.result())
+            elif ao_falhar:
+                ao_falhar(erro)
+            else:
+                print(f"❌ Erro em tarefa assíncrona: {erro}")
+        if self._pendentes > 0:
+            self._agendar()
+
+    def fechar(self):
+        """Libera as conexões do engine assíncrono e encerra o loop"""
+        if self._agendamento is not None:
+            self.root.after_cancel(self._agendamento)
+            self._agendamento = None
+        if self.engine is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(self.engine.dispose(), self._loop).result(timeout=5)
+            except Exception as e:
+                print(f"⚠️  Erro ao fechar o engine assíncrono: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
@@ -0,0 +1,125 @@
+"""
+Medição do tempo de abertura do aplicativo.
+
+``iniciar`` deve ser chamado antes dos demais imports do main.py: a partir
+daí o tempo de import de cada módulo é registrado (tempo próprio, sem os
+módulos que ele importa) e ``marcar`` anota o fim de cada etapa. Quando a
+tela inicial aparece, ``concluir`` imprime o tempo total comparado ao
+orçamento (INICIALIZACAO_ORCAMENTO_MS no .env); o detalhamento por etapa e
+os imports mais lentos aparecem com INICIALIZACAO_DETALHES=1 ou sempre que
+o orçamento é ultrapassado.
+"""
+import builtins
+import os
+import sys
+import threading
+import time
+from importlib.util import resolve_name
+
+# Tempo máximo aceitável até a tela inicial aparecer (em milissegundos)
+ORCAMENTO_PADRAO_MS = 1500
+
+# Quantidade de módulos listados no detalhamento
+MODULOS_NO_RELATORIO = 15
+
+_inicio = None
+_etapas = []
+_imports = {}
+_pilha = []
+_IMPORT_PADRAO = builtins.__import__
+_thread_medida = None
+
+
+def _import_medido(nome, globals=None, locals=None, fromlist=(), level=0):
+    if threading.get_ident() != _thread_medida:
+        # Imports de outras threads (ex.: loop asyncio) não entram na pilha
+        return _IMPORT_PADRAO(nome, globals, locals, fromlist, level)
+    completo = nome
+    if level:
+        try:
+            completo = resolve_name('.' * level + nome, (globals or {}).get('__package__'))
+        except (ImportError, ValueError):
+            pass
+    novo = completo not in _imports and completo not in sys.modules
+
+    _pilha.append(0.0)
+    inicio = time.perf_counter()
+    try:
+        return _IMPORT_PADRAO(nome, globals, locals, fromlist, level)
+    finally:
+        decorrido = time.perf_counter() - inicio
+        filhos = _pilha.pop()
+        if _pilha:
+            _pilha[-1] += decorrido
+        if novo:
+            _imports[completo] = decorrido - filhos
+
+
+def iniciar():
+    """Começa a medição (tempo zero) e passa a registrar os imports"""
+    global _inicio, _thread_medida
+    _inicio = time.perf_counter()
+    _thread_medida = threading.get_ident()
+    _etapas.clear()
+    _imports.clear()
+    builtins.__import__ = _import_medido
+
+
+def _parar_medicao_imports():
+    if builtins.__import__ is _import_medido:
+        builtins.__import__ = _IMPORT_PADRAO
+
+
+def marcar(etapa):
+    """Registra o fim de uma etapa da abertura"""
+    if _inicio is not None:
+        _etapas.append((etapa, time.perf_counter()))
+
+
+def orcamento_ms():
+    return int(os.getenv('INICIALIZACAO_ORCAMENTO_MS', ORCAMENTO_PADRAO_MS))
+
+
+def concluir(etapa="Tela inicial exibida"):
+    """
+    Encerra a medição e imprime o relatório.
+
+    Retorna um dicionário com 'total_ms', 'orcamento_ms', 'etapas'
+    [(etapa, ms)] e 'imports' [(módulo, ms)], do mais lento ao mais rápido.
+    """
+    global _inicio
+    if _inicio is None:
+        return None
+    marcar(etapa)
+    _parar_medicao_imports()
+
+    etapas = []
+    anterior = _inicio
+    for nome, momento in _etapas:
+        etapas.append((nome, (momento - anterior) * 1000))
+        anterior = momento
+    relatorio = {
+        'total_ms': (_etapas[-1][1] - _inicio) * 1000,
+        'orcamento_ms': orcamento_ms(),
+        'etapas': etapas,
+        'imports': sorted(((m, t * 1000) for m, t in _imports.items()), key=lambda i: i[1], reverse=True),
+    }
+    _inicio = None
+    _imprimir(relatorio)
+    return relatorio
+
+
+def _imprimir(relatorio):
+    total, orcamento = relatorio['total_ms'], relatorio['orcamento_ms']
+    dentro = total <= orcamento
+    print(f"{'⏱️ ' if dentro else '⚠️ '} Abertura em {total:.0f} ms (orçamento: {orcamento} ms)")
+
+    detalhes = os.getenv('INICIALIZACAO_DETALHES', '').strip().lower() in ('1', 'true', 'sim')
+    if dentro and not detalhes:
+        return
+    print("   Etapas:")
+    for nome, ms in relatorio['etapas']:
+        print(f"     {ms:8.1f} ms  {nome}")
+    print(f"   Imports mais lentos (tempo próprio, total {sum(t for _, t in relatorio['imports']):.0f} ms):")
+    for modulo, ms in relatorio['imports'][:MODULOS_NO_RELATORIO]:
+        print(f"     {ms:8.1f} ms  {modulo}")
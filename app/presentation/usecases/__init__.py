@@ -1,3 +1,15 @@
-from .generate_pdf_usecase import gerar_conta_inquilino
-from .generate_contract_pdf_usecase import gerar_contrato_locacao
-from .generate_receipt_pdf_usecase import gerar_recibo_pagamento
\ No newline at end of file
+# Os módulos de PDF importam o ReportLab (lento): só são carregados no primeiro uso
+_FUNCOES = {
+    'gerar_conta_inquilino': 'generate_pdf_usecase',
+    'gerar_contrato_locacao': 'generate_contract_pdf_usecase',
+    'gerar_recibo_pagamento': 'generate_receipt_pdf_usecase',
+}
+
+__all__ = list(_FUNCOES)
+
+
+def __getattr__(nome):
+    if nome in _FUNCOES:
+        from importlib import import_module
+        return getattr(import_module(f"{__name__}.{_FUNCOES[nome]}"), nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
@@ -9,18 +9,27 @@ import re
 import os
 import locale
 
-# Tenta configurar locale para português
-try:
-    locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
-except:
+_locale_configurado = False
+
+
+def configurar_locale():
+    """Tenta configurar locale para português (uma vez, no primeiro documento)"""
+    global _locale_configurado
+    if _locale_configurado:
+        return
+    _locale_configurado = True
     try:
-        locale.setlocale(locale.LC_TIME, 'Portuguese_Brazil.1252')
+        locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
     except:
-        pass
+        try:
+            locale.setlocale(locale.LC_TIME, 'Portuguese_Brazil.1252')
+        except:
+            pass
 
 
 def traduzir_mes(data):
     """Traduz mês para português"""
+    configurar_locale()
     meses_pt = {
         'January': 'janeiro', 'February': 'fevereiro', 'March': 'março',
         'April': 'abril', 'May': 'maio', 'June': 'junho',
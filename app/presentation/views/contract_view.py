@@ -14,13 +14,14 @@ from app.data.models.contract import Contrato
 from app.data.repositories.contract_repository import ContratoRepository
 from app.data.repositories.house_repository import CasaRepository
 from app.data.repositories.tenant_repository import InquilinoRepository
-from app.presentation.usecases.generate_contract_pdf_usecase import gerar_contrato_locacao
 from app.presentation.views.widgets.header_widget import create_header
 from app.presentation.views.widgets.new_contract_form_widget import NewContractForm
 from app.presentation.views.widgets.contract_list_widget import ContractListWidget
 
 load_dotenv()
 
+TAMANHO_PAGINA = 50
+
 
 class ContractView(tk.Frame):
     """Tela de gerenciamento de contratos de locação"""
@@ -28,15 +29,16 @@ class ContractView(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg='#f0f0f0')
         self.controller = controller
-        self.session = controller.get_session()
-        self.contrato_repo = ContratoRepository(self.session)
-        self.casa_repo = CasaRepository(self.session)
-        self.inquilino_repo = InquilinoRepository(self.session)
+        self.session_manager = controller.session_manager
 
         # Dicionários para mapear seleções
         self.casas_dict = {}
         self.inquilinos_dict = {}
 
+        # Estado da paginação da lista
+        self._filtros_lista = {}
+        self._cursor_lista = None
+
         self.create_widgets()
     
     def create_widgets(self):
@@ -103,7 +105,8 @@ class ContractView(tk.Frame):
             on_view=self.view_contrato_detail,
             on_edit=self.edit_contrato,
             on_end=self.end_contrato,
-            on_generate_pdf=self.reprint_pdf
+            on_generate_pdf=self.reprint_pdf,
+            on_load_more=self.load_more_contratos
         )
 
         # Expõe os filtros
@@ -118,7 +121,8 @@ class ContractView(tk.Frame):
     
     def load_casas(self):
         """Carrega casas nos comboboxes"""
-        casas = self.casa_repo.get_all()
+        with self.session_manager.leitura() as session:
+            casas = CasaRepository(session).get_all()
         self.casas_dict = {f"{c.nome} - {c.endereco}": c for c in casas}
         
         # Combo da nova conta
@@ -132,42 +136,66 @@ class ContractView(tk.Frame):
     
     def load_inquilinos(self):
         """Carrega inquilinos no combobox"""
-        inquilinos = self.inquilino_repo.get_all()
+        with self.session_manager.leitura() as session:
+            inquilinos = InquilinoRepository(session).get_all()
         self.inquilinos_dict = {f"{i.nome_completo} (CPF: {i.cpf})": i for i in inquilinos}
         
         if hasattr(self, 'combo_inquilino'):
             self.combo_inquilino['values'] = list(self.inquilinos_dict.keys())
     
+    def atualizar(self):
+        """Recarrega combos e lista ao voltar para a tela, mantendo as seleções e filtros"""
+        casa, inquilino = self.combo_casa.get(), self.combo_inquilino.get()
+        filtro_casa = self.filter_casa.get()
+        self.load_casas()
+        self.load_inquilinos()
+        if casa in self.casas_dict:
+            self.combo_casa.set(casa)
+        if inquilino in self.inquilinos_dict:
+            self.combo_inquilino.set(inquilino)
+        if filtro_casa in self.casas_dict:
+            self.filter_casa.set(filtro_casa)
+        self.filter_contratos()
+    
     def load_contratos(self):
-        """Carrega todos os contratos na lista"""
-        contratos = self.contrato_repo.get_all()
+        """Carrega a primeira página de contratos na lista"""
+        self._cursor_lista = None
+        with self.session_manager.leitura() as session:
+            repo = ContratoRepository(session)
+            contratos = self._buscar_pagina_contratos(repo)
+            total = repo.contar(**self._filtros_lista)
         if hasattr(self, 'contract_list'):
-            self.contract_list.set_items(contratos)
+            self.contract_list.set_items(contratos, has_more=self._cursor_lista is not None)
+            self.contract_list.set_total(total)
+    
+    def load_more_contratos(self):
+        """Acrescenta a próxima página de contratos (chamado ao rolar a lista)"""
+        if self._cursor_lista is None:
+            return
+        with self.session_manager.leitura() as session:
+            contratos = self._buscar_pagina_contratos(ContratoRepository(session))
+        self.contract_list.append_items(contratos, has_more=self._cursor_lista is not None)
+    
+    def _buscar_pagina_contratos(self, repo):
+        # Casa e inquilino vêm carregados (joinedload): a lista e os diálogos os usam depois da sessão
+        contratos, self._cursor_lista = repo.get_pagina(
+            limit=TAMANHO_PAGINA, after=self._cursor_lista, **self._filtros_lista
+        )
+        return contratos
     
     def filter_contratos(self):
         """Filtra contratos com base nos critérios selecionados"""
         status_filter = self.filter_status.get()
         casa_filter = self.filter_casa.get()
-        search_term = self.search_var.get().lower()
-        
-        # Busca base
-        contratos = self.contrato_repo.get_all()
-        
-        # Filtro por status
-        if status_filter != 'Todos':
-            contratos = [c for c in contratos if c.status_descricao == status_filter]
-        
-        # Filtro por casa
-        if casa_filter != 'Todas':
-            casa = self.casas_dict.get(casa_filter)
-            if casa:
-                contratos = [c for c in contratos if c.casa_id == casa.id]
-        
-        # Filtro por inquilino (busca)
-        if search_term:
-            contratos = [c for c in contratos if search_term in c.inquilino.nome_completo.lower()]
-        
-        self.contract_list.set_items(contratos)
+        search_term = self.search_var.get().strip()
+        
+        casa = self.casas_dict.get(casa_filter) if casa_filter != 'Todas' else None
+        self._filtros_lista = {
+            'casa_id': casa.id if casa else None,
+            'nome_inquilino': search_term or None,
+            'status': status_filter if status_filter != 'Todos' else None,
+        }
+        self.load_contratos()
     
     def calcular_data_fim(self, event=None):
         """Calcula automaticamente a data de fim baseada no início e duração"""
@@ -215,12 +243,12 @@ class ContractView(tk.Frame):
                 return
             
             # Verifica se já existe contrato ativo para esta casa
-            contrato_existente = self.contrato_repo.get_contrato_ativo_casa(casa.id)
+            with self.session_manager.leitura() as session:
+                contrato_existente = ContratoRepository(session).get_contrato_ativo_casa(casa.id)
             if contrato_existente:
                 if not messagebox.askyesno("Confirmar", 
                     "Já existe um contrato ativo para esta casa. Deseja encerrá-lo e criar um novo?"):
                     return
-                self.contrato_repo.encerrar_contrato(contrato_existente.id)
             
             # Cria novo contrato
             novo_contrato = Contrato(
@@ -240,11 +268,18 @@ class ContractView(tk.Frame):
                 observacoes=observacoes if observacoes else None
             )
             
-            self.contrato_repo.create(novo_contrato)
-            
-            # Atualiza o inquilino_id da casa
-            casa.inquilino_id = inquilino.id
-            self.casa_repo.update(casa)
+            # Encerrar o contrato antigo, criar o novo e vincular o inquilino à casa
+            # são gravados juntos: em caso de erro nada é alterado
+            with self.session_manager.scope() as session:
+                contrato_repo = ContratoRepository(session)
+                if contrato_existente:
+                    contrato_repo.encerrar_contrato(contrato_existente.id)
+                
+                contrato_repo.create(novo_contrato)
+                
+                # Atualiza o inquilino_id da casa
+                casa.inquilino_id = inquilino.id
+                CasaRepository(session).update(casa)
             
             messagebox.showinfo("Sucesso", "Contrato cadastrado com sucesso!")
             self.clear_form()
@@ -329,6 +364,8 @@ class ContractView(tk.Frame):
                 }
             }
             
+            # Importado só aqui: o ReportLab deixa a abertura da tela lenta
+            from app.presentation.usecases.generate_contract_pdf_usecase import gerar_contrato_locacao
             arquivo = gerar_contrato_locacao(dados_pdf)
             messagebox.showinfo("Sucesso", f"Contrato PDF gerado com sucesso!\n{arquivo}")
             
@@ -653,10 +690,16 @@ class ContractView(tk.Frame):
                 contrato.juros_dia_percentual = float(entry_juros.get())
                 contrato.multa_rescisao_meses = int(entry_rescisao.get())
                 contrato.observacoes = text_obs.get("1.0", tk.END).strip() or None
-                contrato.ativo = var_ativo.get()
                 
-                # Salva no banco
-                self.contrato_repo.update(contrato)
+                # Salva no banco; a troca de status passa por encerrar/reativar,
+                # que também gravam a data de encerramento
+                with self.session_manager.scope() as session:
+                    contrato_repo = ContratoRepository(session)
+                    contrato_repo.update(contrato)
+                    if var_ativo.get() and not contrato.ativo:
+                        contrato_repo.reativar_contrato(contrato.id)
+                    elif not var_ativo.get() and contrato.ativo:
+                        contrato_repo.encerrar_contrato(contrato.id)
                 
                 messagebox.showinfo("Sucesso", "Contrato atualizado com sucesso!")
                 dialog.destroy()
@@ -702,7 +745,8 @@ class ContractView(tk.Frame):
         if messagebox.askyesno("Confirmar Encerramento", 
             "Deseja realmente encerrar este contrato?\n\nEsta ação marcará o contrato como encerrado."):
             try:
-                self.contrato_repo.encerrar_contrato(contrato_id)
+                with self.session_manager.scope() as session:
+                    ContratoRepository(session).encerrar_contrato(contrato_id)
                 messagebox.showinfo("Sucesso", "Contrato encerrado!")
                 self.load_contratos()
             except Exception as e:
@@ -762,6 +806,7 @@ class ContractView(tk.Frame):
                 }
             }
             
+            from app.presentation.usecases.generate_contract_pdf_usecase import gerar_contrato_locacao
             arquivo = gerar_contrato_locacao(dados_pdf)
             messagebox.showinfo("Sucesso", f"Contrato PDF reimpresso com sucesso!\n{arquivo}")
             
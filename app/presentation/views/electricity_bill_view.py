@@ -7,7 +7,6 @@ from app.data.models.consumption import Consumo
 from app.data.repositories.house_repository import CasaRepository
 from app.data.repositories.consumption_repository import ConsumoRepository
 from app.domain.eletricity_bill.eletricity_bill_entity import EletricityBill
-from app.presentation.usecases.generate_pdf_usecase import gerar_conta_inquilino
 from app.presentation.views.widgets.header_widget import create_header
 from app.presentation.views.widgets.new_bill_form_widget import NewBillForm
 from app.presentation.views.widgets.history_list_widget import HistoryList
@@ -21,9 +20,7 @@ class ElectricityBillView(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg='#f0f0f0')
         self.controller = controller
-        self.session = controller.get_session()
-        self.casa_repo = CasaRepository(self.session)
-        self.consumo_repo = ConsumoRepository(self.session)
+        self.session_manager = controller.session_manager
 
         # Inicializar variáveis
         self.casas_dict = {}
@@ -91,7 +88,8 @@ class ElectricityBillView(tk.Frame):
     
     def load_casas(self):
         """Carrega casas nos comboboxes"""
-        casas = self.casa_repo.get_all()
+        with self.session_manager.leitura() as session:
+            casas = CasaRepository(session).get_all()
         self.casas_dict = {f"{c.nome} - {c.endereco}": c for c in casas}
         
         # Combo da nova conta
@@ -105,6 +103,16 @@ class ElectricityBillView(tk.Frame):
             # Agora carrega o histórico
             self.load_history()
     
+    def atualizar(self):
+        """Recarrega casas e histórico ao voltar para a tela, mantendo as seleções"""
+        casa, filtro_casa = self.combo_casa.get(), self.filter_casa.get()
+        self.load_casas()
+        if casa in self.casas_dict:
+            self.combo_casa.set(casa)
+        if filtro_casa in self.casas_dict:
+            self.filter_casa.set(filtro_casa)
+            self.load_history()
+    
     def on_casa_selected(self, event):
         """Quando uma casa é selecionada"""
         casa_selecionada = self.combo_casa.get()
@@ -112,7 +120,8 @@ class ElectricityBillView(tk.Frame):
             casa = self.casas_dict[casa_selecionada]
             
             # Preenche leitura anterior com último consumo
-            ultimo = self.consumo_repo.get_ultimo_consumo(casa.id)
+            with self.session_manager.leitura() as session:
+                ultimo = ConsumoRepository(session).get_ultimo_consumo(casa.id)
             if ultimo:
                 self.entry_leitura_anterior.delete(0, 'end')
                 self.entry_leitura_anterior.insert(0, str(ultimo.consumo_mes_atual))
@@ -152,27 +161,32 @@ class ElectricityBillView(tk.Frame):
             
             calc = EletricityBill(leitura_ant, leitura_atual, consumo_geral, valor_total)
             
-            consumo_existente = self.consumo_repo.get_by_casa_e_periodo(casa.id, mes, ano)
+            # A confirmação é pedida antes de abrir a sessão de escrita
+            with self.session_manager.leitura() as session:
+                existe = ConsumoRepository(session).get_by_casa_e_periodo(casa.id, mes, ano) is not None
+            if existe and not messagebox.askyesno("Confirmar", "Já existe um consumo para este período. Deseja atualizar?"):
+                return
             
-            if consumo_existente:
-                if not messagebox.askyesno("Confirmar", "Já existe um consumo para este período. Deseja atualizar?"):
-                    return
-                consumo_existente.consumo_mes_anterior = leitura_ant
-                consumo_existente.consumo_mes_atual = leitura_atual
-                consumo_existente.valor_conta = valor_total
-                consumo_existente.consumo_individual_proporcional = calc.personalcost
-                self.consumo_repo.update(consumo_existente)
-            else:
-                novo_consumo = Consumo(
-                    casa_id=casa.id,
-                    mes=mes,
-                    ano=ano,
-                    consumo_mes_anterior=leitura_ant,
-                    consumo_mes_atual=leitura_atual,
-                    valor_conta=valor_total,
-                    consumo_individual_proporcional=calc.personalcost
-                )
-                self.consumo_repo.create(novo_consumo)
+            with self.session_manager.scope() as session:
+                consumo_repo = ConsumoRepository(session)
+                consumo_existente = consumo_repo.get_by_casa_e_periodo(casa.id, mes, ano)
+                if consumo_existente:
+                    consumo_existente.consumo_mes_anterior = leitura_ant
+                    consumo_existente.consumo_mes_atual = leitura_atual
+                    consumo_existente.valor_conta = valor_total
+                    consumo_existente.consumo_individual_proporcional = calc.personalcost
+                    consumo_repo.update(consumo_existente)
+                else:
+                    novo_consumo = Consumo(
+                        casa_id=casa.id,
+                        mes=mes,
+                        ano=ano,
+                        consumo_mes_anterior=leitura_ant,
+                        consumo_mes_atual=leitura_atual,
+                        valor_conta=valor_total,
+                        consumo_individual_proporcional=calc.personalcost
+                    )
+                    consumo_repo.create(novo_consumo)
             
             messagebox.showinfo("Sucesso", "Consumo salvo com sucesso!")
             self.load_history()
@@ -205,7 +219,8 @@ class ElectricityBillView(tk.Frame):
             calc = EletricityBill(leitura_ant, leitura_atual, consumo_geral, valor_total)
             
             # Histórico
-            historico_consumos = self.consumo_repo.get_consumos_por_casa(casa.id)
+            with self.session_manager.leitura() as session:
+                historico_consumos = ConsumoRepository(session).get_consumos_por_casa(casa.id)
             historico_lista = []
             for h in historico_consumos[-6:]:
                 historico_lista.append({
@@ -236,6 +251,8 @@ class ElectricityBillView(tk.Frame):
                 ],
             }
             
+            # Importado só aqui: o ReportLab deixa a abertura da tela lenta
+            from app.presentation.usecases.generate_pdf_usecase import gerar_conta_inquilino
             arquivo = gerar_conta_inquilino(dados_pdf)
             messagebox.showinfo("Sucesso", f"PDF gerado com sucesso!\n{arquivo}")
         except ValueError as e:
@@ -266,23 +283,12 @@ class ElectricityBillView(tk.Frame):
         # Filtra por casa se selecionada
         filter_value = self.filter_casa.get()
         
-        if filter_value == 'Todas':
-            casas = self.casa_repo.get_all()
-            consumos_todos = []
-            for casa in casas:
-                consumos = self.consumo_repo.get_consumos_por_casa(casa.id)
-                for c in consumos:
-                    c.casa_obj = casa
-                    consumos_todos.append(c)
-            consumos_todos.sort(key=lambda x: (x.ano, x.mes), reverse=True)
-        else:
-            casa = self.casas_dict.get(filter_value)
-            if casa:
-                consumos_todos = self.consumo_repo.get_consumos_por_casa(casa.id)
-                for c in consumos_todos:
-                    c.casa_obj = casa
+        with self.session_manager.leitura() as session:
+            if filter_value == 'Todas':
+                consumos_todos = ConsumoRepository(session).get_historico()
             else:
-                consumos_todos = []
+                casa = self.casas_dict.get(filter_value)
+                consumos_todos = ConsumoRepository(session).get_historico(casa.id) if casa else []
         
         if not consumos_todos:
             tk.Label(
@@ -336,7 +342,7 @@ class ElectricityBillView(tk.Frame):
             tk.Label(content, text=label, bg='white', font=("Arial", 10, "bold"), fg='#666').pack(anchor='w', pady=(10, 2))
             tk.Label(content, text=value, bg='#F5F5F5', font=("Arial", 11), relief='solid', borderwidth=1, anchor='w', padx=10, pady=8).pack(fill='x')
         
-        casa = consumo.casa_obj if hasattr(consumo, 'casa_obj') else consumo.casa
+        casa = consumo.casa
         inquilino = casa.inquilino_atual.nome_completo if casa.inquilino_atual else "Sem inquilino"
         
         add_field("Período:", f"{consumo.mes:02d}/{consumo.ano}")
@@ -366,7 +372,7 @@ class ElectricityBillView(tk.Frame):
     def reprint_pdf(self, consumo):
         """Reimprime PDF de um consumo antigo"""
         try:
-            casa = consumo.casa_obj if hasattr(consumo, 'casa_obj') else consumo.casa
+            casa = consumo.casa
             
             if not casa.inquilino_atual:
                 messagebox.showerror("Erro", "Esta casa não possui inquilino!")
@@ -381,7 +387,8 @@ class ElectricityBillView(tk.Frame):
             )
             
             # Histórico
-            historico_consumos = self.consumo_repo.get_consumos_por_casa(casa.id)
+            with self.session_manager.leitura() as session:
+                historico_consumos = ConsumoRepository(session).get_consumos_por_casa(casa.id)
             historico_lista = []
             for h in historico_consumos[-6:]:
                 historico_lista.append({
@@ -419,6 +426,7 @@ class ElectricityBillView(tk.Frame):
                 "historico_consumo": historico_lista,
             }
             
+            from app.presentation.usecases.generate_pdf_usecase import gerar_conta_inquilino
             arquivo = gerar_conta_inquilino(dados_pdf)
             messagebox.showinfo("Sucesso", f"PDF reimpresso com sucesso!\n{arquivo}")
         except Exception as e:
@@ -428,7 +436,8 @@ class ElectricityBillView(tk.Frame):
         """Exclui um registro de consumo"""
         if messagebox.askyesno("Confirmar Exclusão", "Deseja realmente excluir este registro?\n\nEsta ação não pode ser desfeita."):
             try:
-                self.consumo_repo.delete(consumo_id)
+                with self.session_manager.scope() as session:
+                    ConsumoRepository(session).delete(consumo_id)
                 messagebox.showinfo("Sucesso", "Registro excluído!")
                 self.load_history()
             except Exception as e:
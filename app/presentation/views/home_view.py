@@ -1,5 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from datetime import date
+from app.data.repositories.house_repository import CasaRepository
+from app.data.repositories.monthly_summary_repository import ResumoMensalRepository
+from app.data.repositories.async_repository import AsyncCasaRepository, AsyncResumoMensalRepository
 
 
 class HomeView(tk.Frame):
@@ -9,9 +13,11 @@ class HomeView(tk.Frame):
         super().__init__(parent, bg='#f5f5f5')
         self.controller = controller
         self._cards_cache = []  # Cache de cards para reutilização
+        self._resumo_labels = {}
         
         # Construir interface apenas uma vez
         self._build_interface()
+        self.atualizar()
     
     def _build_interface(self):
         """Constrói a interface de forma otimizada e proporcional"""
@@ -61,6 +67,9 @@ class HomeView(tk.Frame):
         content = tk.Frame(self.scrollable_frame, bg='#f5f5f5')
         content.pack(fill='both', expand=True, padx=40, pady=30)
         
+        # Indicadores do mês atual (lidos do resumo mensal pré-calculado)
+        self._create_summary(content)
+        
         # Criar cards em grid simples
         self._create_cards_grid(content)
         
@@ -88,6 +97,63 @@ class HomeView(tk.Frame):
             fg='#E3F2FD'
         ).pack(pady=(0, 15))
     
+    def _create_summary(self, parent):
+        """Cria a linha de indicadores do mês"""
+        self._lbl_resumo_titulo = tk.Label(
+            parent, text="", font=("Arial", 11, "bold"), bg='#f5f5f5', fg='#333'
+        )
+        self._lbl_resumo_titulo.pack(anchor='w', padx=8, pady=(0, 5))
+        
+        row = tk.Frame(parent, bg='#f5f5f5')
+        row.pack(fill='x', pady=(0, 15))
+        
+        indicadores = [
+            ('receita', '💰', 'Receita do mês', '#4CAF50'),
+            ('ocupacao', '🏘️', 'Ocupação', '#2196F3'),
+            ('contratado', '📝', 'Aluguel contratado', '#FF9800'),
+            ('energia', '⚡', 'Energia faturada', '#FFC107'),
+        ]
+        for chave, icon, title, color in indicadores:
+            card = tk.Frame(row, bg='white', relief='solid', borderwidth=1)
+            card.pack(side='left', padx=8, fill='both', expand=True)
+            tk.Frame(card, bg=color, height=4).pack(fill='x')
+            tk.Label(
+                card, text=f"{icon} {title}", font=("Arial", 9),
+                bg='white', fg='#666'
+            ).pack(anchor='w', padx=12, pady=(8, 0))
+            valor = tk.Label(card, text="-", font=("Arial", 16, "bold"), bg='white', fg='#333')
+            valor.pack(anchor='w', padx=12, pady=(0, 8))
+            self._resumo_labels[chave] = valor
+    
+    def atualizar(self):
+        """Atualiza os indicadores do mês (chamado também ao voltar para a tela inicial)"""
+        hoje = date.today()
+        bridge = getattr(self.controller, 'async_bridge', None)
+        if bridge is None or not bridge.tem_banco:
+            with self.controller.session_manager.leitura() as session:
+                totais = ResumoMensalRepository(session).get_totais_mes(hoje.year, hoje.month)
+                total_casas = CasaRepository(session).count()
+            self._mostrar_resumo(hoje, totais, total_casas)
+            return
+        
+        # Consulta em segundo plano: a janela continua respondendo até os valores chegarem
+        async def carregar():
+            async with bridge.sessao() as session:
+                totais = await AsyncResumoMensalRepository(session).get_totais_mes(hoje.year, hoje.month)
+                return totais, await AsyncCasaRepository(session).count()
+        
+        bridge.executar(carregar(), ao_concluir=lambda r: self._mostrar_resumo(hoje, *r))
+    
+    def _mostrar_resumo(self, hoje, totais, total_casas):
+        """Preenche os cards de indicadores"""
+        self._lbl_resumo_titulo.config(text=f"📅 Resumo de {hoje.month:02d}/{hoje.year}")
+        self._resumo_labels['receita'].config(text=f"R$ {totais['receita_total']:.2f}")
+        self._resumo_labels['ocupacao'].config(text=f"{totais['casas_ocupadas']} de {total_casas} casas")
+        self._resumo_labels['contratado'].config(text=f"R$ {totais['aluguel_contratado']:.2f}")
+        self._resumo_labels['energia'].config(
+            text=f"R$ {totais['energia_valor']:.2f} ({totais['energia_kwh']:.0f} kWh)"
+        )
+    
     def _create_cards_grid(self, parent):
         """Cria grid de cards sem seções"""
         
@@ -33,9 +33,7 @@ class HouseRegisterView(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg='#f0f0f0')
         self.controller = controller
-        self.session = controller.get_session()
-        self.casa_repo = CasaRepository(self.session)
-        self.inquilino_repo = InquilinoRepository(self.session)
+        self.session_manager = controller.session_manager
         
         self.create_widgets()
         self.load_casas()
@@ -61,23 +59,30 @@ class HouseRegisterView(tk.Frame):
     
     def load_casas(self):
         """Carrega casas na lista"""
-        casas = self.casa_repo.get_all()
-        self.house_list.set_items(casas)
+        with self.session_manager.leitura() as session:
+            # A lista mostra o inquilino atual: os objetos são desenhados com a sessão aberta
+            self.house_list.set_items(CasaRepository(session).get_all())
+    
+    def atualizar(self):
+        """Recarrega a lista ao voltar para a tela, mantendo a busca digitada"""
+        if self.search_var.get().strip():
+            self.filter_casas()
+        else:
+            self.load_casas()
     
     def filter_casas(self):
         """Filtra casas pela busca"""
-        search_term = self.search_var.get().lower()
+        search_term = self.search_var.get().strip()
         
         # Limpa frame
         for widget in self.scrollable_frame.winfo_children():
             widget.destroy()
         
-        casas = self.casa_repo.get_all()
-        filtered = [c for c in casas if 
-                   search_term in c.nome.lower() or 
-                   search_term in c.endereco.lower() or
-                   (c.inquilino_atual and search_term in c.inquilino_atual.nome_completo.lower())]
-        
+        with self.session_manager.leitura() as session:
+            self._mostrar_filtradas(CasaRepository(session).buscar(search_term))
+    
+    def _mostrar_filtradas(self, filtered):
+        """Desenha o resultado da busca (chamado com a sessão de leitura aberta)"""
         if not filtered:
             tk.Label(
                 self.scrollable_frame,
@@ -137,7 +142,8 @@ class HouseRegisterView(tk.Frame):
         
         tk.Label(form, text="Inquilino (Opcional):", bg='white', font=("Arial", 10)).pack(anchor='w')
         
-        inquilinos = self.inquilino_repo.get_all()
+        with self.session_manager.leitura() as session:
+            inquilinos = InquilinoRepository(session).get_all()
         inquilinos_dict = {f"{i.nome_completo} (CPF: {i.cpf})": i.id for i in inquilinos}
         
         combo_inquilino = ttk.Combobox(form, font=("Arial", 11), width=43, state='readonly')
@@ -170,7 +176,8 @@ class HouseRegisterView(tk.Frame):
                     inquilino_id=inquilino_id, 
                     numero_quartos=numero_quartos
                 )
-                self.casa_repo.create(nova_casa)
+                with self.session_manager.scope() as session:
+                    CasaRepository(session).create(nova_casa)
                 messagebox.showinfo("Sucesso", "Casa cadastrada com sucesso!")
                 dialog.destroy()
                 self.load_casas()
@@ -247,7 +254,8 @@ class HouseRegisterView(tk.Frame):
         
         tk.Label(form, text="Inquilino:", bg='white', font=("Arial", 10)).pack(anchor='w')
         
-        inquilinos = self.inquilino_repo.get_all()
+        with self.session_manager.leitura() as session:
+            inquilinos = InquilinoRepository(session).get_all()
         inquilinos_dict = {f"{i.nome_completo} (CPF: {i.cpf})": i.id for i in inquilinos}
         
         combo_inquilino = ttk.Combobox(form, font=("Arial", 11), width=43, state='readonly')
@@ -286,7 +294,8 @@ class HouseRegisterView(tk.Frame):
                 casa.endereco = endereco
                 casa.inquilino_id = inquilino_id
                 casa.numero_quartos = numero_quartos
-                self.casa_repo.update(casa)
+                with self.session_manager.scope() as session:
+                    CasaRepository(session).update(casa)
                 messagebox.showinfo("Sucesso", "Casa atualizada com sucesso!")
                 dialog.destroy()
                 self.load_casas()
@@ -323,7 +332,8 @@ class HouseRegisterView(tk.Frame):
         """Exclui uma casa"""
         if messagebox.askyesno("Confirmar Exclusão", "Deseja realmente excluir esta casa?\n\nEsta ação não pode ser desfeita."):
             try:
-                self.casa_repo.delete(casa_id)
+                with self.session_manager.scope() as session:
+                    CasaRepository(session).delete(casa_id)
                 messagebox.showinfo("Sucesso", "Casa excluída com sucesso!")
                 self.load_casas()
             except Exception as e:
@@ -0,0 +1,108 @@
+import tkinter as tk
+from tkinter import ttk
+from datetime import date
+
+
+class PortfolioReportWindow(tk.Toplevel):
+    """Relatório do mês somando todas as carteiras (leitura em segundo plano)"""
+
+    COLUNAS = [
+        ('carteira', 'Carteira', 180),
+        ('ocupacao', 'Ocupação', 110),
+        ('receita', 'Receita', 120),
+        ('contratado', 'Aluguel Contratado', 140),
+        ('energia', 'Energia', 120),
+        ('recibos', 'Recibos', 80),
+    ]
+
+    def __init__(self, parent, router, bridge):
+        super().__init__(parent, bg='#f0f0f0')
+        self.router = router
+        self.bridge = bridge
+        self.title("Relatório Consolidado das Carteiras")
+        self.geometry("820x420")
+        self.transient(parent)
+
+        hoje = date.today()
+        top = tk.Frame(self, bg='#f0f0f0')
+        top.pack(fill='x', padx=15, pady=(15, 5))
+
+        tk.Label(top, text="Mês:", bg='#f0f0f0', font=("Arial", 10)).pack(side='left')
+        self.mes_var = tk.StringVar(value=str(hoje.month))
+        ttk.Spinbox(top, from_=1, to=12, width=4, textvariable=self.mes_var).pack(side='left', padx=5)
+        tk.Label(top, text="Ano:", bg='#f0f0f0', font=("Arial", 10)).pack(side='left', padx=(10, 0))
+        self.ano_var = tk.StringVar(value=str(hoje.year))
+        ttk.Spinbox(top, from_=2000, to=2100, width=6, textvariable=self.ano_var).pack(side='left', padx=5)
+        tk.Button(
+            top, text="🔄 Atualizar", command=self.carregar,
+            bg='#2196F3', fg='white', font=("Arial", 9, "bold"), relief='flat', cursor='hand2', padx=10
+        ).pack(side='left', padx=10)
+        self.lbl_status = tk.Label(top, text="", bg='#f0f0f0', fg='#666', font=("Arial", 9))
+        self.lbl_status.pack(side='left')
+
+        list_container = tk.Frame(self, bg='white', relief='solid', borderwidth=1)
+        list_container.pack(fill='both', expand=True, padx=15, pady=(5, 15))
+
+        self.tree = ttk.Treeview(list_container, columns=[c[0] for c in self.COLUNAS], show='headings')
+        for chave, titulo, largura in self.COLUNAS:
+            self.tree.heading(chave, text=titulo)
+            self.tree.column(chave, width=largura, anchor='w' if chave == 'carteira' else 'e')
+        self.tree.tag_configure('total', font=("Arial", 10, "bold"))
+        self.tree.tag_configure('erro', foreground='#C62828')
+
+        scrollbar = ttk.Scrollbar(list_container, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+
+        self.carregar()
+
+    def carregar(self):
+        """Lê os bancos das carteiras em uma thread e preenche a tabela ao terminar"""
+        try:
+            ano, mes = int(self.ano_var.get()), int(self.mes_var.get())
+        except ValueError:
+            self.lbl_status.config(text="Mês/ano inválido")
+            return
+        self.lbl_status.config(text="Carregando...")
+        self.bridge.executar_em_thread(
+            self.router.relatorio_consolidado, ano, mes,
+            ao_concluir=self._mostrar,
+            ao_falhar=lambda e: self.lbl_status.config(text=f"Erro: {e}")
+        )
+
+    def _mostrar(self, linhas):
+        if not self.winfo_exists():
+            return
+        self.tree.delete(*self.tree.get_children())
+        total = {'casas': 0, 'ocupadas': 0, 'receita': 0.0, 'contratado': 0.0, 'energia': 0.0, 'recibos': 0}
+
+        for linha in linhas:
+            if 'erro' in linha:
+                self.tree.insert('', 'end', values=(linha['carteira'], 'não foi possível ler', '', '', '', ''),
+                                 tags=('erro',))
+                continue
+            total['casas'] += linha['total_casas']
+            total['ocupadas'] += linha['casas_ocupadas']
+            total['receita'] += linha['receita_total']
+            total['contratado'] += linha['aluguel_contratado']
+            total['energia'] += linha['energia_valor']
+            total['recibos'] += linha['quantidade_recibos']
+            self.tree.insert('', 'end', values=(
+                linha['carteira'],
+                f"{linha['casas_ocupadas']} de {linha['total_casas']}",
+                f"R$ {linha['receita_total']:.2f}",
+                f"R$ {linha['aluguel_contratado']:.2f}",
+                f"R$ {linha['energia_valor']:.2f}",
+                linha['quantidade_recibos'],
+            ))
+
+        self.tree.insert('', 'end', values=(
+            "TOTAL",
+            f"{total['ocupadas']} de {total['casas']}",
+            f"R$ {total['receita']:.2f}",
+            f"R$ {total['contratado']:.2f}",
+            f"R$ {total['energia']:.2f}",
+            total['recibos'],
+        ), tags=('total',))
+        self.lbl_status.config(text=f"{len(linhas)} carteira(s)")
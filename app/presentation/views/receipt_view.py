@@ -8,13 +8,21 @@ from app.data.models.receipt import Recibo
 from app.data.repositories.receipt_repository import ReciboRepository
 from app.data.repositories.house_repository import CasaRepository
 from app.data.repositories.tenant_repository import InquilinoRepository
-from app.presentation.usecases.generate_receipt_pdf_usecase import gerar_recibo_pagamento
 from app.presentation.views.widgets.header_widget import create_header
 from app.presentation.views.widgets.new_receipt_form_widget import NewReceiptForm
 from app.presentation.views.widgets.receipt_list_widget import ReceiptListWidget
 
 load_dotenv()
 
+TAMANHO_PAGINA = 50
+
+TIPOS_RECIBO = {
+    'Aluguel': 'aluguel',
+    'Conta de Energia': 'energia',
+    'Serviço Prestado': 'servico',
+    'Outros': 'outros'
+}
+
 
 class ReceiptView(tk.Frame):
     """Tela de gerenciamento de recibos de pagamento"""
@@ -22,15 +30,19 @@ class ReceiptView(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent, bg='#f0f0f0')
         self.controller = controller
-        self.session = controller.get_session()
-        self.recibo_repo = ReciboRepository(self.session)
-        self.casa_repo = CasaRepository(self.session)
-        self.inquilino_repo = InquilinoRepository(self.session)
+        self.session_manager = controller.session_manager
 
         # Dicionários para mapear seleções
         self.casas_dict = {}
         self.inquilinos_dict = {}
 
+        # Estado da paginação da lista
+        self._filtros_lista = {}
+        self._cursor_lista = None
+
+        # Número do último PDF gerado pelo formulário: (campos do formulário, número)
+        self._numero_impresso = None
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -103,7 +115,8 @@ class ReceiptView(tk.Frame):
             on_add=lambda: self.notebook.select(0),
             on_view=self.view_recibo_detail,
             on_reprint=self.reprint_pdf,
-            on_delete=self.delete_recibo
+            on_delete=self.delete_recibo,
+            on_load_more=self.load_more_recibos
         )
 
         # Expõe os filtros
@@ -116,7 +129,8 @@ class ReceiptView(tk.Frame):
 
     def load_casas(self):
         """Carrega casas nos comboboxes"""
-        casas = self.casa_repo.get_all()
+        with self.session_manager.leitura() as session:
+            casas = CasaRepository(session).get_all()
         self.casas_dict = {f"{c.nome} - {c.endereco}": c for c in casas}
 
         if hasattr(self, 'combo_casa'):
@@ -125,43 +139,60 @@ class ReceiptView(tk.Frame):
 
     def load_inquilinos(self):
         """Carrega inquilinos no combobox"""
-        inquilinos = self.inquilino_repo.get_all()
+        with self.session_manager.leitura() as session:
+            inquilinos = InquilinoRepository(session).get_all()
         self.inquilinos_dict = {f"{i.nome_completo} (CPF: {i.cpf})": i for i in inquilinos}
 
         if hasattr(self, 'combo_inquilino'):
             self.combo_inquilino['values'] = ['Nenhum'] + list(self.inquilinos_dict.keys())
             self.combo_inquilino.set('Nenhum')
 
+    def atualizar(self):
+        """Recarrega combos e lista ao voltar para a tela, mantendo as seleções"""
+        casa, inquilino = self.combo_casa.get(), self.combo_inquilino.get()
+        self.load_casas()
+        self.load_inquilinos()
+        if casa in self.casas_dict:
+            self.combo_casa.set(casa)
+        if inquilino in self.inquilinos_dict:
+            self.combo_inquilino.set(inquilino)
+        self.load_recibos()
+
     def load_recibos(self):
-        """Carrega todos os recibos na lista"""
-        recibos = self.recibo_repo.get_all()
+        """Carrega a primeira página de recibos na lista"""
+        self._cursor_lista = None
+        with self.session_manager.leitura() as session:
+            repo = ReciboRepository(session)
+            recibos = self._buscar_pagina_recibos(repo)
+            total = repo.contar(**self._filtros_lista)
         if hasattr(self, 'receipt_list'):
-            self.receipt_list.set_items(recibos)
+            self.receipt_list.set_items(recibos, has_more=self._cursor_lista is not None)
+            self.receipt_list.set_total(total)
+
+    def load_more_recibos(self):
+        """Acrescenta a próxima página de recibos (chamado ao rolar a lista)"""
+        if self._cursor_lista is None:
+            return
+        with self.session_manager.leitura() as session:
+            recibos = self._buscar_pagina_recibos(ReciboRepository(session))
+        self.receipt_list.append_items(recibos, has_more=self._cursor_lista is not None)
+
+    def _buscar_pagina_recibos(self, repo):
+        recibos, self._cursor_lista = repo.get_pagina(
+            limit=TAMANHO_PAGINA, after=self._cursor_lista, **self._filtros_lista
+        )
+        return recibos
 
     def filter_recibos(self):
         """Filtra recibos com base nos critérios selecionados"""
         tipo_filter = self.filter_tipo.get()
-        search_term = self.search_var.get().lower()
-
-        # Busca base
-        recibos = self.recibo_repo.get_all()
-
-        # Filtro por tipo
-        if tipo_filter != 'Todos':
-            tipo_map = {
-                'Aluguel': 'aluguel',
-                'Conta de Energia': 'energia',
-                'Serviço Prestado': 'servico',
-                'Outros': 'outros'
-            }
-            tipo_busca = tipo_map.get(tipo_filter, tipo_filter.lower())
-            recibos = [r for r in recibos if r.tipo_recibo == tipo_busca]
-
-        # Filtro por pagador (busca)
-        if search_term:
-            recibos = [r for r in recibos if search_term in r.nome_pagador.lower()]
+        search_term = self.search_var.get().strip()
 
-        self.receipt_list.set_items(recibos)
+        self._filtros_lista = {
+            'tipo_recibo': TIPOS_RECIBO.get(tipo_filter, tipo_filter.lower()) if tipo_filter != 'Todos' else None,
+            'termo': search_term or None,
+        }
+        self.load_recibos()
 
     def on_inquilino_selected(self, event=None):
         """Auto-preenche dados ao selecionar inquilino"""
@@ -181,13 +212,7 @@ class ReceiptView(tk.Frame):
         """Salva o recibo no banco de dados"""
         try:
             # Coleta dados
-            tipo_map = {
-                'Aluguel': 'aluguel',
-                'Conta de Energia': 'energia',
-                'Serviço Prestado': 'servico',
-                'Outros': 'outros'
-            }
-            tipo_recibo = tipo_map.get(self.combo_tipo.get(), 'outros')
+            tipo_recibo = TIPOS_RECIBO.get(self.combo_tipo.get(), 'outros')
 
             casa_selecionada = self.combo_casa.get()
             casa_id = self.casas_dict[casa_selecionada].id if casa_selecionada != 'Nenhuma' else None
@@ -254,9 +279,12 @@ class ReceiptView(tk.Frame):
                 observacoes=observacoes
             )
 
-            self.recibo_repo.create(novo_recibo)
+            with self.session_manager.scope() as session:
+                recibo_repo = ReciboRepository(session)
+                novo_recibo.numero = self._numero_para_salvar(recibo_repo, data_pagamento)
+                recibo_repo.create(novo_recibo)
 
-            messagebox.showinfo("Sucesso", "Recibo salvo com sucesso!")
+            messagebox.showinfo("Sucesso", f"Recibo nº {novo_recibo.numero} salvo com sucesso!")
             self.clear_form()
             self.load_recibos()
 
@@ -290,10 +318,6 @@ class ReceiptView(tk.Frame):
                 messagebox.showerror("Erro", "Preencha todos os campos obrigatórios!")
                 return
 
-            # Gera número do recibo (pode ser melhorado)
-            ultimo_recibo = self.recibo_repo.get_all()
-            numero_recibo = len(ultimo_recibo) + 1
-
             # Cria um objeto Recibo temporário para usar o método valor_extenso
             recibo_temp = Recibo(
                 tipo_recibo='temp',
@@ -307,7 +331,6 @@ class ReceiptView(tk.Frame):
 
             # Prepara dados para o PDF
             dados_pdf = {
-                "numero_recibo": f"{numero_recibo:06d}",
                 "valor": valor,
                 "valor_extenso": recibo_temp.valor_extenso,
                 "nome_pagador": nome_pagador,
@@ -321,6 +344,20 @@ class ReceiptView(tk.Frame):
                 "observacoes": observacoes
             }
 
+            # O número é reservado e confirmado antes de gerar o PDF, para a conexão
+            # de escrita não ficar presa durante o ReportLab e a gravação do arquivo.
+            # Ele fica com este formulário: uma nova tentativa ou "Salvar" usa o mesmo
+            campos = self._campos_formulario()
+            if self._numero_impresso and self._numero_impresso[0] == campos:
+                numero = self._numero_impresso[1]
+            else:
+                with self.session_manager.scope() as session:
+                    numero = ReciboRepository(session).reservar_numero(self._ano_numeracao(data_pagamento))
+                self._numero_impresso = (campos, numero)
+            dados_pdf["numero_recibo"] = numero
+
+            # Importado só aqui: o ReportLab deixa a abertura da tela lenta
+            from app.presentation.usecases.generate_receipt_pdf_usecase import gerar_recibo_pagamento
             arquivo = gerar_recibo_pagamento(dados_pdf)
             messagebox.showinfo("Sucesso", f"Recibo PDF gerado com sucesso!\n{arquivo}")
 
@@ -329,8 +366,32 @@ class ReceiptView(tk.Frame):
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao gerar PDF: {str(e)}")
 
+    def _ano_numeracao(self, data_pagamento):
+        """Numeração global ou reiniciada a cada ano, conforme RECIBO_NUMERACAO no .env"""
+        anual = os.getenv("RECIBO_NUMERACAO", "global").strip().lower() == "anual"
+        return data_pagamento.year if anual else None
+
+    def _campos_formulario(self):
+        """Conteúdo dos campos impressos no recibo, para reconhecer o mesmo formulário"""
+        return (
+            self.entry_nome_pagador.get().strip(), self.entry_cpf_pagador.get().strip(),
+            self.entry_nome_recebedor.get().strip(), self.entry_cpf_recebedor.get().strip(),
+            self.entry_valor.get().strip(), self.entry_referente.get().strip(),
+            self.text_descricao.get("1.0", tk.END).strip(), self.date_pagamento.get(),
+            self.combo_forma_pag.get(), self.text_observacoes.get("1.0", tk.END).strip(),
+        )
+
+    def _numero_para_salvar(self, recibo_repo, data_pagamento):
+        """Número já reservado para estes dados (ao gerar o PDF) ou, se não houver, um número novo"""
+        if self._numero_impresso and self._numero_impresso[0] == self._campos_formulario():
+            numero = self._numero_impresso[1]
+            self._numero_impresso = None
+            return numero
+        return recibo_repo.reservar_numero(self._ano_numeracao(data_pagamento))
+
     def clear_form(self):
         """Limpa o formulário"""
+        self._numero_impresso = None
         self.combo_tipo.set('Aluguel')
         self.combo_casa.set('Nenhuma')
         self.combo_inquilino.set('Nenhum')
@@ -385,7 +446,7 @@ class ReceiptView(tk.Frame):
             tk.Label(content, text=value, bg='#F5F5F5', font=("Arial", 11), relief='solid', borderwidth=1, anchor='w', padx=10, pady=8).pack(fill='x')
 
         # Informações do recibo
-        add_field("Número do Recibo:", f"#{recibo.id}")
+        add_field("Número do Recibo:", recibo.numero or f"{recibo.id:06d}")
         add_field("Tipo:", recibo.tipo_recibo.title())
         add_field("Valor:", f"R$ {recibo.valor:.2f}")
         add_field("Pagador:", recibo.nome_pagador)
@@ -419,10 +480,16 @@ class ReceiptView(tk.Frame):
         ).pack(pady=20)
 
     def reprint_pdf(self, recibo):
-        """Reimprime PDF de um recibo existente"""
+        """Reimprime PDF de um recibo existente, com o número gravado nele"""
         try:
+            if not recibo.numero:
+                # Recibo salvo sem número (não deveria ocorrer após a migração 7)
+                with self.session_manager.scope() as session:
+                    recibo_repo = ReciboRepository(session)
+                    recibo.numero = recibo_repo.reservar_numero(self._ano_numeracao(recibo.data_pagamento))
+                    recibo_repo.update(recibo)
             dados_pdf = {
-                "numero_recibo": f"{recibo.id:06d}",
+                "numero_recibo": recibo.numero,
                 "valor": recibo.valor,
                 "valor_extenso": recibo.valor_extenso,
                 "nome_pagador": recibo.nome_pagador,
@@ -436,6 +503,7 @@ class ReceiptView(tk.Frame):
                 "observacoes": recibo.observacoes
             }
 
+            from app.presentation.usecases.generate_receipt_pdf_usecase import gerar_recibo_pagamento
             arquivo = gerar_recibo_pagamento(dados_pdf)
             messagebox.showinfo("Sucesso", f"Recibo PDF reimpresso com sucesso!\n{arquivo}")
 
@@ -447,7 +515,8 @@ class ReceiptView(tk.Frame):
         if messagebox.askyesno("Confirmar Exclusão",
             "Deseja realmente excluir este recibo?\n\nEsta ação não pode ser desfeita."):
             try:
-                self.recibo_repo.delete(recibo_id)
+                with self.session_manager.scope() as session:
+                    ReciboRepository(session).delete(recibo_id)
                 messagebox.showinfo("Sucesso", "Recibo excluído!")
                 self.load_recibos()
             except Exception as e:
@@ -6,14 +6,19 @@ from app.data.repositories.tenant_repository import InquilinoRepository
 from app.presentation.views.widgets.header_widget import create_header
 from app.presentation.views.widgets.tenant_list_widget import TenantListWidget
 
+TAMANHO_PAGINA = 50
+
 class TenantRegisterView(tk.Frame):
     """Tela de registro e gerenciamento de inquilinos"""
     
     def __init__(self, parent, controller):
         super().__init__(parent, bg='#f0f0f0')
         self.controller = controller
-        self.session = controller.get_session()
-        self.inquilino_repo = InquilinoRepository(self.session)
+        self.session_manager = controller.session_manager
+        
+        # Estado da paginação da lista
+        self._termo_busca = None
+        self._cursor_lista = None
         
         self.create_widgets()
         self.load_inquilinos()
@@ -22,7 +27,7 @@ class TenantRegisterView(tk.Frame):
         # Header
         create_header(self, self.controller, title="Gerenciamento de Inquilinos")
         # Tenant list widget
-        self.tenant_list = TenantListWidget(self, on_add=self.open_add_dialog, on_view=self.open_view_dialog, on_edit=self.open_edit_dialog, on_delete=self.delete_inquilino)
+        self.tenant_list = TenantListWidget(self, on_add=self.open_add_dialog, on_view=self.open_view_dialog, on_edit=self.open_edit_dialog, on_delete=self.delete_inquilino, on_load_more=self.load_more_inquilinos)
         # expose search var used by filter and bind change to filter handler
         self.search_var = self.tenant_list.search_var
         self.search_var.trace('w', lambda *args: self.filter_inquilinos())
@@ -33,21 +38,38 @@ class TenantRegisterView(tk.Frame):
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
     
     def load_inquilinos(self):
-        """Carrega inquilinos na lista"""
-        inquilinos = self.inquilino_repo.get_all()
-        self.tenant_list.set_items(inquilinos)
+        """Carrega a primeira página de inquilinos na lista"""
+        self._cursor_lista = None
+        with self.session_manager.leitura() as session:
+            repo = InquilinoRepository(session)
+            inquilinos = self._buscar_pagina_inquilinos(repo)
+            self.tenant_list.set_items(inquilinos, has_more=self._cursor_lista is not None)
+            self.tenant_list.set_total(repo.contar(self._termo_busca))
+    
+    def atualizar(self):
+        """Recarrega a lista ao voltar para a tela, mantendo a busca digitada"""
+        self.load_inquilinos()
+    
+    def load_more_inquilinos(self):
+        """Acrescenta a próxima página de inquilinos (chamado ao rolar a lista)"""
+        if self._cursor_lista is None:
+            return
+        with self.session_manager.leitura() as session:
+            inquilinos = self._buscar_pagina_inquilinos(InquilinoRepository(session))
+            self.tenant_list.append_items(inquilinos, has_more=self._cursor_lista is not None)
+    
+    def _buscar_pagina_inquilinos(self, repo):
+        inquilinos, self._cursor_lista = repo.get_pagina(
+            termo=self._termo_busca, limit=TAMANHO_PAGINA, after=self._cursor_lista
+        )
+        return inquilinos
     
     # item rendering delegated to TenantListWidget
     
     def filter_inquilinos(self):
         """Filtra inquilinos pela busca"""
-        search_term = self.search_var.get().lower()
-        inquilinos = self.inquilino_repo.get_all()
-        filtered = [i for i in inquilinos if 
-                   search_term in i.nome_completo.lower() or 
-                   search_term in i.cpf or
-                   search_term in i.telefone]
-        self.tenant_list.set_items(filtered)
+        self._termo_busca = self.search_var.get().strip() or None
+        self.load_inquilinos()
     
     def open_view_dialog(self, inquilino):
         """Abre diálogo de visualização"""
@@ -174,7 +196,8 @@ class TenantRegisterView(tk.Frame):
                     telefone=telefone,
                     nome_fiador=fiador if fiador else None
                 )
-                self.inquilino_repo.create(novo)
+                with self.session_manager.scope() as session:
+                    InquilinoRepository(session).create(novo)
                 messagebox.showinfo("Sucesso", "Inquilino cadastrado!")
                 dialog.destroy()
                 self.load_inquilinos()
@@ -265,7 +288,8 @@ class TenantRegisterView(tk.Frame):
                 inquilino.data_nascimento = data_nasc
                 inquilino.telefone = telefone
                 inquilino.nome_fiador = fiador if fiador else None
-                self.inquilino_repo.update(inquilino)
+                with self.session_manager.scope() as session:
+                    InquilinoRepository(session).update(inquilino)
                 messagebox.showinfo("Sucesso", "Inquilino atualizado!")
                 dialog.destroy()
                 self.load_inquilinos()
@@ -279,7 +303,8 @@ class TenantRegisterView(tk.Frame):
         """Exclui um inquilino"""
         if messagebox.askyesno("Confirmar Exclusão", "Deseja realmente excluir este inquilino?\n\nEsta ação não pode ser desfeita."):
             try:
-                self.inquilino_repo.delete(inquilino_id)
+                with self.session_manager.scope() as session:
+                    InquilinoRepository(session).delete(inquilino_id)
                 messagebox.showinfo("Sucesso", "Inquilino excluído!")
                 self.load_inquilinos()
             except Exception as e:
@@ -10,4 +10,5 @@ __all__ = [
     "contract_list_widget",
     "new_receipt_form_widget",
     "receipt_list_widget",
+    "paginated_list_widget",
 ]
\ No newline at end of file
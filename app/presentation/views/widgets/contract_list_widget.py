@@ -1,11 +1,12 @@
 import tkinter as tk
 from tkinter import ttk
+from app.presentation.views.widgets.paginated_list_widget import PaginatedListMixin
 
 
-class ContractListWidget:
+class ContractListWidget(PaginatedListMixin):
     """Widget que encapsula a lista de contratos com busca e filtros."""
 
-    def __init__(self, parent, on_add=None, on_view=None, on_edit=None, on_end=None, on_generate_pdf=None):
+    def __init__(self, parent, on_add=None, on_view=None, on_edit=None, on_end=None, on_generate_pdf=None, on_load_more=None):
         container = tk.Frame(parent, bg='#f0f0f0')
         container.pack(fill='both', expand=True, padx=20, pady=20)
 
@@ -27,6 +28,8 @@ class ContractListWidget:
         )
         self.btn_add.pack(side='left')
 
+        self.lbl_total = self.create_total_label(top_frame)
+
         # Frame de filtros
         filter_frame = tk.Frame(container, bg='white', relief='solid', borderwidth=1)
         filter_frame.pack(fill='x', pady=(0, 15))
@@ -71,7 +74,7 @@ class ContractListWidget:
         )
 
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self._init_pagination(scrollbar, on_load_more, self.lbl_total)
 
         self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -88,10 +91,12 @@ class ContractListWidget:
         for w in self.scrollable_frame.winfo_children():
             w.destroy()
 
-    def set_items(self, contratos):
+    def set_items(self, contratos, has_more=False):
         """Popula a lista visual com os objetos contrato."""
         self._items = contratos
         self.clear_list()
+        self.set_has_more(has_more)
+        self.canvas.yview_moveto(0)
 
         if not contratos:
             tk.Label(
@@ -83,14 +83,12 @@ class HistoryList:
         periodo = f"{consumo.mes:02d}/{consumo.ano}"
         tk.Label(item_frame, text=periodo, bg=bg_color, font=("Arial", 10, "bold"), width=12, anchor='center').pack(side='left', padx=5, pady=10)
 
-        casa_nome = consumo.casa_obj.nome if hasattr(consumo, 'casa_obj') else consumo.casa.nome
-        tk.Label(item_frame, text=casa_nome, bg=bg_color, font=("Arial", 10), width=20, anchor='w').pack(side='left', padx=5)
+        casa = consumo.casa
+        tk.Label(item_frame, text=casa.nome, bg=bg_color, font=("Arial", 10), width=20, anchor='w').pack(side='left', padx=5)
 
         inquilino_nome = "-"
-        if hasattr(consumo, 'casa_obj') and consumo.casa_obj.inquilino_atual:
-            inquilino_nome = consumo.casa_obj.inquilino_atual.nome_completo[:20]
-        elif consumo.casa.inquilino_atual:
-            inquilino_nome = consumo.casa.inquilino_atual.nome_completo[:20]
+        if casa.inquilino_atual:
+            inquilino_nome = casa.inquilino_atual.nome_completo[:20]
         tk.Label(item_frame, text=inquilino_nome, bg=bg_color, font=("Arial", 10), width=20, anchor='w').pack(side='left', padx=5)
 
         consumo_valor = consumo.consumo_diferenca
@@ -0,0 +1,56 @@
+import tkinter as tk
+
+
+class PaginatedListMixin:
+    """Mixin para listas em canvas que buscam a próxima página ao rolar até o fim.
+
+    A classe que usa o mixin deve ter ``self.canvas``, ``self.scrollable_frame``
+    e chamar ``_init_pagination`` depois de criar a barra de rolagem.
+    """
+
+    SCROLL_THRESHOLD = 0.9
+
+    def _init_pagination(self, scrollbar, on_load_more=None, total_label=None):
+        self._scrollbar = scrollbar
+        self._on_load_more = on_load_more
+        self._lbl_total = total_label
+        self._has_more = False
+        self._loading = False
+        self.canvas.configure(yscrollcommand=self._on_canvas_scroll)
+
+    def _on_canvas_scroll(self, first, last):
+        self._scrollbar.set(first, last)
+        if self._has_more and not self._loading and float(last) >= self.SCROLL_THRESHOLD:
+            # Agenda para depois do redesenho, evitando recursão dentro do yscrollcommand
+            self._loading = True
+            self.canvas.after_idle(self._load_more)
+
+    def _load_more(self):
+        try:
+            if self._has_more and self._on_load_more:
+                self._on_load_more()
+        finally:
+            self._loading = False
+
+    def set_has_more(self, has_more):
+        """Indica se ainda existem páginas a buscar."""
+        self._has_more = bool(has_more and self._on_load_more)
+
+    def set_total(self, total):
+        """Mostra o total de registros que atendem ao filtro atual."""
+        if self._lbl_total is not None:
+            self._lbl_total.config(text=f"{total} registro{'s' if total != 1 else ''}")
+
+    def append_items(self, items, has_more=False):
+        """Adiciona uma nova página ao fim da lista."""
+        start = len(self._items)
+        self._items = list(self._items) + list(items)
+        for i, item in enumerate(items, start=start):
+            self._create_item(item, i)
+        self.set_has_more(has_more)
+
+    @staticmethod
+    def create_total_label(parent, bg='#f0f0f0'):
+        label = tk.Label(parent, text="", bg=bg, fg='#666', font=("Arial", 10))
+        label.pack(side='right', padx=10)
+        return label
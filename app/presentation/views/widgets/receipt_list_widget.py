@@ -1,11 +1,12 @@
 import tkinter as tk
 from tkinter import ttk
+from app.presentation.views.widgets.paginated_list_widget import PaginatedListMixin
 
 
-class ReceiptListWidget:
+class ReceiptListWidget(PaginatedListMixin):
     """Widget que encapsula a lista de recibos com busca e filtros."""
 
-    def __init__(self, parent, on_add=None, on_view=None, on_reprint=None, on_delete=None):
+    def __init__(self, parent, on_add=None, on_view=None, on_reprint=None, on_delete=None, on_load_more=None):
         container = tk.Frame(parent, bg='#f0f0f0')
         container.pack(fill='both', expand=True, padx=20, pady=20)
 
@@ -27,6 +28,8 @@ class ReceiptListWidget:
         )
         self.btn_add.pack(side='left')
 
+        self.lbl_total = self.create_total_label(top_frame)
+
         # Frame de filtros
         filter_frame = tk.Frame(container, bg='white', relief='solid', borderwidth=1)
         filter_frame.pack(fill='x', pady=(0, 15))
@@ -66,7 +69,7 @@ class ReceiptListWidget:
         )
 
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self._init_pagination(scrollbar, on_load_more, self.lbl_total)
 
         self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -82,10 +85,12 @@ class ReceiptListWidget:
         for w in self.scrollable_frame.winfo_children():
             w.destroy()
 
-    def set_items(self, recibos):
+    def set_items(self, recibos, has_more=False):
         """Popula a lista visual com os objetos recibo."""
         self._items = recibos
         self.clear_list()
+        self.set_has_more(has_more)
+        self.canvas.yview_moveto(0)
 
         if not recibos:
             tk.Label(
@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from app.presentation.views.widgets.paginated_list_widget import PaginatedListMixin
 
-class TenantListWidget:
+class TenantListWidget(PaginatedListMixin):
     """Widget que encapsula a lista de inquilinos com busca e ações."""
 
-    def __init__(self, parent, on_add=None, on_view=None, on_edit=None, on_delete=None):
+    def __init__(self, parent, on_add=None, on_view=None, on_edit=None, on_delete=None, on_load_more=None):
         container = tk.Frame(parent, bg='#f0f0f0')
         container.pack(fill='both', expand=True, padx=20, pady=20)
 
@@ -26,6 +27,8 @@ class TenantListWidget:
         )
         self.btn_add.pack(side='left')
 
+        self.lbl_total = self.create_total_label(top_frame)
+
         # Barra de busca
         search_frame = tk.Frame(container, bg='white', relief='solid', borderwidth=1)
         search_frame.pack(fill='x', pady=(0, 15))
@@ -49,7 +52,7 @@ class TenantListWidget:
         )
 
         self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self._init_pagination(scrollbar, on_load_more, self.lbl_total)
 
         self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -73,10 +76,12 @@ class TenantListWidget:
         for w in self.scrollable_frame.winfo_children():
             w.destroy()
 
-    def set_items(self, inquilinos):
+    def set_items(self, inquilinos, has_more=False):
         """Popula a lista visual com os objetos inquilino."""
         self._items = inquilinos
         self.clear_list()
+        self.set_has_more(has_more)
+        self.canvas.yview_moveto(0)
 
         if not inquilinos:
             tk.Label(
@@ -0,0 +1,659 @@
+"""
+Benchmark dos métodos públicos dos repositórios.
+
+Para cada escala (1x, 10x e 100x de CASAS_POR_ESCALA casas, ver
+``synthetic_portfolio``) um banco SQLite é gerado e cada método público de
+CasaRepository, InquilinoRepository, ConsumoRepository, ContratoRepository e
+ReciboRepository é medido: a mediana de várias execuções, cada uma com uma
+sessão nova (o cache de consultas da sessão não mascara o acesso ao banco).
+Métodos que gravam rodam dentro de ``unit_of_work`` (flush sem commit) e a
+transação é desfeita ao final, então todos os métodos veem o mesmo banco.
+
+Os tempos são comparados com a linha de base em baselines.json; um método
+mais lento que a base por mais de ``--limite`` (fração) e por mais de
+PISO_MS é uma regressão e o comando termina com código 1. A linha de base
+depende da máquina: grave a sua com ``--salvar-baseline`` antes de comparar.
+
+    python -m benchmarks.benchmark_repositories
+    python -m benchmarks.benchmark_repositories --escalas 1 10 --salvar-baseline
+    python -m benchmarks.benchmark_repositories --filtro Recibo --limite 0.5
+"""
+import argparse
+import inspect
+import json
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import date
+from pathlib import Path
+from statistics import median
+from dateutil.relativedelta import relativedelta
+import sqlalchemy
+from app.data.database.base import DatabaseConfig
+from app.data.database.unit_of_work import unit_of_work
+from app.data.models import Casa, Inquilino, Contrato, Consumo, Recibo
+from app.data.repositories import (
+    BaseRepository, CasaRepository, InquilinoRepository, ConsumoRepository,
+    ContratoRepository, ReciboRepository
+)
+from benchmarks.synthetic_portfolio import gerar_carteira, _cpf
+
+ESCALAS = (1, 10, 100)
+CASAS_POR_ESCALA = 25
+ANOS = 3
+SEMENTE = 42
+
+REPETICOES_PADRAO = 7
+LIMITE_PADRAO = 0.25
+
+# Diferenças menores que isso são ruído, mesmo acima do limite percentual
+PISO_MS = 0.5
+
+# Tempo máximo gasto medindo um método (a mediana usa as execuções feitas até aí)
+TEMPO_MAXIMO_S = 5.0
+
+# Registros criados/alterados pelos métodos em lote
+TAMANHO_LOTE = 50
+
+BASELINE = Path(__file__).resolve().parent / 'baselines.json'
+NOTA_BASELINE = ("Tempos medidos em uma única máquina (ver 'ambiente'): servem de referência "
+                 "entre versões, não de meta. Grave a linha de base da sua máquina com "
+                 "--salvar-baseline antes de comparar.")
+
+REPOSITORIOS = (CasaRepository, InquilinoRepository, ConsumoRepository, ContratoRepository, ReciboRepository)
+
+Caso = namedtuple('Caso', ['repositorio', 'metodo', 'executar', 'preparar', 'escrita'])
+
+CASOS = {}
+
+
+def caso(repositorio, metodo, escrita=False, preparar=None):
+    """Registra a chamada medida de ``repositorio.metodo``"""
+    def registrar(func):
+        CASOS[(repositorio, metodo)] = Caso(repositorio, metodo, func, preparar, escrita)
+        return func
+    return registrar
+
+
+class Contexto:
+    """Ids e valores reais do banco gerado, usados como argumentos das chamadas"""
+
+    def __init__(self, session):
+        hoje = date.today()
+        self.ano, self.mes = hoje.year, hoje.month
+        self.inicio_ano = date(hoje.year, 1, 1)
+        self.doze_meses = hoje - relativedelta(months=12)
+        self.hoje = hoje
+
+        # Uma casa ocupada no meio da carteira, com o histórico completo
+        ocupadas = [i for (i,) in session.query(Casa.id).filter(Casa.inquilino_id.isnot(None)).order_by(Casa.id)]
+        self.casa_id = ocupadas[len(ocupadas) // 2]
+        casa = session.get(Casa, self.casa_id)
+        self.inquilino_id = casa.inquilino_id
+        inquilino = session.get(Inquilino, self.inquilino_id)
+        self.cpf = inquilino.cpf
+        self.nome = inquilino.nome_completo
+        self.sobrenome = inquilino.nome_completo.split()[-1]
+        self.contrato_id = session.query(Contrato.id).filter(
+            Contrato.casa_id == self.casa_id, Contrato.ativo == 1
+        ).order_by(Contrato.data_inicio.desc()).limit(1).scalar()
+
+        self.ids = {}
+        for model in (Casa, Inquilino, Contrato, Consumo, Recibo):
+            self.ids[model] = [i for (i,) in session.query(model.id).order_by(model.id).limit(TAMANHO_LOTE)]
+        self.recibo_id = session.query(Recibo.id).filter(Recibo.casa_id == self.casa_id).limit(1).scalar()
+        self.consumo_id = session.query(Consumo.id).filter(Consumo.casa_id == self.casa_id).limit(1).scalar()
+        self.consumos = [
+            (c.casa_id, c.mes, c.ano) for c in
+            session.query(Consumo.casa_id, Consumo.mes, Consumo.ano).order_by(Consumo.id).limit(TAMANHO_LOTE // 2)
+        ]
+        self.inquilinos = [
+            (i.nome_completo, i.cpf, i.data_nascimento, i.telefone) for i in
+            session.query(Inquilino).order_by(Inquilino.id).limit(TAMANHO_LOTE // 2)
+        ]
+
+
+# Entidades novas para create, create_many e delete (n diferencia chaves únicas)
+
+def _nova_casa(ctx, n):
+    return Casa(nome=f"Benchmark {n}", endereco="Rua do Teste, 1", numero_quartos=2)
+
+
+def _novo_inquilino(ctx, n):
+    return Inquilino(nome_completo=f"Inquilino Benchmark {n}", cpf=_cpf(999_000_000 + n),
+                     data_nascimento=date(1990, 1, 1), telefone="(11) 90000-0000")
+
+
+def _novo_contrato(ctx, n):
+    return Contrato(casa_id=ctx.casa_id, inquilino_id=ctx.inquilino_id, valor_aluguel=1000.0,
+                    dia_pagamento=10, data_inicio=ctx.hoje, data_fim=ctx.hoje + relativedelta(months=12),
+                    duracao_meses=12, ativo=0)
+
+
+def _novo_consumo(ctx, n):
+    # Anos futuros não colidem com o índice único (casa, ano, mes) dos dados gerados
+    return Consumo(casa_id=ctx.casa_id, mes=n % 12 + 1, ano=ctx.ano + 1 + n // 12,
+                   consumo_mes_anterior=0.0, consumo_mes_atual=150.0, valor_conta=140.0)
+
+
+def _novo_recibo(ctx, n):
+    return Recibo(tipo_recibo='outros', casa_id=ctx.casa_id, inquilino_id=ctx.inquilino_id,
+                  nome_pagador=ctx.nome, nome_recebedor="Proprietário Exemplo", valor=50.0,
+                  descricao="Serviço de benchmark", referente_a=f"Benchmark {n}",
+                  data_pagamento=ctx.hoje, data_emissao=ctx.hoje)
+
+
+NOVOS = {
+    CasaRepository: _nova_casa,
+    InquilinoRepository: _novo_inquilino,
+    ContratoRepository: _novo_contrato,
+    ConsumoRepository: _novo_consumo,
+    ReciboRepository: _novo_recibo,
+}
+
+# Coluna e valor usados por update e update_many
+ALTERACOES = {
+    CasaRepository: ('numero_quartos', 5),
+    InquilinoRepository: ('telefone', "(11) 91111-1111"),
+    ContratoRepository: ('observacoes', "Alterado no benchmark"),
+    ConsumoRepository: ('valor_conta', 123.45),
+    ReciboRepository: ('observacoes', "Alterado no benchmark"),
+}
+
+# Linhas de upsert_many: metade já existe (atualiza), metade é nova (insere)
+LINHAS_UPSERT = {
+    InquilinoRepository: lambda ctx: [
+        {'nome_completo': nome, 'cpf': cpf, 'data_nascimento': nascimento, 'telefone': "(11) 92222-2222"}
+        for nome, cpf, nascimento, _ in ctx.inquilinos
+    ] + [
+        {'nome_completo': f"Novo {n}", 'cpf': _cpf(998_000_000 + n),
+         'data_nascimento': date(1990, 1, 1), 'telefone': "(11) 92222-2222"}
+        for n in range(TAMANHO_LOTE // 2)
+    ],
+    ConsumoRepository: lambda ctx: [
+        {'casa_id': casa_id, 'mes': mes, 'ano': ano, 'consumo_mes_anterior': 0.0,
+         'consumo_mes_atual': 200.0, 'valor_conta': 180.0}
+        for casa_id, mes, ano in ctx.consumos
+    ] + [
+        {'casa_id': ctx.casa_id, 'mes': n % 12 + 1, 'ano': ctx.ano + 1 + n // 12,
+         'consumo_mes_anterior': 0.0, 'consumo_mes_atual': 200.0, 'valor_conta': 180.0}
+        for n in range(TAMANHO_LOTE // 2)
+    ],
+}
+
+# Termos de busca textual por repositório
+TERMOS = {
+    CasaRepository: lambda ctx: "Casa",
+    InquilinoRepository: lambda ctx: ctx.sobrenome,
+    ReciboRepository: lambda ctx: ctx.sobrenome,
+}
+
+MODELOS = {
+    CasaRepository: Casa, InquilinoRepository: Inquilino, ContratoRepository: Contrato,
+    ConsumoRepository: Consumo, ReciboRepository: Recibo,
+}
+
+
+def _id_excluido(repositorio):
+    """Id removido por delete: um registro existente (casas levam consumos e contratos junto)"""
+    if repositorio is InquilinoRepository:
+        # Inquilinos gerados têm contratos; exclui um criado para a medição
+        def preparar(repo, ctx):
+            inquilino = _novo_inquilino(ctx, 0)
+            repo.session.add(inquilino)
+            repo.session.flush()
+            return inquilino.id
+        return preparar
+    if repositorio is CasaRepository:
+        return lambda repo, ctx: ctx.casa_id
+    if repositorio is ConsumoRepository:
+        return lambda repo, ctx: ctx.consumo_id
+    if repositorio is ReciboRepository:
+        return lambda repo, ctx: ctx.recibo_id
+    return lambda repo, ctx: ctx.contrato_id
+
+
+def _registrar_metodos_base():
+    """Casos dos métodos herdados de BaseRepository, iguais para todos os repositórios"""
+    for r in REPOSITORIOS:
+        novo, (coluna, valor), model = NOVOS[r], ALTERACOES[r], MODELOS[r]
+
+        caso(r, 'create', escrita=True)(lambda repo, ctx, _, novo=novo: repo.create(novo(ctx, 0)))
+        caso(r, 'create_many', escrita=True)(
+            lambda repo, ctx, _, novo=novo: repo.create_many([novo(ctx, n) for n in range(TAMANHO_LOTE)])
+        )
+        caso(r, 'get_by_id')(lambda repo, ctx, _, model=model: repo.get_by_id(ctx.ids[model][-1]))
+        caso(r, 'get_all')(lambda repo, ctx, _: repo.get_all())
+        caso(r, 'get_page')(lambda repo, ctx, _: repo.get_page(limit=50))
+        caso(r, 'count')(lambda repo, ctx, _: repo.count())
+        caso(r, 'update', escrita=True,
+             preparar=lambda repo, ctx, model=model: repo.get_by_id(ctx.ids[model][-1]))(
+            lambda repo, ctx, entidade, coluna=coluna, valor=valor: (
+                setattr(entidade, coluna, valor), repo.update(entidade)
+            )
+        )
+        caso(r, 'update_many', escrita=True)(
+            lambda repo, ctx, _, model=model, coluna=coluna, valor=valor: repo.update_many(
+                [{'id': i, coluna: valor} for i in ctx.ids[model]]
+            )
+        )
+        caso(r, 'delete', escrita=True, preparar=_id_excluido(r))(lambda repo, ctx, i: repo.delete(i))
+
+        if r in TERMOS:
+            termo = TERMOS[r]
+            caso(r, 'search_ids')(lambda repo, ctx, _, termo=termo: repo.search_ids(termo(ctx)))
+            caso(r, 'search')(lambda repo, ctx, _, termo=termo: repo.search(termo(ctx)))
+        if r in LINHAS_UPSERT:
+            linhas = LINHAS_UPSERT[r]
+            caso(r, 'upsert_many', escrita=True)(lambda repo, ctx, _, linhas=linhas: repo.upsert_many(linhas(ctx)))
+
+
+_registrar_metodos_base()
+
+
+# CasaRepository
+
+@caso(CasaRepository, 'get_by_inquilino')
+def _(repo, ctx, _):
+    return repo.get_by_inquilino(ctx.inquilino_id)
+
+
+@caso(CasaRepository, 'get_casas_disponiveis')
+def _(repo, ctx, _):
+    return repo.get_casas_disponiveis()
+
+
+@caso(CasaRepository, 'buscar')
+def _(repo, ctx, _):
+    return repo.buscar("Apto")
+
+
+# InquilinoRepository
+
+@caso(InquilinoRepository, 'get_by_cpf')
+def _(repo, ctx, _):
+    return repo.get_by_cpf(ctx.cpf)
+
+
+@caso(InquilinoRepository, 'search_by_name')
+def _(repo, ctx, _):
+    return repo.search_by_name(ctx.sobrenome)
+
+
+@caso(InquilinoRepository, 'get_pagina')
+def _(repo, ctx, _):
+    return repo.get_pagina(ctx.sobrenome)
+
+
+@caso(InquilinoRepository, 'contar')
+def _(repo, ctx, _):
+    return repo.contar(ctx.sobrenome)
+
+
+@caso(InquilinoRepository, 'filtro_nome')
+def _(repo, ctx, _):
+    # Só monta o critério: mede a consulta que o usa (filtro de contratos por inquilino)
+    return repo.session.query(Inquilino.id).filter(repo.filtro_nome(ctx.sobrenome)).all()
+
+
+# ConsumoRepository
+
+@caso(ConsumoRepository, 'get_by_casa_e_periodo')
+def _(repo, ctx, _):
+    return repo.get_by_casa_e_periodo(ctx.casa_id, ctx.mes, ctx.ano)
+
+
+@caso(ConsumoRepository, 'get_consumos_por_casa')
+def _(repo, ctx, _):
+    return repo.get_consumos_por_casa(ctx.casa_id)
+
+
+@caso(ConsumoRepository, 'get_ultimo_consumo')
+def _(repo, ctx, _):
+    return repo.get_ultimo_consumo(ctx.casa_id)
+
+
+@caso(ConsumoRepository, 'get_historico')
+def _(repo, ctx, _):
+    return repo.get_historico()
+
+
+@caso(ConsumoRepository, 'get_totais_por_casa')
+def _(repo, ctx, _):
+    return repo.get_totais_por_casa((ctx.doze_meses.year, ctx.doze_meses.month), (ctx.ano, ctx.mes))
+
+
+@caso(ConsumoRepository, 'get_totais_por_periodo')
+def _(repo, ctx, _):
+    return repo.get_totais_por_periodo(None, (ctx.doze_meses.year, ctx.doze_meses.month), (ctx.ano, ctx.mes))
+
+
+@caso(ConsumoRepository, 'get_maiores_consumidores')
+def _(repo, ctx, _):
+    return repo.get_maiores_consumidores(ctx.ano, ctx.mes)
+
+
+# ContratoRepository
+
+@caso(ContratoRepository, 'get_contratos_ativos')
+def _(repo, ctx, _):
+    return repo.get_contratos_ativos()
+
+
+@caso(ContratoRepository, 'get_contratos_vigentes')
+def _(repo, ctx, _):
+    return repo.get_contratos_vigentes()
+
+
+@caso(ContratoRepository, 'get_contratos_vencidos')
+def _(repo, ctx, _):
+    return repo.get_contratos_vencidos()
+
+
+@caso(ContratoRepository, 'get_by_casa')
+def _(repo, ctx, _):
+    return repo.get_by_casa(ctx.casa_id)
+
+
+@caso(ContratoRepository, 'get_by_inquilino')
+def _(repo, ctx, _):
+    return repo.get_by_inquilino(ctx.inquilino_id)
+
+
+@caso(ContratoRepository, 'get_contrato_ativo_casa')
+def _(repo, ctx, _):
+    return repo.get_contrato_ativo_casa(ctx.casa_id)
+
+
+@caso(ContratoRepository, 'get_contrato_vigente_casa')
+def _(repo, ctx, _):
+    return repo.get_contrato_vigente_casa(ctx.casa_id)
+
+
+@caso(ContratoRepository, 'encerrar_contrato', escrita=True)
+def _(repo, ctx, _):
+    return repo.encerrar_contrato(ctx.contrato_id)
+
+
+@caso(ContratoRepository, 'reativar_contrato', escrita=True)
+def _(repo, ctx, _):
+    return repo.reativar_contrato(ctx.contrato_id)
+
+
+@caso(ContratoRepository, 'get_pagina')
+def _(repo, ctx, _):
+    return repo.get_pagina(status='Vigente')
+
+
+@caso(ContratoRepository, 'contar')
+def _(repo, ctx, _):
+    return repo.contar(status='Vigente')
+
+
+@caso(ContratoRepository, 'contar_por_status')
+def _(repo, ctx, _):
+    return repo.contar_por_status()
+
+
+# ReciboRepository
+
+@caso(ReciboRepository, 'get_by_tipo')
+def _(repo, ctx, _):
+    return repo.get_by_tipo('aluguel')
+
+
+@caso(ReciboRepository, 'get_by_casa')
+def _(repo, ctx, _):
+    return repo.get_by_casa(ctx.casa_id)
+
+
+@caso(ReciboRepository, 'get_by_inquilino')
+def _(repo, ctx, _):
+    return repo.get_by_inquilino(ctx.inquilino_id)
+
+
+@caso(ReciboRepository, 'get_by_periodo')
+def _(repo, ctx, _):
+    return repo.get_by_periodo(ctx.mes, ctx.ano)
+
+
+@caso(ReciboRepository, 'get_by_data_pagamento')
+def _(repo, ctx, _):
+    return repo.get_by_data_pagamento(ctx.inicio_ano, ctx.hoje)
+
+
+@caso(ReciboRepository, 'get_recibos_pagador')
+def _(repo, ctx, _):
+    return repo.get_recibos_pagador(ctx.nome)
+
+
+@caso(ReciboRepository, 'get_pagina')
+def _(repo, ctx, _):
+    return repo.get_pagina('aluguel', ctx.sobrenome)
+
+
+@caso(ReciboRepository, 'contar')
+def _(repo, ctx, _):
+    return repo.contar('aluguel', ctx.sobrenome)
+
+
+@caso(ReciboRepository, 'get_total_recebido_periodo')
+def _(repo, ctx, _):
+    return repo.get_total_recebido_periodo(ctx.doze_meses, ctx.hoje)
+
+
+@caso(ReciboRepository, 'get_total_por_tipo')
+def _(repo, ctx, _):
+    return repo.get_total_por_tipo('energia', ctx.doze_meses, ctx.hoje)
+
+
+@caso(ReciboRepository, 'get_resumo_mensal')
+def _(repo, ctx, _):
+    return repo.get_resumo_mensal(ctx.doze_meses, ctx.hoje)
+
+
+@caso(ReciboRepository, 'reservar_numero', escrita=True)
+def _(repo, ctx, _):
+    return repo.reservar_numero(ctx.ano)
+
+
+def metodos_publicos(repositorio):
+    return sorted(
+        nome for nome, _ in inspect.getmembers(repositorio, inspect.isfunction)
+        if not nome.startswith('_')
+    )
+
+
+def nao_se_aplica(repositorio, metodo):
+    """Métodos herdados que o repositório não suporta (sem chave natural ou sem busca textual)"""
+    if metodo == 'upsert_many':
+        return not repositorio.natural_key
+    if metodo in ('search', 'search_ids'):
+        return repositorio.fts_table is None and repositorio._colunas_busca is BaseRepository._colunas_busca
+    return False
+
+
+def casos_faltando():
+    """Métodos públicos sem caso registrado (todo método novo precisa ser medido)"""
+    return [
+        f"{r.__name__}.{m}" for r in REPOSITORIOS for m in metodos_publicos(r)
+        if (r, m) not in CASOS and not nao_se_aplica(r, m)
+    ]
+
+
+class _Desfazer(Exception):
+    """Encerra o unit_of_work de uma medição de escrita desfazendo a transação"""
+
+
+def _executar_uma_vez(caso_, session, ctx):
+    repo = caso_.repositorio(session)
+    preparado = caso_.preparar(repo, ctx) if caso_.preparar else None
+    inicio = time.perf_counter()
+    caso_.executar(repo, ctx, preparado)
+    return time.perf_counter() - inicio
+
+
+def medir(db, caso_, ctx, repeticoes):
+    """Mediana, em ms, de ``repeticoes`` execuções depois de uma de aquecimento"""
+    tempos = []
+    inicio = time.perf_counter()
+    for _ in range(repeticoes + 1):
+        session = db.get_session()
+        try:
+            if caso_.escrita:
+                # Dentro da unidade de trabalho os repositórios só fazem flush;
+                # a exceção desfaz tudo e o próximo caso vê o banco original
+                try:
+                    with unit_of_work(session):
+                        tempos.append(_executar_uma_vez(caso_, session, ctx))
+                        raise _Desfazer()
+                except _Desfazer:
+                    pass
+            else:
+                tempos.append(_executar_uma_vez(caso_, session, ctx))
+        finally:
+            session.close()
+        if time.perf_counter() - inicio > TEMPO_MAXIMO_S:
+            break
+    medidos = tempos[1:] or tempos
+    return median(medidos) * 1000
+
+
+def abrir_banco(pasta, escala):
+    """Abre (gerando, se ainda não existir) o banco da escala"""
+    casas = CASAS_POR_ESCALA * escala
+    arquivo = Path(pasta) / f"carteira_{casas}casas_{ANOS}anos_s{SEMENTE}_{date.today():%Y%m%d}.db"
+    novo = not arquivo.exists()
+    db = DatabaseConfig(f"sqlite:///{arquivo}")
+    db.initialize()
+    if novo:
+        session = db.get_session()
+        try:
+            inicio = time.perf_counter()
+            totais = gerar_carteira(session, casas, ANOS, SEMENTE)
+            print(f"   Gerado em {time.perf_counter() - inicio:.1f} s: "
+                  + ', '.join(f"{n} {tabela}" for tabela, n in totais.items()))
+        except Exception:
+            session.close()
+            db.close()
+            arquivo.unlink(missing_ok=True)
+            raise
+        session.close()
+    return db
+
+
+def executar(escalas, repeticoes, pasta, filtro=None):
+    """Mede os casos em cada escala; retorna {'1x': {'Repo.metodo': ms}}"""
+    resultados = {}
+    for escala in escalas:
+        print(f"\n📊 Escala {escala}x ({CASAS_POR_ESCALA * escala} casas, {ANOS} anos)")
+        db = abrir_banco(pasta, escala)
+        try:
+            session = db.get_session()
+            try:
+                ctx = Contexto(session)
+            finally:
+                session.close()
+
+            tempos = {}
+            for (repositorio, metodo), caso_ in sorted(CASOS.items(), key=lambda c: (c[0][0].__name__, c[0][1])):
+                nome = f"{repositorio.__name__}.{metodo}"
+                if filtro and filtro not in nome:
+                    continue
+                tempos[nome] = medir(db, caso_, ctx, repeticoes)
+                print(f"   {tempos[nome]:10.2f} ms  {nome}")
+            resultados[f"{escala}x"] = tempos
+        finally:
+            db.close()
+    return resultados
+
+
+def comparar(resultados, baseline, limite):
+    """Lista de (escala, método, base_ms, atual_ms) acima do limite"""
+    regressoes = []
+    for escala, tempos in resultados.items():
+        base = baseline.get('resultados', {}).get(escala, {})
+        for nome, atual in tempos.items():
+            if nome not in base:
+                continue
+            if atual > base[nome] * (1 + limite) and atual - base[nome] > PISO_MS:
+                regressoes.append((escala, nome, base[nome], atual))
+    return regressoes
+
+
+def ambiente():
+    return {
+        'python': platform.python_version(),
+        'sqlalchemy': sqlalchemy.__version__,
+        'sqlite': sqlite3.sqlite_version,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos repositórios com carteiras sintéticas")
+    parser.add_argument('--escalas', type=int, nargs='+', default=list(ESCALAS),
+                        help="multiplicadores de CASAS_POR_ESCALA (padrão: 1 10 100)")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO)
+    parser.add_argument('--limite', type=float, default=LIMITE_PADRAO,
+                        help="fração acima da linha de base considerada regressão (padrão: 0.25)")
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--salvar-baseline', action='store_true',
+                        help="grava os tempos medidos como nova linha de base")
+    parser.add_argument('--dados', type=Path,
+                        help="pasta para guardar e reutilizar os bancos gerados (padrão: temporária)")
+    parser.add_argument('--filtro', help="mede apenas os métodos cujo nome contém o texto")
+    args = parser.parse_args(argv)
+
+    faltando = casos_faltando()
+    if faltando:
+        print("❌ Métodos públicos sem caso no benchmark: " + ', '.join(faltando))
+        return 1
+
+    if args.dados:
+        args.dados.mkdir(parents=True, exist_ok=True)
+        resultados = executar(args.escalas, args.repeticoes, args.dados, args.filtro)
+    else:
+        with tempfile.TemporaryDirectory() as pasta:
+            resultados = executar(args.escalas, args.repeticoes, pasta, args.filtro)
+
+    if args.salvar_baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8')) if args.baseline.exists() else {}
+        baseline['ambiente'] = ambiente()
+        baseline['nota'] = NOTA_BASELINE
+        baseline['parametros'] = {'casas_por_escala': CASAS_POR_ESCALA, 'anos': ANOS, 'semente': SEMENTE,
+                                  'repeticoes': args.repeticoes}
+        # Escalas e métodos não medidos agora mantêm os valores anteriores
+        for escala, tempos in resultados.items():
+            baseline.setdefault('resultados', {}).setdefault(escala, {}).update(
+                {nome: round(ms, 3) for nome, ms in tempos.items()}
+            )
+        args.baseline.write_text(json.dumps(baseline, indent=2, ensure_ascii=False, sort_keys=True) + '\n',
+                                 encoding='utf-8')
+        print(f"\n💾 Linha de base gravada em {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\n⚠️  Sem linha de base em {args.baseline}; use --salvar-baseline para criar")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    if baseline.get('ambiente') != ambiente():
+        print("\n⚠️  Linha de base medida em outro ambiente (ver 'ambiente' no arquivo): as diferenças "
+              "podem ser da máquina; grave a sua com --salvar-baseline antes de comparar")
+    regressoes = comparar(resultados, baseline, args.limite)
+    if not regressoes:
+        print(f"\n✅ Nenhuma regressão acima de {args.limite:.0%} da linha de base")
+        return 0
+    print(f"\n❌ {len(regressoes)} regressão(ões) acima de {args.limite:.0%} da linha de base:")
+    for escala, nome, base, atual in regressoes:
+        print(f"   {escala:>4}  {nome}: {base:.2f} ms -> {atual:.2f} ms ({atual / base - 1:+.0%})")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
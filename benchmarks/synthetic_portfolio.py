@@ -0,0 +1,254 @@
+"""
+Gerador de carteiras sintéticas para testes de desempenho.
+
+``gerar_carteira`` preenche um banco vazio com casas, inquilinos, contratos
+em sequência ao longo dos anos, leituras mensais de energia e recibos de
+aluguel e de energia. Tudo sai de um ``random.Random(semente)``: a mesma
+semente e os mesmos parâmetros geram sempre o mesmo banco (a data de
+referência também entra, então fixe ``hoje`` para comparar execuções em
+dias diferentes).
+
+Uso pela linha de comando:
+
+    python -m benchmarks.synthetic_portfolio carteira.db --casas 250 --anos 3
+"""
+import argparse
+import random
+from datetime import date
+from pathlib import Path
+from dateutil.relativedelta import relativedelta
+from sqlalchemy import insert, func
+from app.data.models import Casa, Inquilino, Contrato, Consumo, Recibo
+from app.data.database.monthly_summary import reconstruir as reconstruir_resumo
+
+# Proporção de meses em que a casa está alugada
+TAXA_OCUPACAO = 0.85
+
+# Linhas por INSERT em lote
+LOTE = 5000
+
+NOMES = [
+    'Ana', 'Bruno', 'Carla', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela',
+    'João', 'Karina', 'Lucas', 'Mariana', 'Nicolas', 'Olivia', 'Paulo', 'Rafaela', 'Samuel',
+    'Tatiane', 'Vinicius', 'Yasmin', 'Antônio', 'Beatriz', 'Caio', 'Débora', 'Marcos',
+]
+SOBRENOMES = [
+    'Silva', 'Santos', 'Oliveira', 'Souza', 'Rodrigues', 'Ferreira', 'Alves', 'Pereira', 'Lima',
+    'Gomes', 'Costa', 'Ribeiro', 'Martins', 'Carvalho', 'Almeida', 'Lopes', 'Soares', 'Fernandes',
+    'Vieira', 'Barbosa', 'Rocha', 'Dias', 'Nascimento', 'Andrade', 'Moreira', 'Nunes',
+]
+RUAS = [
+    'Rua das Flores', 'Rua São João', 'Avenida Brasil', 'Rua XV de Novembro', 'Rua Sete de Setembro',
+    'Travessa Boa Vista', 'Rua do Comércio', 'Avenida Getúlio Vargas', 'Rua Tiradentes', 'Rua da Paz',
+]
+TIPOS_CASA = ['Casa', 'Apto', 'Kitnet', 'Sobrado']
+FORMAS_PAGAMENTO = ['pix', 'pix', 'pix', 'dinheiro', 'transferencia', 'cheque']
+MESES = ['Janeiro', 'Fevereiro', 'Março', 'Abril', 'Maio', 'Junho', 'Julho',
+         'Agosto', 'Setembro', 'Outubro', 'Novembro', 'Dezembro']
+
+RECEBEDOR = ('Proprietário Exemplo', '111.444.777-35')
+
+
+def _cpf(base):
+    """Formata 9 dígitos como CPF com os dígitos verificadores corretos"""
+    digitos = [int(d) for d in f"{base:09d}"]
+    for tamanho in (9, 10):
+        soma = sum(d * (tamanho + 1 - i) for i, d in enumerate(digitos[:tamanho]))
+        resto = soma * 10 % 11
+        digitos.append(0 if resto == 10 else resto)
+    s = ''.join(map(str, digitos))
+    return f"{s[:3]}.{s[3:6]}.{s[6:9]}-{s[9:]}"
+
+
+def _nome(rng):
+    return f"{rng.choice(NOMES)} {rng.choice(SOBRENOMES)} {rng.choice(SOBRENOMES)}"
+
+
+def _inserir(session, model, linhas):
+    for i in range(0, len(linhas), LOTE):
+        session.execute(insert(model), linhas[i:i + LOTE])
+
+
+def gerar_carteira(session, casas=25, anos=3, semente=42, hoje=None):
+    """
+    Gera a carteira na sessão e faz o commit.
+
+    Cada casa tem uma sequência de contratos (12, 24 ou 30 meses) cobrindo os
+    últimos ``anos`` com intervalos vagos entre eles; os antigos ficam
+    encerrados e alguns vigentes já passaram do fim sem renovação. Há uma
+    leitura de energia por casa e mês e, nos meses alugados, um recibo de
+    aluguel e outro de energia. Retorna a quantidade de linhas por tabela.
+    """
+    rng = random.Random(semente)
+    hoje = hoje or date.today()
+    primeiro_mes = date(hoje.year, hoje.month, 1) - relativedelta(years=anos)
+    total_meses = anos * 12 + 1
+
+    # Continua a partir dos ids existentes para não colidir com dados do banco
+    proximo = {
+        model: (session.query(func.max(model.id)).scalar() or 0) + 1
+        for model in (Casa, Inquilino, Contrato)
+    }
+    cpfs = rng.sample(range(1, 10 ** 9), casas * (total_meses // 12 + 2))
+
+    linhas_casas, linhas_inquilinos, linhas_contratos = [], [], []
+    linhas_consumos, linhas_recibos = [], []
+
+    def novo_inquilino():
+        inquilino_id = proximo[Inquilino] + len(linhas_inquilinos)
+        linhas_inquilinos.append({
+            'id': inquilino_id,
+            'nome_completo': _nome(rng),
+            'cpf': _cpf(cpfs[len(linhas_inquilinos)]),
+            'data_nascimento': date(rng.randint(1950, 2004), rng.randint(1, 12), rng.randint(1, 28)),
+            'telefone': f"({rng.randint(11, 99)}) 9{rng.randint(1000, 9999)}-{rng.randint(1000, 9999)}",
+            'nome_fiador': _nome(rng) if rng.random() < 0.4 else None,
+        })
+        return linhas_inquilinos[-1]
+
+    for n in range(casas):
+        casa_id = proximo[Casa] + n
+        quartos = rng.choice([1, 1, 2, 2, 2, 3, 3, 4])
+        aluguel_base = round(500 + quartos * 250 + rng.uniform(-150, 300), -1)
+
+        # Meses (índices a partir de primeiro_mes) cobertos por cada contrato
+        inquilino_do_mes = [None] * total_meses
+        mes = inicio_ultimo = rng.randint(0, 3)
+        while mes < total_meses:
+            inicio_ultimo = mes
+            duracao = rng.choice([12, 12, 24, 30])
+            inquilino = novo_inquilino()
+            inicio = primeiro_mes + relativedelta(months=mes)
+            fim = inicio + relativedelta(months=duracao, days=-1)
+            linhas_contratos.append({
+                'id': proximo[Contrato] + len(linhas_contratos),
+                'casa_id': casa_id,
+                'inquilino_id': inquilino['id'],
+                'valor_aluguel': round(aluguel_base * (1.05 ** (mes // 12)), 2),
+                'dia_pagamento': rng.choice([5, 5, 10, 10, 15, 20]),
+                'data_inicio': inicio,
+                'data_fim': fim,
+                'duracao_meses': duracao,
+                'valor_caucao': round(aluguel_base * rng.choice([1, 2, 3]), 2),
+                # Alguns vencidos continuam ativos, aguardando renovação
+                'ativo': 1 if fim >= hoje or (fim >= hoje - relativedelta(months=2) and rng.random() < 0.5) else 0,
+                'data_encerramento': None,
+                'observacoes': None,
+            })
+            contrato = linhas_contratos[-1]
+            for m in range(mes, min(mes + duracao, total_meses)):
+                inquilino_do_mes[m] = (inquilino, contrato)
+            # Parte das trocas de inquilino deixa a casa vaga por alguns meses
+            vago = 0 if rng.random() < TAXA_OCUPACAO else rng.randint(1, 4)
+            mes += duracao + vago
+
+        if rng.random() > TAXA_OCUPACAO and inicio_ultimo < total_meses - 1:
+            # Casa vaga hoje: o último inquilino saiu antes do fim do contrato
+            saida = rng.randint(max(inicio_ultimo + 1, total_meses - 4), total_meses - 1)
+            contrato = linhas_contratos[-1]
+            contrato['data_encerramento'] = primeiro_mes + relativedelta(months=saida, days=-1)
+            contrato['ativo'] = 0
+            inquilino_do_mes[saida:] = [None] * (total_meses - saida)
+
+        ocupante = inquilino_do_mes[-1]
+        linhas_casas.append({
+            'id': casa_id,
+            'nome': f"{rng.choice(TIPOS_CASA)} {n + 1}",
+            'endereco': f"{rng.choice(RUAS)}, {rng.randint(10, 2500)}",
+            'numero_quartos': quartos,
+            'inquilino_id': ocupante[0]['id'] if ocupante and ocupante[1]['ativo'] else None,
+        })
+
+        leitura = rng.uniform(1000, 20000)
+        tarifa = rng.uniform(0.75, 1.05)
+        for m in range(total_meses):
+            referencia = primeiro_mes + relativedelta(months=m)
+            ocupacao = inquilino_do_mes[m]
+            kwh = rng.uniform(90, 120 + quartos * 60) if ocupacao else rng.uniform(0, 15)
+            anterior, leitura = leitura, leitura + kwh
+            valor_conta = round(kwh * tarifa + 12, 2)
+            linhas_consumos.append({
+                'casa_id': casa_id,
+                'mes': referencia.month,
+                'ano': referencia.year,
+                'consumo_mes_anterior': round(anterior, 1),
+                'consumo_mes_atual': round(leitura, 1),
+                'valor_conta': valor_conta,
+                'consumo_individual_proporcional': round(kwh, 1),
+            })
+            if not ocupacao:
+                continue
+
+            inquilino, contrato = ocupacao
+            pagamento = referencia + relativedelta(day=contrato['dia_pagamento']) \
+                + relativedelta(days=rng.choice([-2, 0, 0, 0, 1, 3, 7]))
+            if pagamento > hoje:
+                continue
+            comum = {
+                'casa_id': casa_id,
+                'inquilino_id': inquilino['id'],
+                'nome_pagador': inquilino['nome_completo'],
+                'cpf_pagador': inquilino['cpf'],
+                'nome_recebedor': RECEBEDOR[0],
+                'cpf_recebedor': RECEBEDOR[1],
+                'data_pagamento': pagamento,
+                'data_emissao': pagamento,
+                'mes_referencia': referencia.month,
+                'ano_referencia': referencia.year,
+                'forma_pagamento': rng.choice(FORMAS_PAGAMENTO),
+                'observacoes': None,
+            }
+            periodo = f"{MESES[referencia.month - 1]}/{referencia.year}"
+            linhas_recibos.append(dict(
+                comum, tipo_recibo='aluguel', valor=contrato['valor_aluguel'],
+                descricao=f"Aluguel do imóvel {linhas_casas[-1]['nome']}",
+                referente_a=f"Aluguel ref. {periodo}",
+            ))
+            linhas_recibos.append(dict(
+                comum, tipo_recibo='energia', valor=valor_conta,
+                descricao=f"Conta de energia: {kwh:.0f} kWh",
+                referente_a=f"Conta de Luz ref. {periodo}",
+            ))
+
+    # Inquilinos antes das casas e contratos (chaves estrangeiras)
+    _inserir(session, Inquilino, linhas_inquilinos)
+    _inserir(session, Casa, linhas_casas)
+    _inserir(session, Contrato, linhas_contratos)
+    _inserir(session, Consumo, linhas_consumos)
+    _inserir(session, Recibo, linhas_recibos)
+    # O resumo mensal é mantido no flush do ORM; INSERTs em lote exigem reconstruir
+    reconstruir_resumo(session.connection())
+    session.commit()
+
+    return {
+        'casas': len(linhas_casas),
+        'inquilinos': len(linhas_inquilinos),
+        'contratos': len(linhas_contratos),
+        'consumos': len(linhas_consumos),
+        'recibos': len(linhas_recibos),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera uma carteira sintética em um banco SQLite")
+    parser.add_argument('banco', help="arquivo .db (criado se não existir)")
+    parser.add_argument('--casas', type=int, default=25)
+    parser.add_argument('--anos', type=int, default=3)
+    parser.add_argument('--semente', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    from app.data.database.base import DatabaseConfig
+
+    db = DatabaseConfig(f"sqlite:///{Path(args.banco).resolve()}")
+    db.initialize()
+    session = db.get_session()
+    try:
+        totais = gerar_carteira(session, args.casas, args.anos, args.semente)
+    finally:
+        session.close()
+        db.close()
+    print(', '.join(f"{n} {tabela}" for tabela, n in totais.items()))
+
+
+if __name__ == '__main__':
+    main()
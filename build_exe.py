@@ -23,6 +23,8 @@ PyInstaller.__main__.run([
     '--hidden-import=reportlab',
     '--hidden-import=sqlalchemy',
     '--hidden-import=tkcalendar',
+    '--hidden-import=aiosqlite',
+    '--hidden-import=sqlalchemy.dialects.sqlite.aiosqlite',
     '--collect-all=reportlab',
 ])
 
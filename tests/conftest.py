@@ -0,0 +1,17 @@
+import pytest
+from app.data.database.base import DatabaseConfig
+from app.data.database.session_manager import SessionManager
+
+
+@pytest.fixture
+def db_config(tmp_path):
+    """Banco SQLite novo, em arquivo, com as migrações aplicadas"""
+    config = DatabaseConfig(f"sqlite:///{tmp_path / 'teste.db'}")
+    config.initialize()
+    yield config
+    config.close()
+
+
+@pytest.fixture
+def session_manager(db_config):
+    return SessionManager(db_config.engine, db_config.reader_engine)
@@ -0,0 +1,81 @@
+"""Os meses arquivados continuam no resumo mensal (painel e relatórios)"""
+from datetime import date
+import pytest
+from sqlalchemy import select, text
+from app.data.database.archive import ArquivoHistorico, caminho_arquivo
+from app.data.database.migrations import _resumo_arquivado
+from app.data.database.monthly_summary import recalcular, reconstruir
+from app.data.models import ResumoMensal, ResumoArquivado
+from benchmarks.synthetic_portfolio import gerar_carteira
+
+HOJE = date(2025, 6, 15)
+
+
+@pytest.fixture
+def carteira(db_config):
+    session = db_config.get_session()
+    try:
+        gerar_carteira(session, casas=6, anos=3, semente=7, hoje=HOJE)
+    finally:
+        session.close()
+    return db_config
+
+
+@pytest.fixture
+def arquivo(carteira):
+    arquivo = ArquivoHistorico(carteira.engine, caminho_arquivo(carteira.get_database_location()))
+    yield arquivo
+    arquivo.fechar()
+
+
+def _resumo(engine, model=ResumoMensal):
+    with engine.connect() as connection:
+        return {
+            (row.ano, row.mes, row.casa_id): (
+                round(row.receita_total, 2), round(row.receita_aluguel, 2), row.quantidade_recibos,
+                round(row.energia_kwh, 1), round(row.energia_valor, 2),
+                round(row.aluguel_contratado, 2), row.ocupada,
+            )
+            for row in connection.execute(select(model))
+        }
+
+
+def test_arquivar_mantem_o_resumo(carteira, arquivo):
+    antes = _resumo(carteira.engine)
+    movidos = arquivo.arquivar(anos=1)
+    assert movidos['contratos'] and movidos['recibos']
+    assert _resumo(carteira.engine, ResumoArquivado)
+    assert _resumo(carteira.engine) == antes
+
+
+def test_reconstruir_e_recalcular_contam_o_arquivo(carteira, arquivo):
+    antes = _resumo(carteira.engine)
+    arquivo.arquivar(anos=1)
+    with carteira.engine.begin() as connection:
+        reconstruir(connection)
+    assert _resumo(carteira.engine) == antes
+    with carteira.engine.begin() as connection:
+        recalcular(connection, set(antes))
+    assert _resumo(carteira.engine) == antes
+
+
+def test_restaurar_esvazia_o_resumo_arquivado(carteira, arquivo):
+    antes = _resumo(carteira.engine)
+    arquivo.arquivar(anos=1)
+    arquivo.restaurar()
+    assert _resumo(carteira.engine, ResumoArquivado) == {}
+    assert _resumo(carteira.engine) == antes
+
+
+def test_migracao_recupera_meses_arquivados(carteira, arquivo):
+    """Banco em que o resumo foi recalculado sem os registros arquivados (versões anteriores)"""
+    antes = _resumo(carteira.engine)
+    arquivo.arquivar(anos=1)
+    with carteira.engine.begin() as connection:
+        connection.execute(text("DELETE FROM resumo_arquivado"))
+        reconstruir(connection)
+    assert _resumo(carteira.engine) != antes
+
+    with carteira.engine.begin() as connection:
+        _resumo_arquivado(connection)
+    assert _resumo(carteira.engine) == antes
@@ -0,0 +1,57 @@
+"""Acesso assíncrono: somente leitura, sem disputar a conexão de escrita"""
+import asyncio
+import inspect
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.data.database.async_engine import criar_engine_async
+from app.data.repositories import (
+    CasaRepository, InquilinoRepository, ConsumoRepository, ContratoRepository, ReciboRepository
+)
+from app.data.repositories.async_repository import ESCRITAS, AsyncCasaRepository
+from app.data.repositories.monthly_summary_repository import ResumoMensalRepository
+
+
+def _executar(db_config, corrotina):
+    async def rodar():
+        engine = criar_engine_async(db_config)
+        try:
+            async with async_sessionmaker(engine)() as session:
+                return await corrotina(session)
+        finally:
+            await engine.dispose()
+    return asyncio.run(rodar())
+
+
+def test_leitura_assincrona(db_config):
+    async def contar(session):
+        return await AsyncCasaRepository(session).count()
+    assert _executar(db_config, contar) == 0
+
+
+def test_engine_assincrono_nao_grava(db_config):
+    async def gravar(session):
+        await session.execute(text("INSERT INTO sequencias (chave, ultimo_valor) VALUES ('x', 1)"))
+    with pytest.raises(OperationalError):
+        _executar(db_config, gravar)
+
+
+def test_metodos_de_escrita_nao_sao_encaminhados(db_config):
+    async def criar(session):
+        return AsyncCasaRepository(session).create
+    with pytest.raises(AttributeError, match="somente leitura"):
+        _executar(db_config, criar)
+
+
+@pytest.mark.parametrize('repositorio', [
+    CasaRepository, InquilinoRepository, ConsumoRepository, ContratoRepository, ReciboRepository,
+    ResumoMensalRepository,
+])
+def test_escritas_cobre_todos_os_metodos_que_gravam(repositorio):
+    """Todo método público que confirma a transação está em ESCRITAS"""
+    gravam = {
+        nome for nome, metodo in inspect.getmembers(repositorio, inspect.isfunction)
+        if not nome.startswith('_') and 'self._commit()' in inspect.getsource(metodo)
+    }
+    assert gravam <= ESCRITAS
@@ -0,0 +1,75 @@
+"""Backup e restauração levam o arquivo histórico junto com o banco principal"""
+from datetime import date
+import pytest
+from sqlalchemy import text
+from app.data.database.archive import ArquivoHistorico, caminho_arquivo
+from app.data.database.backup import BackupError, GerenciadorBackup, caminho_copia_arquivo
+from benchmarks.synthetic_portfolio import gerar_carteira
+
+
+@pytest.fixture
+def carteira(db_config):
+    session = db_config.get_session()
+    try:
+        gerar_carteira(session, casas=4, anos=3, semente=3, hoje=date(2025, 6, 15))
+    finally:
+        session.close()
+    return db_config
+
+
+@pytest.fixture
+def arquivo(carteira):
+    arquivo = ArquivoHistorico(carteira.engine, caminho_arquivo(carteira.get_database_location()))
+    yield arquivo
+    arquivo.fechar()
+
+
+@pytest.fixture
+def gerenciador(carteira, tmp_path):
+    return GerenciadorBackup(carteira.get_database_location(), pasta=tmp_path / 'backups', manter=10)
+
+
+def _ids(engine, tabela):
+    with engine.connect() as connection:
+        return set(connection.scalars(text(f"SELECT id FROM {tabela}")))
+
+
+def test_restaurar_volta_banco_e_arquivo_juntos(carteira, arquivo, gerenciador):
+    arquivo.arquivar(anos=1)
+    ativos, arquivados = _ids(carteira.engine, 'recibos'), arquivo.contar()
+    backup = gerenciador.criar_backup()
+    assert caminho_copia_arquivo(backup).exists()
+    assert [b[0] for b in gerenciador.listar()] == [backup]
+
+    # Depois do backup os recibos voltam ao banco ativo
+    arquivo.restaurar()
+    assert arquivo.contar()['recibos'] == 0
+
+    gerenciador.restaurar(backup)
+    assert _ids(carteira.engine, 'recibos') == ativos
+    assert arquivo.contar() == arquivados
+    with arquivo.sessao() as session:
+        assert not ativos & set(session.scalars(text("SELECT id FROM recibos")))
+
+
+def test_backup_sem_arquivo_esvazia_o_arquivo_ao_restaurar(carteira, arquivo, gerenciador):
+    backup = gerenciador.criar_backup()
+    arquivo.arquivar(anos=1)
+    assert arquivo.contar()['recibos']
+
+    gerenciador.restaurar(backup)
+    assert arquivo.contar()['recibos'] == 0
+
+
+def test_recusa_backup_antigo_com_registros_arquivados(carteira, arquivo, gerenciador):
+    backup = gerenciador.criar_backup()
+    caminho_copia_arquivo(backup).unlink()  # backup de versão anterior
+    arquivo.arquivar(anos=1)
+    recibos = _ids(carteira.engine, 'recibos')
+
+    with pytest.raises(BackupError, match="Restaurar Registros Arquivados"):
+        gerenciador.restaurar(backup)
+    assert _ids(carteira.engine, 'recibos') == recibos
+
+    arquivo.restaurar()
+    gerenciador.restaurar(backup)
@@ -0,0 +1,101 @@
+"""
+Comportamentos necessários quando o banco é compartilhado por várias
+estações (DATABASE_URL apontando para um servidor). O servidor não está
+disponível nos testes: as escritas das outras estações são simuladas em
+SQL fora do ORM, que não passa pelos contadores do cache.
+"""
+from datetime import date
+from sqlalchemy import event, select, text
+from app.data.database.base import DatabaseConfig
+from app.data.database.monthly_summary import CHAVE_TRAVA
+from app.data.database.session_manager import SessionManager
+from app.data.models import Casa, Recibo
+from app.data.models.sequence import Sequencia
+from app.data.repositories.house_repository import CasaRepository
+from app.data.repositories.receipt_repository import ReciboRepository
+
+
+def _gravar_em_outra_estacao(db_config, nome):
+    with db_config.engine.begin() as connection:
+        connection.execute(
+            text("INSERT INTO casas (nome, endereco, numero_quartos) VALUES (:nome, 'Rua A, 1', 1)"),
+            {'nome': nome}
+        )
+
+
+def test_is_server():
+    assert DatabaseConfig('postgresql://u:s@servidor/aluguel').is_server
+    assert not DatabaseConfig('sqlite:///casas.db').is_server
+    assert not DatabaseConfig('sqlite:///:memory:').is_server
+
+
+def test_cache_esconde_escritas_externas(db_config, session_manager):
+    """Com o cache ligado (arquivo local) a escrita externa não é vista na mesma sessão"""
+    with session_manager.leitura() as session:
+        repo = CasaRepository(session)
+        assert repo.count() == 0
+        _gravar_em_outra_estacao(db_config, 'Casa 1')
+        assert repo.count() == 0
+
+
+def test_sem_cache_ve_escritas_de_outras_estacoes(db_config):
+    session_manager = SessionManager(db_config.engine, db_config.reader_engine, cache_consultas=False)
+    with session_manager.leitura() as session:
+        repo = CasaRepository(session)
+        assert repo.count() == 0
+        _gravar_em_outra_estacao(db_config, 'Casa 1')
+        assert repo.count() == 1
+
+
+def test_reservar_numero_com_chave_criada_por_outra_estacao(db_config, session_manager):
+    """
+    Duas estações reservam o primeiro número do ano ao mesmo tempo: a nossa
+    inserção da chave não vê a linha da outra (ainda não confirmada) e
+    conflita com ela. O número tem que sair da linha da outra estação.
+    """
+    @event.listens_for(db_config.engine, 'before_cursor_execute', retval=True)
+    def outra_estacao(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('SAVEPOINT'):
+            # A outra estação criou a chave antes do nosso savepoint
+            cursor.execute("INSERT INTO sequencias (chave, ultimo_valor) VALUES ('recibo:2025', 7)")
+        elif statement.startswith('INSERT INTO sequencias'):
+            # ... mas a linha ainda não estaria visível para o NOT EXISTS
+            statement, parameters = statement[:statement.index('WHERE NOT')], parameters[:2]
+        return statement, parameters
+
+    try:
+        with session_manager.scope() as session:
+            numero = ReciboRepository(session).reservar_numero(2025)
+    finally:
+        event.remove(db_config.engine, 'before_cursor_execute', outra_estacao)
+
+    assert numero == '000008-2025'
+    with session_manager.leitura() as session:
+        assert session.get(Sequencia, 'recibo:2025').ultimo_valor == 8
+
+
+def test_reservar_numero_sequencial(session_manager):
+    with session_manager.scope() as session:
+        repo = ReciboRepository(session)
+        assert [repo.reservar_numero(2025) for _ in range(3)] == ['000001-2025', '000002-2025', '000003-2025']
+
+
+def test_migracao_cria_linha_de_trava(session_manager):
+    with session_manager.leitura() as session:
+        assert session.execute(
+            select(Sequencia.chave).where(Sequencia.chave == CHAVE_TRAVA)
+        ).scalar_one() == CHAVE_TRAVA
+
+
+def test_recibo_sem_casa_entra_no_resumo(session_manager):
+    """O recálculo de recibos sem casa (casa 0) trava a linha de sequencias e soma normalmente"""
+    with session_manager.scope() as session:
+        session.add(Recibo(
+            tipo_recibo='aluguel', valor=100.0, descricao='Avulso', referente_a='Avulso', data_pagamento=date(2025, 3, 5),
+            nome_pagador='A', cpf_pagador='1', nome_recebedor='B', cpf_recebedor='2',
+        ))
+    with session_manager.leitura() as session:
+        linha = session.execute(
+            text("SELECT receita_total FROM resumo_mensal WHERE ano = 2025 AND mes = 3 AND casa_id = 0")
+        ).scalar_one()
+    assert linha == 100.0
@@ -0,0 +1,74 @@
+"""Gerador de carteiras sintéticas e comparação com a linha de base do benchmark"""
+from datetime import date
+import pytest
+from sqlalchemy import select
+from app.data.database.base import DatabaseConfig
+from app.data.models import Casa, Inquilino, Contrato, Consumo, Recibo, ResumoMensal
+from benchmarks.benchmark_repositories import PISO_MS, casos_faltando, comparar
+from benchmarks.synthetic_portfolio import gerar_carteira
+
+HOJE = date(2025, 6, 15)
+TABELAS = (Casa, Inquilino, Contrato, Consumo, Recibo, ResumoMensal)
+
+
+def _gerar(caminho, semente=42, hoje=HOJE):
+    db = DatabaseConfig(f"sqlite:///{caminho}")
+    db.initialize()
+    session = db.get_session()
+    try:
+        totais = gerar_carteira(session, casas=4, anos=2, semente=semente, hoje=hoje)
+        conteudo = {
+            model.__tablename__: [
+                tuple(row) for row in session.execute(
+                    select(*model.__table__.columns).order_by(*model.__table__.primary_key.columns)
+                )
+            ]
+            for model in TABELAS
+        }
+    finally:
+        session.close()
+        db.close()
+    return totais, conteudo
+
+
+def test_mesma_semente_gera_o_mesmo_banco(tmp_path):
+    totais, conteudo = _gerar(tmp_path / 'a.db')
+    assert _gerar(tmp_path / 'b.db') == (totais, conteudo)
+    assert totais['casas'] == 4
+    assert all(len(conteudo[t]) for t in conteudo)
+    assert {t: len(linhas) for t, linhas in conteudo.items() if t in totais} == totais
+
+
+def test_semente_e_data_mudam_o_banco(tmp_path):
+    _, conteudo = _gerar(tmp_path / 'a.db')
+    assert _gerar(tmp_path / 'b.db', semente=43)[1] != conteudo
+    assert _gerar(tmp_path / 'c.db', hoje=date(2025, 7, 15))[1] != conteudo
+
+
+BASELINE = {'resultados': {'1x': {'Repo.lento': 10.0, 'Repo.rapido': 0.2}}}
+
+
+@pytest.mark.parametrize('atual, regressao', [
+    (12.0, False),  # 20%: dentro do limite de 25%
+    (13.0, True),   # 30%
+    (8.0, False),   # mais rápido
+])
+def test_comparar_limite_percentual(atual, regressao):
+    resultado = comparar({'1x': {'Repo.lento': atual}}, BASELINE, 0.25)
+    assert resultado == ([('1x', 'Repo.lento', 10.0, atual)] if regressao else [])
+
+
+def test_comparar_ignora_diferencas_abaixo_do_piso():
+    # +150%, mas a diferença absoluta é menor que PISO_MS
+    atual = 0.2 + PISO_MS * 0.6
+    assert comparar({'1x': {'Repo.rapido': atual}}, BASELINE, 0.25) == []
+    atual = 0.2 + PISO_MS * 2
+    assert comparar({'1x': {'Repo.rapido': atual}}, BASELINE, 0.25) == [('1x', 'Repo.rapido', 0.2, atual)]
+
+
+def test_comparar_ignora_metodos_e_escalas_sem_base():
+    assert comparar({'1x': {'Repo.novo': 99.0}, '10x': {'Repo.lento': 99.0}}, BASELINE, 0.25) == []
+
+
+def test_todo_metodo_publico_tem_caso_no_benchmark():
+    assert casos_faltando() == []
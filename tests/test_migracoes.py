@@ -0,0 +1,44 @@
+"""Migrações aplicadas sobre bancos de versões anteriores"""
+from sqlalchemy import text
+from app.data.database.migrations import aplicar_migracoes
+
+
+def _voltar_para_versao_7_com_cpf_repetido(engine):
+    """Banco da versão 7: índice de CPF sem unicidade e dois cadastros do mesmo inquilino"""
+    with engine.begin() as connection:
+        connection.execute(text("DROP INDEX ix_inquilinos_cpf"))
+        connection.execute(text("CREATE INDEX ix_inquilinos_cpf ON inquilinos (cpf)"))
+        connection.execute(text("DELETE FROM schema_migracoes WHERE versao >= 8"))
+        connection.execute(text("PRAGMA user_version = 0"))
+        for i, nome in ((1, 'Ana Silva'), (2, 'Ana Silva Souza'), (3, 'Bruno Lima')):
+            connection.execute(text(
+                "INSERT INTO inquilinos (id, nome_completo, cpf, data_nascimento, telefone) "
+                "VALUES (:id, :nome, :cpf, '1990-01-01', '1')"
+            ), {'id': i, 'nome': nome, 'cpf': '111.444.777-35' if i < 3 else '529.982.247-25'})
+        connection.execute(text(
+            "INSERT INTO casas (id, nome, endereco, numero_quartos, inquilino_id) VALUES (1, 'Casa 1', 'Rua A', 2, 1)"
+        ))
+        connection.execute(text(
+            "INSERT INTO contratos (casa_id, inquilino_id, valor_aluguel, dia_pagamento, data_inicio, "
+            "data_fim, duracao_meses, valor_caucao, ativo) "
+            "VALUES (1, 1, 900, 5, '2024-01-01', '2024-12-31', 12, 900, 0)"
+        ))
+        connection.execute(text(
+            "INSERT INTO recibos (tipo_recibo, casa_id, inquilino_id, nome_pagador, cpf_pagador, nome_recebedor, "
+            "cpf_recebedor, valor, descricao, referente_a, data_pagamento, data_emissao) "
+            "VALUES ('aluguel', 1, 1, 'Ana', '1', 'B', '2', 900, 'Aluguel', 'Aluguel', '2024-02-05', '2024-02-05')"
+        ))
+
+
+def test_cpf_repetido_mantem_as_referencias(db_config):
+    engine = db_config.engine
+    _voltar_para_versao_7_com_cpf_repetido(engine)
+
+    aplicar_migracoes(engine)
+
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT id FROM inquilinos ORDER BY id")).scalars().all() == [2, 3]
+        assert connection.execute(text("SELECT id FROM inquilinos_duplicados")).scalars().all() == [1]
+        for tabela in ('casas', 'contratos', 'recibos'):
+            assert connection.execute(text(f"SELECT inquilino_id FROM {tabela}")).scalars().all() == [2]
+        assert connection.execute(text("PRAGMA foreign_key_check")).all() == []
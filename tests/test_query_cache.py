@@ -0,0 +1,64 @@
+"""Cache de consultas compartilhado entre sessões curtas"""
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from app.data.database.query_cache import QueryCache
+from app.data.models import Casa
+from app.data.repositories.house_repository import CasaRepository
+
+
+def _cadastrar(db_config, nome='Casa 1'):
+    session = db_config.get_session()
+    try:
+        session.add(Casa(nome=nome, endereco='Rua A, 1', numero_quartos=2))
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_sessoes_com_o_mesmo_cache(db_config):
+    _cadastrar(db_config)
+    cache = QueryCache()
+    with Session(db_config.reader_engine, info={'query_cache': cache}) as primeira:
+        assert CasaRepository(primeira).count() == 1
+    with Session(db_config.reader_engine, info={'query_cache': cache}) as segunda:
+        assert CasaRepository(segunda).count() == 1
+    assert (cache.acertos, cache.falhas) == (1, 1)
+
+    _cadastrar(db_config, 'Casa 2')
+    with Session(db_config.reader_engine, info={'query_cache': cache}) as terceira:
+        assert CasaRepository(terceira).count() == 2
+
+
+def test_entidades_nao_sao_guardadas(db_config):
+    _cadastrar(db_config)
+    cache = QueryCache()
+    with Session(db_config.reader_engine, info={'query_cache': cache}) as session:
+        casa = CasaRepository(session).get_all()[0]
+        assert inspect(casa).session is session
+    assert len(cache) == 0
+
+
+def test_transacao_anterior_a_escrita_nao_guarda_resultado(db_config):
+    cache = QueryCache()
+    with Session(db_config.reader_engine, info={'query_cache': cache}) as antiga:
+        assert CasaRepository(antiga).search_ids('Casa') == []  # a transação começa aqui
+        _cadastrar(db_config)
+        CasaRepository(antiga).count()
+    assert len(cache) == 1  # só a busca, feita antes da escrita
+
+    with Session(db_config.reader_engine, info={'query_cache': cache}) as nova:
+        assert CasaRepository(nova).count() == 1
+
+
+def test_sessoes_de_leitura_do_session_manager(db_config, session_manager):
+    _cadastrar(db_config)
+    with session_manager.leitura() as session:
+        assert CasaRepository(session).count() == 1
+    with session_manager.leitura() as session:
+        assert CasaRepository(session).count() == 1
+    assert session_manager.cache.acertos == 1
+
+    with session_manager.scope() as session:
+        CasaRepository(session).create(Casa(nome='Casa 2', endereco='Rua B, 2', numero_quartos=1))
+    with session_manager.leitura() as session:
+        assert CasaRepository(session).count() == 2